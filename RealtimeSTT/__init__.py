@@ -1,3 +1,4 @@
 from .audio_recorder import AudioToTextRecorder
 from .audio_recorder_client import AudioToTextRecorderClient
-from .audio_input import AudioInput
\ No newline at end of file
+from .audio_input import AudioInput
+from .multi_channel_recorder import MultiChannelRecorder
\ No newline at end of file
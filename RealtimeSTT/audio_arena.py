@@ -0,0 +1,154 @@
+"""
+Shared memory arena for the audio of transcription requests.
+
+Sending a numpy array through a pipe pickles it, copies it through the OS
+pipe and unpickles it on the other side - about 3.8 MB for a 60 s
+utterance, on the path between the end of speech and the transcription.
+SharedAudioArena is a ring of slots in one shared memory block. The
+requesting side copies the audio into a slot and sends only an ArenaSlice
+(offset, length, dtype) through the pipe; the worker maps the slot as a
+numpy array without copying it and releases the slot when it is done.
+
+Slots are taken in ring order and given back in that order once released,
+so a slot held by a long request keeps later (released) slots from being
+reused until it is released as well. If the arena has no room for an
+audio, put() returns None and the caller sends the array itself.
+"""
+
+from multiprocessing import shared_memory
+from typing import NamedTuple
+import collections
+import threading
+import numpy as np
+
+DEFAULT_CAPACITY = 32 * 1024 * 1024  # bytes, about 2 minutes of float32 audio at 16 kHz
+SLOT_HEADER_SIZE = 64  # release flag, keeps the data 64 byte aligned
+SLOT_ALIGNMENT = 64
+
+SLOT_FREE = 0
+SLOT_IN_USE = 1
+
+
+class ArenaSlice(NamedTuple):
+    """Audio in a SharedAudioArena slot."""
+    offset: int  # of the samples, in bytes
+    length: int  # in samples
+    dtype: str
+
+
+class SharedAudioArena:
+    """
+    Ring of audio slots in shared memory.
+
+    put() is called by the requesting process, view() and release() by the
+    worker (thread or process, the arena pickles to its name and attaches).
+
+    Args:
+        capacity (int): Size of the arena in bytes.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self._shm = shared_memory.SharedMemory(create=True, size=self.capacity)
+        self._owner = True
+        self._buf = self._shm.buf
+        # (offset, size) of the slots in use, in ring order, and the next
+        # free offset. Only the creating process allocates.
+        self._slots = collections.deque()
+        self._head = 0
+        self._lock = threading.Lock()
+        self.slices_put = 0
+        self.bytes_put = 0
+        self.full = 0
+
+    def __getstate__(self):
+        return {"capacity": self.capacity, "name": self._shm.name}
+
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._buf = self._shm.buf
+        self._slots = None
+        self._lock = None
+
+    def _reclaim(self):
+        # Give back the released slots at the tail of the ring
+        while self._slots and self._buf[self._slots[0][0]] == SLOT_FREE:
+            self._slots.popleft()
+
+    def _find(self, size):
+        if not self._slots:
+            self._head = 0
+            return 0 if size <= self.capacity else None
+        tail = self._slots[0][0]
+        if self._head > tail:
+            # In use: [tail, head), free: [head, capacity) and [0, tail)
+            if self.capacity - self._head >= size:
+                return self._head
+            return 0 if tail >= size else None
+        # Wrapped, free: [head, tail)
+        return self._head if tail - self._head >= size else None
+
+    def put(self, audio):
+        """
+        Copies audio into a free slot.
+
+        Returns:
+            ArenaSlice: The slot to send instead of the audio, or None if
+              the arena has no room for it.
+        """
+        audio = np.ascontiguousarray(audio)
+        size = SLOT_HEADER_SIZE + -(-audio.nbytes // SLOT_ALIGNMENT) * SLOT_ALIGNMENT
+        with self._lock:
+            if self._buf is None:
+                return None
+            self._reclaim()
+            offset = self._find(size)
+            if offset is None:
+                self.full += 1
+                return None
+            self._slots.append((offset, size))
+            self._head = offset + size
+            self._buf[offset] = SLOT_IN_USE
+        data_offset = offset + SLOT_HEADER_SIZE
+        np.ndarray(audio.shape, dtype=audio.dtype, buffer=self._buf,
+                   offset=data_offset)[...] = audio
+        self.slices_put += 1
+        self.bytes_put += audio.nbytes
+        return ArenaSlice(data_offset, len(audio), audio.dtype.str)
+
+    def view(self, audio_slice):
+        """The audio of a slot as a numpy array on the shared memory."""
+        return np.ndarray((audio_slice.length,), dtype=np.dtype(audio_slice.dtype),
+                          buffer=self._buf, offset=audio_slice.offset)
+
+    def release(self, audio_slice):
+        """Marks a slot as free. Views of it must not be used afterwards."""
+        if self._buf is not None:
+            self._buf[audio_slice.offset - SLOT_HEADER_SIZE] = SLOT_FREE
+
+    def stats(self):
+        """Returns the number of slices and bytes put and how often the arena was full."""
+        return {
+            "slices_put": self.slices_put,
+            "bytes_put": self.bytes_put,
+            "full": self.full,
+            "capacity": self.capacity,
+        }
+
+    def close(self):
+        """Detaches from the shared memory; the creator also frees it."""
+        if self._buf is None:
+            return
+        self._buf = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A worker still holds a view, the mapping goes with the process
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
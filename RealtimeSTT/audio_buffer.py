@@ -0,0 +1,344 @@
+"""
+Sample-indexed int16 audio stores used by the recorder.
+
+AudioBuffer holds the audio of the utterance that is currently recorded.
+Chunks are copied once into a preallocated, growable numpy array, so the
+consumers (realtime worker, early transcription, wait_audio) can take
+zero-copy views instead of joining all chunks again on every access.
+Optionally a float32 mirror in the [-1, 1] range and its running peak are
+updated chunk by chunk, so transcription requests only need a slice.
+
+AudioRingBuffer holds a fixed amount of the most recent audio (pre-roll)
+and replaces the deque of byte chunks that was used before.
+"""
+
+import threading
+import numpy as np
+
+INITIAL_CAPACITY = 16000 * 30  # 30 seconds at 16 kHz
+INT16_MAX_ABS_VALUE = 32768.0
+NORMALIZATION_PEAK = 0.95  # -0.45 dBFS, same target as the transcription worker
+
+
+def _as_int16(chunk):
+    """Returns an int16 numpy view onto bytes-like data or an int16 array."""
+    if isinstance(chunk, np.ndarray):
+        if chunk.dtype != np.int16:
+            chunk = chunk.astype(np.int16)
+        return chunk.reshape(-1)
+    return np.frombuffer(chunk, dtype=np.int16)
+
+
+def downmix_to_mono(chunk):
+    """
+    Averages the channels of a (frames, channels) array.
+
+    int16 audio is summed in int32 instead of going through np.mean, which
+    would upcast every sample to float64; other dtypes average in float32.
+    """
+    if chunk.ndim != 2:
+        return chunk
+    if chunk.dtype == np.int16:
+        mono = chunk.sum(axis=1, dtype=np.int32)
+        mono //= chunk.shape[1]
+        return mono.astype(np.int16)
+    return chunk.mean(axis=1, dtype=np.float32)
+
+
+class AudioBuffer:
+    """
+    Growable int16 buffer for the samples of one recording.
+
+    Appending copies the chunk into place. Capacity doubles when exceeded,
+    so appending is amortized O(chunk). Views handed out by view() and
+    float_view() stay valid after later appends, growth or clear(): growing
+    and clearing always switch to a fresh array instead of overwriting
+    samples that may still be referenced by a consumer thread.
+
+    Args:
+        initial_capacity (int): Number of samples preallocated.
+        keep_float (bool): Maintain a float32 mirror of the samples
+          (scaled to [-1, 1]) and its running peak.
+    """
+
+    def __init__(self, initial_capacity=INITIAL_CAPACITY, keep_float=False):
+        self._initial_capacity = max(1, int(initial_capacity))
+        self.keep_float = keep_float
+        self._data = np.empty(self._initial_capacity, dtype=np.int16)
+        self._float_data = (
+            np.empty(self._initial_capacity, dtype=np.float32)
+            if keep_float else None
+        )
+        self._start = 0
+        self._end = 0
+        self._peak = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of samples currently stored."""
+        return self._end - self._start
+
+    def __bool__(self):
+        return self._end > self._start
+
+    def _reserve(self, num_samples):
+        """Makes room for num_samples more samples. Caller holds the lock."""
+        needed = self._end + num_samples
+        if needed <= len(self._data):
+            return
+        length = self._end - self._start
+        capacity = len(self._data)
+        while capacity < length + num_samples:
+            capacity *= 2
+        data = np.empty(capacity, dtype=np.int16)
+        data[:length] = self._data[self._start:self._end]
+        self._data = data
+        if self.keep_float:
+            float_data = np.empty(capacity, dtype=np.float32)
+            float_data[:length] = self._float_data[self._start:self._end]
+            self._float_data = float_data
+        self._start = 0
+        self._end = length
+
+    def append(self, chunk):
+        """
+        Appends one chunk of audio.
+
+        Args:
+            chunk (bytes, bytearray, memoryview or np.ndarray): 16-bit PCM
+              audio data.
+        """
+        samples = _as_int16(chunk)
+        num_samples = len(samples)
+        if not num_samples:
+            return
+        with self._lock:
+            self._reserve(num_samples)
+            self._data[self._end:self._end + num_samples] = samples
+            if self.keep_float:
+                float_slice = self._float_data[self._end:self._end + num_samples]
+                np.multiply(samples, 1.0 / INT16_MAX_ABS_VALUE,
+                            out=float_slice, casting='unsafe')
+                chunk_peak = max(float(float_slice.max()), -float(float_slice.min()))
+                if chunk_peak > self._peak:
+                    self._peak = chunk_peak
+            self._end += num_samples
+
+    def extend(self, chunks):
+        """Appends every chunk of an iterable of chunks."""
+        for chunk in chunks:
+            self.append(chunk)
+
+    @property
+    def peak(self):
+        """Maximum absolute float sample value stored (0 without mirror)."""
+        return self._peak
+
+    def view(self, start=0, end=None):
+        """
+        Returns an int16 view of the stored samples without copying.
+        Consumers must treat the view as read-only.
+
+        Args:
+            start (int): First sample (relative to the buffer start).
+            end (int, optional): Sample after the last one. Defaults to the
+              current length.
+        """
+        with self._lock:
+            length = self._end - self._start
+            if end is None or end > length:
+                end = length
+            return self._data[self._start + start:self._start + end]
+
+    def float_view(self, start=0, end=None, normalize=False):
+        """
+        Returns the stored samples as float32 in the [-1, 1] range.
+
+        With the float mirror enabled this is a zero-copy view, otherwise
+        the samples are converted.
+
+        Args:
+            start (int): First sample (relative to the buffer start).
+            end (int, optional): Sample after the last one. Defaults to the
+              current length.
+            normalize (bool): Scale the audio so that its peak is at
+              NORMALIZATION_PEAK, using the running peak. This allocates.
+        """
+        if not self.keep_float:
+            audio = self.view(start, end).astype(np.float32) / INT16_MAX_ABS_VALUE
+            if normalize and audio.size > 0:
+                peak = np.max(np.abs(audio))
+                if peak > 0:
+                    audio = audio * (NORMALIZATION_PEAK / peak)
+            return audio
+
+        with self._lock:
+            length = self._end - self._start
+            if end is None or end > length:
+                end = length
+            audio = self._float_data[self._start + start:self._start + end]
+            peak = self._peak
+        if normalize and peak > 0:
+            audio = audio * np.float32(NORMALIZATION_PEAK / peak)
+        return audio
+
+    def discard_front(self, num_samples):
+        """
+        Drops num_samples samples from the beginning of the buffer.
+
+        Returns:
+            int: Number of samples actually removed.
+        """
+        with self._lock:
+            num_samples = min(max(0, int(num_samples)), self._end - self._start)
+            self._start += num_samples
+            if self.keep_float and num_samples:
+                remaining = self._float_data[self._start:self._end]
+                self._peak = (
+                    float(np.max(np.abs(remaining))) if remaining.size else 0.0
+                )
+        return num_samples
+
+    def clear(self):
+        """Removes all samples. Outstanding views keep their data."""
+        with self._lock:
+            if self._end:
+                self._data = np.empty(self._initial_capacity, dtype=np.int16)
+                if self.keep_float:
+                    self._float_data = np.empty(
+                        self._initial_capacity, dtype=np.float32)
+            self._start = 0
+            self._end = 0
+            self._peak = 0.0
+
+    def copy(self):
+        """Returns an independent AudioBuffer with the same samples."""
+        other = AudioBuffer(max(self._initial_capacity, len(self)),
+                            keep_float=self.keep_float)
+        other.append(self.view())
+        return other
+
+    def tobytes(self):
+        """Returns the stored samples as raw 16-bit PCM bytes."""
+        return self.view().tobytes()
+
+
+class AudioRingBuffer:
+    """
+    Fixed capacity int16 ring buffer keeping the most recent samples.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(0, int(capacity))
+        self._data = np.zeros(max(1, self.capacity), dtype=np.int16)
+        self._write_pos = 0
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of samples currently stored."""
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def append(self, chunk):
+        """
+        Writes a chunk into the ring, overwriting the oldest samples when full.
+        """
+        if not self.capacity:
+            return
+        samples = _as_int16(chunk)
+        if len(samples) >= self.capacity:
+            samples = samples[-self.capacity:]
+        num_samples = len(samples)
+        if not num_samples:
+            return
+        with self._lock:
+            first = min(num_samples, self.capacity - self._write_pos)
+            self._data[self._write_pos:self._write_pos + first] = samples[:first]
+            if first < num_samples:
+                self._data[:num_samples - first] = samples[first:]
+            self._write_pos = (self._write_pos + num_samples) % self.capacity
+            self._length = min(self.capacity, self._length + num_samples)
+
+    def read(self):
+        """Returns the stored samples in chronological order (as a copy)."""
+        with self._lock:
+            if not self._length:
+                return np.empty(0, dtype=np.int16)
+            start = (self._write_pos - self._length) % self.capacity
+            if start + self._length <= self.capacity:
+                return self._data[start:start + self._length].copy()
+            return np.concatenate((
+                self._data[start:],
+                self._data[:self._write_pos]
+            ))
+
+    def clear(self):
+        """Removes all samples."""
+        with self._lock:
+            self._write_pos = 0
+            self._length = 0
+
+
+class AudioChunker:
+    """
+    Splits a stream of raw audio bytes into chunks of a fixed size.
+
+    Incoming data is sliced through a memoryview; only the remainder that
+    does not fill a whole chunk is kept (and copied) between calls, so the
+    unconsumed data is never reallocated for every emitted chunk.
+
+    Args:
+        chunk_bytes (int): Size of the emitted chunks in bytes.
+    """
+
+    def __init__(self, chunk_bytes):
+        self.chunk_bytes = int(chunk_bytes)
+        self._pending = bytearray()
+
+    def __len__(self):
+        """Number of bytes waiting for the next complete chunk."""
+        return len(self._pending)
+
+    def split(self, data):
+        """
+        Adds data to the stream and returns all chunks completed by it.
+
+        Args:
+            data (bytes-like or C-contiguous np.ndarray): Raw audio data.
+
+        Returns:
+            list of bytes: The complete chunks, in order.
+        """
+        view = memoryview(data).cast('B')
+        chunk_bytes = self.chunk_bytes
+        chunks = []
+        offset = 0
+
+        if self._pending:
+            offset = min(chunk_bytes - len(self._pending), len(view))
+            self._pending += view[:offset]
+            if len(self._pending) < chunk_bytes:
+                return chunks
+            chunks.append(bytes(self._pending))
+            self._pending.clear()
+
+        end = offset + (len(view) - offset) // chunk_bytes * chunk_bytes
+        for position in range(offset, end, chunk_bytes):
+            chunks.append(view[position:position + chunk_bytes].tobytes())
+
+        if end < len(view):
+            self._pending += view[end:]
+        return chunks
+
+    def flush(self):
+        """Returns the incomplete remainder (may be empty) and clears it."""
+        remainder = bytes(self._pending)
+        self._pending.clear()
+        return remainder
+
+    def clear(self):
+        """Discards the incomplete remainder."""
+        self._pending.clear()
@@ -1,5 +1,8 @@
 from colorama import init, Fore, Style
-from scipy.signal import butter, filtfilt, resample_poly
+from scipy.signal import butter, filtfilt, resample_poly, sosfilt
+from .resampler import StreamingResampler
+from functools import lru_cache
+import numpy as np
 import pyaudio
 import logging
 
@@ -7,6 +10,19 @@ DESIRED_RATE = 16000
 CHUNK_SIZE = 1024
 AUDIO_FORMAT = pyaudio.paInt16
 CHANNELS = 1
+FILTER_ORDER = 5
+
+
+@lru_cache(maxsize=None)
+def _butter_lowpass(cutoff_freq, sample_rate, output='ba'):
+    """
+    Designs (once per parameter set) the Butterworth low-pass filter used
+    against aliasing. Returns (b, a) for output='ba' and second-order
+    sections for output='sos'.
+    """
+    normal_cutoff = cutoff_freq / (sample_rate / 2.0)
+    return butter(FILTER_ORDER, normal_cutoff, btype='low', analog=False, output=output)
+
 
 class AudioInput:
     def __init__(
@@ -30,6 +46,7 @@ class AudioInput:
         self.audio_format = audio_format
         self.channels = channels
         self.resample_to_target = resample_to_target
+        self._stream_states = {}
 
     def get_supported_sample_rates(self, device_index):
         """Test which standard sample rates are supported by the specified device."""
@@ -122,6 +139,7 @@ class AudioInput:
                 print(f"Actual selected device index: {actual_device_index}")
             self.input_device_index = actual_device_index
             self.device_sample_rate = self._get_best_sample_rate(actual_device_index, self.target_samplerate)
+            self.reset_stream_resampling()
 
             if self.debug_mode:
                 print(f"Setting up audio on device {self.input_device_index} with sample rate {self.device_sample_rate}")
@@ -161,23 +179,16 @@ class AudioInput:
             np.ndarray: Filtered audio signal
 
         Notes:
-            - Uses a 5th order Butterworth filter
+            - Uses a 5th order Butterworth filter (designed once and cached)
             - Applies zero-phase filtering using filtfilt
         """
-        # Calculate the Nyquist frequency (half the sample rate)
-        nyquist_rate = sample_rate / 2.0
-
-        # Normalize cutoff frequency to Nyquist rate (required by butter())
-        normal_cutoff = cutoff_freq / nyquist_rate
-
-        # Design the Butterworth filter
-        b, a = butter(5, normal_cutoff, btype='low', analog=False)
+        b, a = _butter_lowpass(cutoff_freq, sample_rate)
 
         # Apply zero-phase filtering (forward and backward)
         filtered_signal = filtfilt(b, a, signal)
         return filtered_signal
 
-    def resample_audio(self, pcm_data, target_sample_rate, original_sample_rate):
+    def resample_audio(self, pcm_data, target_sample_rate, original_sample_rate, streaming=False):
         """
         Filter and resample audio data to a target sample rate.
 
@@ -185,6 +196,9 @@ class AudioInput:
             pcm_data (np.ndarray): Input audio data
             target_sample_rate (int): Desired output sample rate in Hz
             original_sample_rate (int): Original sample rate of input in Hz
+            streaming (bool): Treat consecutive calls as one continuous
+              stream (see stream_resample_audio). Use this for audio that is
+              captured chunk by chunk.
 
         Returns:
             np.ndarray: Resampled audio data
@@ -193,6 +207,9 @@ class AudioInput:
             - Applies anti-aliasing filter before resampling
             - Uses polyphase filtering for high-quality resampling
         """
+        if streaming:
+            return self.stream_resample_audio(pcm_data, target_sample_rate, original_sample_rate)
+
         if target_sample_rate < original_sample_rate:
             # Downsampling with low-pass filter
             pcm_filtered = self.lowpass_filter(pcm_data, target_sample_rate / 2, original_sample_rate)
@@ -202,10 +219,76 @@ class AudioInput:
             resampled = resample_poly(pcm_data, target_sample_rate, original_sample_rate)
         return resampled
 
+    def stream_resample_audio(self, pcm_data, target_sample_rate, original_sample_rate):
+        """
+        Resample one chunk of a continuous stream.
+
+        For integer downsampling ratios (e.g. 48000 -> 16000 Hz) the chunk
+        runs through a causal Butterworth low-pass in second-order sections,
+        designed once per rate pair. The sosfilt state and the decimation
+        phase carry over to the next call, so chunk boundaries are seamless
+        and filtering and decimation happen in a single pass. Other ratios
+        (e.g. 44100 -> 16000 Hz) use a StreamingResampler.
+
+        Args:
+            pcm_data (np.ndarray): Input audio chunk
+            target_sample_rate (int): Desired output sample rate in Hz
+            original_sample_rate (int): Original sample rate of input in Hz
+
+        Returns:
+            np.ndarray: Resampled audio chunk (int16 input gives int16 output)
+        """
+        if target_sample_rate == original_sample_rate:
+            return pcm_data
+
+        key = (original_sample_rate, target_sample_rate)
+        state = self._stream_states.get(key)
+
+        if original_sample_rate % target_sample_rate:
+            # Non-integer ratio, the polyphase resampler handles filtering
+            if state is None:
+                state = StreamingResampler(original_sample_rate, target_sample_rate)
+                self._stream_states[key] = state
+            return state.process(pcm_data)
+
+        factor = original_sample_rate // target_sample_rate
+        sos = _butter_lowpass(target_sample_rate / 2, original_sample_rate, 'sos')
+        if state is None:
+            state = {"zi": np.zeros((sos.shape[0], 2)), "offset": 0}
+            self._stream_states[key] = state
+
+        filtered, state["zi"] = sosfilt(sos, pcm_data, zi=state["zi"])
+        resampled = filtered[state["offset"]::factor]
+        state["offset"] = (state["offset"] - len(pcm_data)) % factor
+
+        if pcm_data.dtype == np.int16:
+            return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+        return resampled
+
+    def reset_stream_resampling(self):
+        """Forget the filter state of stream_resample_audio."""
+        self._stream_states.clear()
+
     def read_chunk(self):
         """Read a chunk of audio data"""
         return self.stream.read(self.chunk_size, exception_on_overflow=False)
 
+    def read_resampled_chunk(self):
+        """
+        Read a chunk of audio data and downsample it to target_samplerate
+        with the streaming filter (if resample_to_target is set).
+
+        Returns:
+            tuple: (audio bytes, sample rate of the returned audio)
+        """
+        data = self.read_chunk()
+        if not self.resample_to_target or self.device_sample_rate == self.target_samplerate:
+            return data, self.device_sample_rate
+        pcm_data = np.frombuffer(data, dtype=np.int16)
+        resampled = self.stream_resample_audio(
+            pcm_data, self.target_samplerate, self.device_sample_rate)
+        return resampled.tobytes(), self.target_samplerate
+
     def cleanup(self):
         """Clean up audio resources"""
         try:
@@ -27,23 +27,32 @@ Author: Kolja Beigel
 """
 
 from faster_whisper import WhisperModel, BatchedInferencePipeline
-from typing import Iterable, List, Optional, Union
+from typing import Iterable, List, NamedTuple, Optional, Union
 from openwakeword.model import Model
 import torch.multiprocessing as mp
-from scipy.signal import resample
 import signal as system_signal
 from ctypes import c_bool
-from scipy import signal
-from .safepipe import SafePipe
+from .audio_buffer import AudioBuffer, AudioChunker, AudioRingBuffer, downmix_to_mono
+from .resampler import StreamingResampler
+from .safepipe import SafePipe, SharedParentPipe
+from .audio_arena import SharedAudioArena, ArenaSlice
+from .shared_audio_queue import SharedAudioQueue
+from .webrtc_vad import WebRTCVADEngine
+from .silero_store import load_silero_vad
+from .silero_onnx import SileroOnnxVAD
+from .energy_gate import EnergyGate
+from .speech_segmenter import (
+    SpeechSegmenter, SPEECH_START, SILENCE_START, SPEECH_RESUME,
+    EARLY_TRANSCRIBE, SPEECH_END)
 import soundfile as sf
 import faster_whisper
 import openwakeword
 import collections
+import itertools
 import numpy as np
 import pvporcupine
 import traceback
 import threading
-import webrtcvad
 import datetime
 import platform
 import logging
@@ -80,21 +89,138 @@ INIT_WAKE_WORD_ACTIVATION_DELAY = 0.0
 INIT_WAKE_WORD_TIMEOUT = 5.0
 INIT_WAKE_WORD_BUFFER_DURATION = 0.1
 ALLOWED_LATENCY_LIMIT = 100
+BUFFER_OVERFLOW_POLICIES = {"drop_oldest", "drop_non_speech", "none"}
+MAX_DROP_EVENTS = 1000
+SILERO_QUEUE_SIZE = 4
+# Default end threshold below the start threshold, like the negative
+# threshold of Silero's get_speech_timestamps
+SILERO_END_THRESHOLD_OFFSET = 0.15
 
 TIME_SLEEP = 0.02
 SAMPLE_RATE = 16000
 BUFFER_SIZE = 512
 INT16_MAX_ABS_VALUE = 32768.0
 
+FILE_READ_BLOCK_SIZE = 65536  # frames read per block by transcribe_file
+MAX_CLIP_SECONDS = 30  # whisper's context window
+
 INIT_HANDLE_BUFFER_OVERFLOW = False
 if platform.system() != 'Darwin':
     INIT_HANDLE_BUFFER_OVERFLOW = True
 
 
+REQUEST_FINAL = "final"
+REQUEST_EARLY = "early"
+REQUEST_REALTIME = "realtime"
+REALTIME_REQUEST_TIMEOUT = 5  # seconds
+
+# Model warm-up transcriptions: before the model is reported ready, after
+# it (init returns earlier, the first transcription waits for the warm-up)
+# or none at all
+WARMUP_BLOCKING = "blocking"
+WARMUP_BACKGROUND = "background"
+WARMUP_OFF = "off"
+
+# Transcription request ids, unique within the process
+_request_ids = itertools.count(1)
+
+
+class TranscriptionRequest(NamedTuple):
+    """
+    Request to a TranscriptionWorker.
+
+    The worker answers with (request_id, status, result). status is
+    'success', 'error' or 'expired' (the deadline, a time.time() timestamp,
+    had passed before the worker got to the request, so it was skipped).
+    A successful result is (transcription, info, decode_time). With
+    stream_segments set, every decoded segment is sent ahead of it as
+    (request_id, 'segment', TranscriptionSegment).
+    """
+    request_id: int
+    kind: str  # REQUEST_FINAL, REQUEST_EARLY or REQUEST_REALTIME
+    deadline: Optional[float]
+    audio: Union[np.ndarray, ArenaSlice]
+    language: str
+    use_prompt: bool = True
+    # Optional list of (start, end) second pairs, used for batched
+    # transcription of several clips of one audio
+    clip_timestamps: Optional[list] = None
+    # Replaces the initial prompt, e.g. the text of the preceding audio
+    prompt: Optional[str] = None
+    stream_segments: bool = False
+
+
+class TranscriptionSegment(NamedTuple):
+    """Segment of a final transcription, times in seconds from the start of the audio."""
+    text: str
+    start: float
+    end: float
+    avg_logprob: float
+
+
+class _SegmentCounter:
+    """Passes streamed segments on to on_segment and counts them."""
+
+    def __init__(self, on_segment):
+        self.on_segment = on_segment
+        self.count = 0
+
+    def __call__(self, segment):
+        self.count += 1
+        self.on_segment(segment)
+
+
+def _is_partial_reply(reply):
+    """Streamed segments don't answer a request, its final reply does."""
+    return isinstance(reply, tuple) and len(reply) == 3 and reply[1] == 'segment'
+
+
+class EarlyTranscription(NamedTuple):
+    """
+    Early transcription request of a recording and the audio it covers.
+
+    start and end index the recorded frames while recording, and the
+    final audio once wait_audio() has built it. resumed is set when
+    speech went on after the request was sent.
+    """
+    request_id: int
+    start: int
+    end: int
+    resumed: bool = False
+
+
+def _warm_up_model(model):
+    """
+    Transcribes the bundled warm-up audio, so the first real transcription
+    doesn't pay for the lazy initialization of the model.
+    """
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    warmup_audio_path = os.path.join(
+        current_dir, "warmup_audio.wav"
+    )
+    warmup_audio_data, _ = sf.read(warmup_audio_path, dtype="float32")
+    segments, info = model.transcribe(warmup_audio_data, language="en", beam_size=1)
+    return " ".join(segment.text for segment in segments)
+
+
+class TranscriptionCancel(NamedTuple):
+    """
+    Asks a TranscriptionWorker to stop working on a request. A cancelled
+    request is answered with (request_id, 'cancelled', latency), latency
+    being the seconds from the arrival of the cancel to the stop.
+    """
+    request_id: int
+
+
+class TranscriptionCancelled(Exception):
+    """Raised inside a TranscriptionWorker when its request was cancelled."""
+
+
 class TranscriptionWorker:
     def __init__(self, conn, stdout_pipe, model_path, download_root, compute_type, gpu_device_index, device,
                  ready_event, shutdown_event, interrupt_stop_event, beam_size, initial_prompt, suppress_tokens,
-                 batch_size, faster_whisper_vad_filter, normalize_audio):
+                 batch_size, faster_whisper_vad_filter, normalize_audio, cpu_threads=0,
+                 audio_arena=None, model_warmup=WARMUP_BLOCKING):
         self.conn = conn
         self.stdout_pipe = stdout_pipe
         self.model_path = model_path
@@ -111,7 +237,13 @@ class TranscriptionWorker:
         self.batch_size = batch_size
         self.faster_whisper_vad_filter = faster_whisper_vad_filter
         self.normalize_audio = normalize_audio
+        self.cpu_threads = cpu_threads
+        self.audio_arena = audio_arena
+        self.model_warmup = model_warmup
         self.queue = queue.Queue()
+        # Arrival time of the cancel per cancelled request id
+        self.cancelled = {}
+        self.cancel_lock = threading.Lock()
 
     def custom_print(self, *args, **kwargs):
         message = ' '.join(map(str, args))
@@ -126,7 +258,11 @@ class TranscriptionWorker:
                 # Use a longer timeout to reduce polling frequency
                 if self.conn.poll(0.01):  # Increased from 0.01 to 0.5 seconds
                     data = self.conn.recv()
-                    self.queue.put(data)
+                    with self.cancel_lock:
+                        if isinstance(data, TranscriptionCancel):
+                            self.cancelled[data.request_id] = time.time()
+                        else:
+                            self.queue.put(data)
                 else:
                     # Sleep only if no data, but use a shorter sleep
                     time.sleep(TIME_SLEEP)
@@ -148,19 +284,17 @@ class TranscriptionWorker:
                 compute_type=self.compute_type,
                 device_index=self.gpu_device_index,
                 download_root=self.download_root,
+                cpu_threads=self.cpu_threads,
             )
             # Create a short dummy audio array, for example 1 second of silence at 16 kHz
             if self.batch_size > 0:
                 model = BatchedInferencePipeline(model=model)
 
-            # Run a warm-up transcription
-            current_dir = os.path.dirname(os.path.realpath(__file__))
-            warmup_audio_path = os.path.join(
-                current_dir, "warmup_audio.wav"
-            )
-            warmup_audio_data, _ = sf.read(warmup_audio_path, dtype="float32")
-            segments, info = model.transcribe(warmup_audio_data, language="en", beam_size=1)
-            model_warmup_transcription = " ".join(segment.text for segment in segments)
+            if self.model_warmup == WARMUP_BACKGROUND:
+                # Requests wait in the pipe until the warm-up is done
+                self.ready_event.set()
+            if self.model_warmup != WARMUP_OFF:
+                _warm_up_model(model)
         except Exception as e:
             logging.exception(f"Error initializing main faster_whisper transcription model: {e}")
             raise
@@ -175,53 +309,93 @@ class TranscriptionWorker:
         try:
             while not self.shutdown_event.is_set():
                 try:
-                    audio, language, use_prompt = self.queue.get(timeout=0.1)
+                    request = self.queue.get(timeout=0.1)
                     try:
-                        logging.debug(f"Transcribing audio with language {language}")
-                        start_t = time.time()
-
-                        # normalize audio to -0.95 dBFS
-                        if audio is not None and audio .size > 0:
-                            if self.normalize_audio:
-                                peak = np.max(np.abs(audio))
-                                if peak > 0:
-                                    audio = (audio / peak) * 0.95
-                        else:
-                            logging.error("Received None audio for transcription")
-                            self.conn.send(('error', "Received None audio for transcription"))
+                        request_id = request.request_id
+                        audio, language = request.audio, request.language
+                        if isinstance(audio, ArenaSlice):
+                            audio = self.audio_arena.view(audio)
+                        use_prompt = request.use_prompt
+                        clip_timestamps = request.clip_timestamps
+                        if request_id in self.cancelled:
+                            self._send_cancelled(request_id)
                             continue
+                        if request.deadline is not None and time.time() > request.deadline:
+                            # Nobody waits for the result anymore
+                            logging.debug(f"Skipping expired {request.kind} request {request_id}")
+                            self.conn.send((request_id, 'expired', None))
+                            continue
+                        try:
+                            logging.debug(f"Transcribing {request.kind} request {request_id} with language {language}")
+                            start_t = time.time()
 
-                        prompt = None
-                        if use_prompt:
-                            prompt = self.initial_prompt if self.initial_prompt else None
+                            # normalize audio to -0.95 dBFS
+                            if audio is not None and audio .size > 0:
+                                if self.normalize_audio:
+                                    peak = np.max(np.abs(audio))
+                                    if peak > 0:
+                                        audio = (audio / peak) * 0.95
+                            else:
+                                logging.error("Received None audio for transcription")
+                                self.conn.send((request_id, 'error', "Received None audio for transcription"))
+                                continue
 
-                        if self.batch_size > 0:
-                            segments, info = model.transcribe(
-                                audio,
-                                language=language if language else None,
-                                beam_size=self.beam_size,
-                                initial_prompt=prompt,
-                                suppress_tokens=self.suppress_tokens,
-                                batch_size=self.batch_size, 
-                                vad_filter=self.faster_whisper_vad_filter
-                            )
-                        else:
-                            segments, info = model.transcribe(
-                                audio,
-                                language=language if language else None,
-                                beam_size=self.beam_size,
-                                initial_prompt=prompt,
-                                suppress_tokens=self.suppress_tokens,
-                                vad_filter=self.faster_whisper_vad_filter
-                            )
-                        elapsed = time.time() - start_t
-                        transcription = " ".join(seg.text for seg in segments).strip()
-                        logging.debug(f"Final text detected with main model: {transcription} in {elapsed:.4f}s")
-                        self.conn.send(('success', (transcription, info)))
-                    except Exception as e:
-                        logging.error(f"General error in transcription: {e}", exc_info=True)
-                        self.conn.send(('error', str(e)))
+                            prompt = None
+                            if request.prompt:
+                                prompt = request.prompt
+                            elif use_prompt:
+                                prompt = self.initial_prompt if self.initial_prompt else None
+
+                            if clip_timestamps:
+                                segments, info = self._transcribe_clips(
+                                    model, audio, language, prompt, clip_timestamps, request_id)
+                                elapsed = time.time() - start_t
+                                self.conn.send((request_id, 'success', (segments, info, elapsed)))
+                                logging.debug(f"Transcribed {len(clip_timestamps)} clips in {elapsed:.4f}s")
+                                continue
+
+                            if self.batch_size > 0:
+                                segments, info = model.transcribe(
+                                    audio,
+                                    language=language if language else None,
+                                    beam_size=self.beam_size,
+                                    initial_prompt=prompt,
+                                    suppress_tokens=self.suppress_tokens,
+                                    batch_size=self.batch_size, 
+                                    vad_filter=self.faster_whisper_vad_filter
+                                )
+                            else:
+                                segments, info = model.transcribe(
+                                    audio,
+                                    language=language if language else None,
+                                    beam_size=self.beam_size,
+                                    initial_prompt=prompt,
+                                    suppress_tokens=self.suppress_tokens,
+                                    vad_filter=self.faster_whisper_vad_filter
+                                )
+                            texts = []
+                            for seg in self._segments(segments, request_id):
+                                texts.append(seg.text)
+                                if request.stream_segments:
+                                    self.conn.send((request_id, 'segment', TranscriptionSegment(
+                                        seg.text.strip(), seg.start, seg.end, seg.avg_logprob)))
+                            transcription = " ".join(texts).strip()
+                            elapsed = time.time() - start_t
+                            logging.debug(f"Final text detected with main model: {transcription} in {elapsed:.4f}s")
+                            self.conn.send((request_id, 'success', (transcription, info, elapsed)))
+                        except TranscriptionCancelled:
+                            self._send_cancelled(request_id)
+                        except Exception as e:
+                            logging.error(f"General error in transcription: {e}", exc_info=True)
+                            self.conn.send((request_id, 'error', str(e)))
+                    finally:
+                        if isinstance(request.audio, ArenaSlice):
+                            self.audio_arena.release(request.audio)
                 except queue.Empty:
+                    # Idle: every cancel left belongs to an answered request
+                    with self.cancel_lock:
+                        if self.queue.empty():
+                            self.cancelled.clear()
                     continue
                 except KeyboardInterrupt:
                     self.interrupt_stop_event.set()
@@ -237,6 +411,83 @@ class TranscriptionWorker:
             polling_thread.join()  # Wait for the polling thread to finish
 
 
+    def _segments(self, segments, request_id):
+        """
+        Yields the segments of a transcription. faster_whisper decodes them
+        lazily, so stopping here when the request was cancelled skips the
+        rest of the audio.
+        """
+        for segment in segments:
+            if request_id in self.cancelled:
+                raise TranscriptionCancelled()
+            yield segment
+        if request_id in self.cancelled:
+            raise TranscriptionCancelled()
+
+    def _send_cancelled(self, request_id):
+        cancel_time = self.cancelled.pop(request_id, None)
+        latency = time.time() - cancel_time if cancel_time else 0.0
+        logging.debug(f"Cancelled request {request_id}, stopped {latency:.4f}s after the cancel")
+        self.conn.send((request_id, 'cancelled', latency))
+
+    def _transcribe_clips(self, model, audio, language, prompt, clip_timestamps,
+                          request_id=None):
+        """
+        Transcribes several clips of one audio array in a single call.
+
+        With the BatchedInferencePipeline all clips are decoded as one
+        batch, otherwise they are decoded one after another.
+
+        Returns:
+            tuple: (list of (start, end, text) segments with times in
+              seconds relative to the audio array, info)
+        """
+        if self.batch_size > 0:
+            segments, info = model.transcribe(
+                audio,
+                language=language if language else None,
+                beam_size=self.beam_size,
+                initial_prompt=prompt,
+                suppress_tokens=self.suppress_tokens,
+                batch_size=self.batch_size,
+                vad_filter=False,
+                clip_timestamps=[
+                    {"start": int(start * SAMPLE_RATE), "end": int(end * SAMPLE_RATE)}
+                    for start, end in clip_timestamps
+                ],
+            )
+        else:
+            segments, info = model.transcribe(
+                audio,
+                language=language if language else None,
+                beam_size=self.beam_size,
+                initial_prompt=prompt,
+                suppress_tokens=self.suppress_tokens,
+                vad_filter=False,
+                clip_timestamps=[t for clip in clip_timestamps for t in clip],
+            )
+        return [(seg.start, seg.end, seg.text)
+                for seg in self._segments(segments, request_id)], info
+
+
+def _segmenter_parameter(name):
+    """
+    Recorder attribute the speech segmenter is configured from. Assigning
+    it, also at runtime, reconfigures the recorder's segmenter.
+    """
+    attribute = "_" + name
+
+    def get(self):
+        return getattr(self, attribute)
+
+    def set(self, value):
+        setattr(self, attribute, value)
+        if getattr(self, "_segmenter_configured", False):
+            self._configure_segmenter(self.segmenter, self.sample_rate)
+
+    return property(get, set, doc=f"{name} (reconfigures the segmenter)")
+
+
 class bcolors:
     OKGREEN = '\033[92m'  # Green for active speech detection
     WARNING = '\033[93m'  # Yellow for silence detection
@@ -250,6 +501,15 @@ class AudioToTextRecorder:
     `faster_whisper` model.
     """
 
+    pre_recording_buffer_duration = _segmenter_parameter("pre_recording_buffer_duration")
+    post_speech_silence_duration = _segmenter_parameter("post_speech_silence_duration")
+    min_length_of_recording = _segmenter_parameter("min_length_of_recording")
+    min_gap_between_recordings = _segmenter_parameter("min_gap_between_recordings")
+    early_transcription_on_silence = _segmenter_parameter("early_transcription_on_silence")
+    silero_sensitivity = _segmenter_parameter("silero_sensitivity")
+    silero_deactivity_detection = _segmenter_parameter("silero_deactivity_detection")
+    silero_end_threshold = _segmenter_parameter("silero_end_threshold")
+
     def __init__(self,
                  model: str = INIT_MODEL_TRANSCRIPTION,
                  download_root: str = None, 
@@ -301,6 +561,7 @@ class AudioToTextRecorder:
                  on_vad_detect_stop=None,
                  on_turn_detection_start=None,
                  on_turn_detection_stop=None,
+                 on_final_segment=None,
 
                  # Wake word parameters
                  wakeword_backend: str = "",
@@ -335,6 +596,24 @@ class AudioToTextRecorder:
                  faster_whisper_vad_filter: bool = True,
                  normalize_audio: bool = False,
                  start_callback_in_new_thread: bool = False,
+                 use_sample_clock: bool = False,
+                 audio_queue_backend: str = "queue",
+                 allowed_latency_ms: Optional[float] = None,
+                 buffer_overflow_policy: str = "drop_oldest",
+                 share_models_with: Optional["AudioToTextRecorder"] = None,
+                 silero_model_dir: Optional[str] = None,
+                 silero_onnx_threads: int = 1,
+                 silero_batched: bool = False,
+                 use_energy_gate: bool = False,
+                 energy_gate_margin_db: float = 10.0,
+                 trim_silence: bool = False,
+                 trim_silence_margin: float = 0.3,
+                 transcription_workers: int = 1,
+                 early_transcription_max_tail: float = 5.0,
+                 transcription_arena_mb: float = 32,
+                 model_warmup: str = WARMUP_BLOCKING,
+                 lazy_realtime_model: bool = False,
+                 silero_end_threshold: Optional[float] = None,
                  ):
         """
         Initializes an audio recorder and  transcription
@@ -360,9 +639,9 @@ class AudioToTextRecorder:
             device to use.
         - gpu_device_index (int, default=0): Device ID to use.
             The model can also be loaded on multiple GPUs by passing a list of
-            IDs (e.g. [0, 1, 2, 3]). In that case, multiple transcriptions can
-            run in parallel when transcribe() is called from multiple Python
-            threads
+            IDs (e.g. [0, 1, 2, 3]). Set transcription_workers to the number
+            of IDs to run one transcription worker per device, so multiple
+            transcriptions run in parallel.
         - device (str, default="cuda"): Device for model to use. Can either be 
             "cuda" or "cpu".
         - on_recording_start (callable, default=None): Callback function to be
@@ -424,7 +703,9 @@ class AudioToTextRecorder:
         - silero_use_onnx (bool, default=False): Enables usage of the
             pre-trained model from Silero in the ONNX (Open Neural Network
             Exchange) format instead of the PyTorch format. This is
-            recommended for faster performance.
+            recommended for faster performance. The ONNX model runs
+            directly on onnxruntime with numpy inputs (no torch calls) in
+            512-sample windows.
         - silero_deactivity_detection (bool, default=False): Enables the Silero
             model for end-of-speech detection. More robust against background
             noise. Utilizes additional GPU resources but improves accuracy in
@@ -466,6 +747,11 @@ class AudioToTextRecorder:
             to be called when the system starts to listen for a turn of speech.
         - on_turn_detection_stop (callable, default=None): Callback function to
             be called when the system stops listening for a turn of speech.
+        - on_final_segment (callable, default=None): Callback function to be
+            called with every TranscriptionSegment (text, start, end,
+            avg_logprob) of a final transcription as soon as the main model
+            has decoded it, before the whole transcription is done. Setting
+            it makes the workers stream the segments.
         - wakeword_backend (str, default=""): Specifies the backend library to
             use for wake word detection. Supported options include 'pvporcupine'
             for using the Porcupine wake word engine or 'oww' for using the
@@ -552,10 +838,12 @@ class AudioToTextRecorder:
             If silence lasts longer than post_speech_silence_duration, the 
             recording is stopped, and the transcription is submitted. If 
             voice activity resumes within this period, the transcription 
-            is discarded. Results in faster final transcriptions to the cost
-            of additional GPU load due to some unnecessary final transcriptions.
+            is kept and extended, see early_transcription_max_tail.
+            Results in faster final transcriptions to the cost of
+            additional GPU load.
         - allowed_latency_limit (int, default=100): Maximal amount of chunks
             that can be unprocessed in queue before discarding chunks.
+            Only used if allowed_latency_ms is not set.
         - no_log_file (bool, default=False): Skips writing of debug log file.
         - use_extended_logging (bool, default=False): Writes extensive
             log messages for the recording worker, that processes the audio
@@ -571,12 +859,132 @@ class AudioToTextRecorder:
             the callback functions will be executed in a
             new thread. This can help improve performance by allowing the
             callback to run concurrently with other operations.
+        - use_sample_clock (bool, default=False): If set to True, all
+            durations used for segmentation (silence durations, minimal
+            recording length, gaps, wake word delays and timeouts) are
+            measured by the number of audio samples processed instead of
+            the wall clock. Audio fed faster than realtime (e.g. replays of
+            recordings) then results in exactly the same utterance
+            boundaries as live capture. In this mode the Silero check runs
+            synchronously and handle_buffer_overflow is ignored, as both
+            would make the result depend on processing speed.
+        - audio_queue_backend (str, default="queue"): Transport used to
+            hand audio chunks from the audio reader to the recording worker.
+            "queue" uses a multiprocessing queue (chunks are pickled and
+            sent through a pipe by a feeder thread). "shared_memory" copies
+            the chunks into a ring buffer in shared memory, which avoids the
+            pickling and the feeder thread hop. Microphone chunks that do
+            not fit into the ring (about twice allowed_latency_limit
+            chunks) are dropped, feed_audio() waits for room instead.
+        - allowed_latency_ms (float, default=None): Maximal amount of
+            unprocessed audio in milliseconds waiting in the audio queue
+            before the buffer_overflow_policy discards audio. If None, the
+            budget is allowed_latency_limit chunks of buffer_size samples.
+        - buffer_overflow_policy (str, default="drop_oldest"): What to
+            discard when the backlog exceeds the latency budget.
+            "drop_oldest" discards the oldest chunks. "drop_non_speech"
+            discards only chunks the WebRTC VAD classifies as silence,
+            oldest first; speech is only discarded (oldest first) if the
+            backlog still exceeds twice the budget. "none" never discards.
+            Every discard is counted, see get_overflow_stats().
+            Ignored (same as "none") if handle_buffer_overflow is False.
+        - share_models_with (AudioToTextRecorder, default=None): Another
+            recorder whose transcription worker (main model) and realtime
+            model this recorder uses instead of loading its own. Voice
+            activity detection, segmentation and wake word state stay
+            separate, so several independent audio streams (e.g. the
+            channels of one recording, see MultiChannelRecorder) can be
+            transcribed with one copy of the models. The main model settings
+            (model, beam_size, initial_prompt, ...) are those of the other
+            recorder. It has to stay alive while this recorder is used.
+        - silero_model_dir (str, default=None): Directory of the local
+            Silero VAD model store. The model files are kept there per
+            Silero version and loaded directly instead of through
+            torch.hub; a missing file is downloaded once. Defaults to the
+            REALTIMESTT_MODEL_DIR environment variable or
+            ~/.cache/realtimestt. Copy the store to run offline.
+        - silero_onnx_threads (int, default=1): Number of threads
+            onnxruntime uses for the ONNX Silero model. With 1 the model
+            runs on the calling thread without a spinning thread pool.
+        - silero_batched (bool, default=False): Scores the ONNX Silero
+            model through a process-wide batch service: the pending windows
+            of all recorders created with this option are stacked and run
+            in one forward pass. Useful with many recorders (one per
+            caller) in one process. Needs silero_use_onnx.
+        - use_energy_gate (bool, default=False): Puts an adaptive
+            noise-floor gate in front of voice activity and wake word
+            detection while no recording is running. Chunks whose RMS level
+            stays below the noise floor plus energy_gate_margin_db skip the
+            WebRTC, Silero and wake word models. The openWakeWord model is
+            reset when the gate reopens, so it doesn't decode a stream with
+            the skipped chunks cut out. See get_energy_gate_stats().
+        - energy_gate_margin_db (float, default=10.0): How far above the
+            tracked noise floor (in dB) a chunk has to be to pass the gate.
+        - trim_silence (bool, default=False): Cuts the recorded audio to
+            the voiced region before it is transcribed, dropping most of
+            the pre-recording buffer and the post speech silence. The
+            voiced region comes from the voice activity decisions made
+            while recording. See get_trim_stats().
+        - trim_silence_margin (float, default=0.3): Seconds of audio kept
+            before and after the voiced region when trim_silence is set.
+        - transcription_workers (int, default=1): Number of main model
+            transcription workers. Requests go to the worker with the
+            fewest pending requests, so concurrent final transcriptions
+            (several threads, or recorders sharing the models) run in
+            parallel. With a list of gpu_device_index values each worker
+            gets one of the devices; on the CPU the cores are divided
+            between the workers. Like the single worker, the workers are
+            threads of this process on Linux and processes elsewhere (see
+            _start_thread). Linux threads run in parallel because
+            CTranslate2 releases the GIL while it encodes and decodes;
+            only the Python glue between the segments is serialized.
+        - early_transcription_max_tail (float, default=5.0): If speech
+            resumes after an early transcription (see
+            early_transcription_on_silence), the early result is kept.
+            When the recording ends at most this many seconds after the
+            audio the early transcription covered, only the new audio is
+            decoded, with the early text as prompt, and appended to the
+            early text. Longer extensions are decoded in full. 0 discards
+            early transcriptions on resumed speech. See
+            get_early_transcription_stats().
+        - transcription_arena_mb (float, default=32): Size of the shared
+            memory arena the audio of transcription requests is handed
+            to the workers through, instead of pickling it through the
+            pipe. Requests that don't fit are pickled as before. 0
+            disables the arena.
+        - model_warmup (str, default="blocking"): When the main and the
+            realtime model run their warm-up transcription. "blocking"
+            warms them up before initialization completes, "background"
+            after it (the first transcription waits for the warm-up of
+            the main model) and "off" skips the warm-up.
+        - lazy_realtime_model (bool, default=False): Loads the realtime
+            transcription model on the first recording instead of during
+            initialization. The first recording gets its realtime
+            updates only once the model is loaded. Recorders sharing
+            models (share_models_with) load it once, through the recorder
+            they share the models with, whichever of them records first.
+        - silero_end_threshold (float, default=None): Silero probability
+            below which a chunk counts as silence while recording, with
+            silero_deactivity_detection. A recording starts when the
+            probability reaches 1 - silero_sensitivity; the lower end
+            threshold (hysteresis) keeps short dips from ending it. None
+            uses 0.15 below the start threshold.
 
         Raises:
             Exception: Errors related to initializing transcription
             model, wake word detection, or audio recording.
         """
 
+        init_start = time.perf_counter()
+        # Seconds per initialization stage, see get_init_timings()
+        self.init_timings = {}
+        if model_warmup not in (WARMUP_BLOCKING, WARMUP_BACKGROUND, WARMUP_OFF):
+            raise ValueError(f"Unknown model_warmup: {model_warmup}")
+        self.model_warmup = model_warmup
+        self.lazy_realtime_model = lazy_realtime_model
+        # The recorder that loads the realtime model, see _load_realtime_model()
+        self.realtime_model_owner = self
+        self.realtime_model_lock = threading.Lock()
         self.language = language
         self.compute_type = compute_type
         self.input_device_index = input_device_index
@@ -607,6 +1015,9 @@ class AudioToTextRecorder:
         self.on_vad_detect_stop = on_vad_detect_stop
         self.on_turn_detection_start = on_turn_detection_start
         self.on_turn_detection_stop = on_turn_detection_stop
+        self.on_final_segment = on_final_segment
+        # Running text_segments() generators
+        self.segment_streams = 0
         self.on_wakeword_detection_start = on_wakeword_detection_start
         self.on_wakeword_detection_end = on_wakeword_detection_end
         self.on_recorded_chunk = on_recorded_chunk
@@ -631,11 +1042,61 @@ class AudioToTextRecorder:
         self.beam_size = beam_size
         self.beam_size_realtime = beam_size_realtime
         self.allowed_latency_limit = allowed_latency_limit
+        if buffer_overflow_policy not in BUFFER_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown buffer_overflow_policy: {buffer_overflow_policy}"
+            )
+        self.buffer_overflow_policy = (
+            buffer_overflow_policy if handle_buffer_overflow else "none"
+        )
+        self.chunk_duration_ms = 1000 * buffer_size / sample_rate
+        if allowed_latency_ms is None:
+            allowed_latency_ms = allowed_latency_limit * self.chunk_duration_ms
+        self.allowed_latency_ms = allowed_latency_ms
+        self.allowed_latency_chunks = max(
+            1, int(allowed_latency_ms // self.chunk_duration_ms))
+        # Chunks taken from the audio queue by the overflow policy that
+        # are still to be processed, in order, as (chunk, is_speech) with
+        # is_speech None until the chunk has been classified
+        self.overflow_backlog = collections.deque()
+        self.dropped_chunks = 0
+        self.dropped_speech_chunks = 0
+        self.dropped_audio_ms = 0.0
+        self.drop_events = collections.deque(maxlen=MAX_DROP_EVENTS)
+        self.energy_gate = (
+            EnergyGate(energy_gate_margin_db) if use_energy_gate else None
+        )
+        # Detector runs saved by the energy gate
+        self.energy_gate_skipped_vad = 0
+        self.energy_gate_skipped_wakeword = 0
+        # The wake word model missed chunks and needs a reset
+        self.wakeword_gated = False
+        self.trim_silence = trim_silence
+        self.trim_silence_margin = trim_silence_margin
+        # Stream sample position of the first sample in self.frames and
+        # end of the last chunk classified as speech while recording
+        self.frames_start_position = None
+        self.voiced_end_position = None
+        # Voiced part of the last recording, indices into its frames
+        self.voiced_region = None
+        self.trimmed_silence_seconds = 0.0
+        self.total_trimmed_silence_seconds = 0.0
+        self.trimmed_utterances = 0
         self.batch_size = batch_size
         self.realtime_batch_size = realtime_batch_size
 
         self.level = level
-        self.audio_queue = mp.Queue()
+        self.audio_queue_backend = audio_queue_backend
+        if audio_queue_backend == "shared_memory":
+            # Room for twice the allowed latency, each chunk with its length prefix
+            self.audio_queue = SharedAudioQueue(
+                2 * self.allowed_latency_chunks * (2 * buffer_size + 4))
+        elif audio_queue_backend == "queue":
+            self.audio_queue = mp.Queue()
+        else:
+            raise ValueError(
+                f"Unknown audio_queue_backend: {audio_queue_backend}"
+            )
         self.buffer_size = buffer_size
         self.sample_rate = sample_rate
         self.recording_start_time = 0
@@ -644,10 +1105,23 @@ class AudioToTextRecorder:
         self.last_recording_stop_time = 0
         self.wake_word_detect_time = 0
         self.silero_check_time = 0
-        self.silero_working = False
+        # Chunks waiting for the Silero worker thread, scored in order
+        self.silero_queue = queue.Queue(maxsize=SILERO_QUEUE_SIZE)
+        self.silero_lock = threading.Lock()
+        # Incremented whenever queued Silero checks become outdated
+        # (recording started or stopped), their results are discarded
+        self.silero_generation = 0
+        # (sample offset of the chunk, is speech) of the last Silero check
+        self.silero_result = None
+        self.silero_skipped_chunks = 0
+        # Start/stop decisions of the recording worker, in samples
+        self.segmenter = SpeechSegmenter()
         self.speech_end_silence_start = 0
         self.silero_sensitivity = silero_sensitivity
         self.silero_deactivity_detection = silero_deactivity_detection
+        self.silero_end_threshold = silero_end_threshold
+        # Silero probability of the last check, the segmenter's onset score
+        self.silero_probability = 0.0
         self.listen_start = 0
         self.spinner = spinner
         self.halo = None
@@ -659,6 +1133,7 @@ class AudioToTextRecorder:
         self.is_webrtc_speech_active = False
         self.is_silero_speech_active = False
         self.recording_thread = None
+        self.silero_thread = None
         self.realtime_thread = None
         self.audio_interface = None
         self.audio = None
@@ -679,14 +1154,33 @@ class AudioToTextRecorder:
         self.detected_realtime_language_probability = 0
         self.transcription_lock = threading.Lock()
         self.shutdown_lock = threading.Lock()
-        self.transcribe_count = 0
+        # EarlyTranscription of the current recording, and the one of the
+        # last stopped recording (its result becomes the final one)
+        self.early_transcription = None
+        self.final_early_transcription = None
+        self.stale_replies = 0
         self.print_transcription_time = print_transcription_time
         self.early_transcription_on_silence = early_transcription_on_silence
+        self.early_transcription_max_tail = early_transcription_max_tail
+        self.early_transcription_stats = {
+            "reused": 0,            # taken as the final result
+            "extended": 0,          # only the tail after it was decoded
+            "redecoded": 0,         # too long a tail, decoded in full
+            "saved_decode_seconds": 0.0,
+            "tail_decode_seconds": 0.0,
+        }
         self.use_extended_logging = use_extended_logging
         self.faster_whisper_vad_filter = faster_whisper_vad_filter
         self.normalize_audio = normalize_audio
         self.awaiting_speech_end = False
         self.start_callback_in_new_thread = start_callback_in_new_thread
+        self.feed_resamplers = {}
+        self.use_sample_clock = use_sample_clock
+        self.samples_processed = 0
+        # Sample clock timestamps start at construction time, so they look
+        # like (and can be formatted as) wall clock timestamps
+        self.sample_clock_epoch = time.time()
+        self.share_models_with = share_models_with
 
         # ----------------------------------------------------------------------------
         # Named logger configuration
@@ -703,9 +1197,11 @@ class AudioToTextRecorder:
         console_handler.setLevel(self.level)
         console_handler.setFormatter(logging.Formatter(log_format))
 
-        logger.addHandler(console_handler)
+        # Recorders sharing the models of another one use its handlers
+        if share_models_with is None:
+            logger.addHandler(console_handler)
 
-        if not no_log_file:
+        if not no_log_file and share_models_with is None:
             file_handler = logging.FileHandler('realtimesst.log')
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(logging.Formatter(file_log_format, datefmt='%Y-%m-%d %H:%M:%S'))
@@ -731,35 +1227,78 @@ class AudioToTextRecorder:
 
         self.interrupt_stop_event = mp.Event()
         self.was_interrupted = mp.Event()
-        self.main_transcription_ready_event = mp.Event()
-
-        self.parent_transcription_pipe, child_transcription_pipe = SafePipe()
-        self.parent_stdout_pipe, child_stdout_pipe = SafePipe()
+        if share_models_with is None:
+            self.transcription_workers = max(1, int(transcription_workers))
+            self.transcription_ready_events = [
+                mp.Event() for _ in range(self.transcription_workers)]
+            # Raw connections: SharedParentPipe serializes the sends itself
+            # and reads on its own threads
+            parent_transcription_pipes, child_transcription_pipes = zip(
+                *(mp.Pipe() for _ in range(self.transcription_workers)))
+            # Every recorder using these transcription workers gets its own
+            # end of the pipes, replies are routed to the requesting one
+            self.shared_transcription_pipe = SharedParentPipe(
+                list(parent_transcription_pipes), is_partial=_is_partial_reply)
+            # Audio of the requests goes through shared memory, the pipes
+            # only carry its position
+            self.audio_arena = (
+                SharedAudioArena(int(transcription_arena_mb * 1024 * 1024))
+                if transcription_arena_mb > 0 else None)
+            self.cancel_stats = {"cancelled_requests": 0,
+                                 "total_latency": 0.0, "max_latency": 0.0}
+            self.cancel_stats_lock = threading.Lock()
+            self.shared_transcription_pipe.on_discarded = self._on_discarded_reply
+            self.parent_stdout_pipes, child_stdout_pipes = zip(
+                *(SafePipe() for _ in range(self.transcription_workers)))
+        else:
+            self.transcription_workers = share_models_with.transcription_workers
+            self.transcription_ready_events = share_models_with.transcription_ready_events
+            self.shared_transcription_pipe = share_models_with.shared_transcription_pipe
+            self.audio_arena = share_models_with.audio_arena
+            self.cancel_stats = share_models_with.cancel_stats
+            self.cancel_stats_lock = share_models_with.cancel_stats_lock
+        self.main_transcription_ready_event = self.transcription_ready_events[0]
+        # Early and final requests of the recordings
+        self.parent_transcription_pipe = self.shared_transcription_pipe.channel()
+        # Realtime requests (use_main_model_for_realtime)
+        self.realtime_transcription_pipe = self.shared_transcription_pipe.channel()
 
         # Set device for model
         self.device = "cuda" if self.device == "cuda" and torch.cuda.is_available() else "cpu"
 
-        self.transcript_process = self._start_thread(
-            target=AudioToTextRecorder._transcription_worker,
-            args=(
-                child_transcription_pipe,
-                child_stdout_pipe,
-                self.main_model_type,
-                self.download_root,
-                self.compute_type,
-                self.gpu_device_index,
-                self.device,
-                self.main_transcription_ready_event,
-                self.shutdown_event,
-                self.interrupt_stop_event,
-                self.beam_size,
-                self.initial_prompt,
-                self.suppress_tokens,
-                self.batch_size,
-                self.faster_whisper_vad_filter,
-                self.normalize_audio,
-            )
-        )
+        workers_start = time.perf_counter()
+        if share_models_with is None:
+            self.transcript_processes = [
+                self._start_thread(
+                    target=AudioToTextRecorder._transcription_worker,
+                    args=(
+                        child_transcription_pipes[index],
+                        child_stdout_pipes[index],
+                        self.main_model_type,
+                        self.download_root,
+                        self.compute_type,
+                        self._worker_device_index(index),
+                        self.device,
+                        self.transcription_ready_events[index],
+                        self.shutdown_event,
+                        self.interrupt_stop_event,
+                        self.beam_size,
+                        self.initial_prompt,
+                        self.suppress_tokens,
+                        self.batch_size,
+                        self.faster_whisper_vad_filter,
+                        self.normalize_audio,
+                        self._worker_cpu_threads(),
+                        self.audio_arena,
+                        self.model_warmup,
+                    )
+                )
+                for index in range(self.transcription_workers)
+            ]
+        else:
+            self.transcript_processes = []
+        self.transcript_process = (self.transcript_processes[0]
+                                   if self.transcript_processes else None)
 
         # Start audio data reading process
         if self.use_microphone.value:
@@ -781,42 +1320,25 @@ class AudioToTextRecorder:
                 )
             )
 
+        # The realtime model, the wake word models and Silero VAD don't
+        # depend on each other, they load in parallel
+        init_stages = {}
+
         # Initialize the realtime transcription model
         if self.enable_realtime_transcription and not self.use_main_model_for_realtime:
-            try:
-                logger.info("Initializing faster_whisper realtime "
-                             f"transcription model {self.realtime_model_type}, "
-                             f"default device: {self.device}, "
-                             f"compute type: {self.compute_type}, "
-                             f"device index: {self.gpu_device_index}, "
-                             f"download root: {self.download_root}"
-                             )
-                self.realtime_model_type = faster_whisper.WhisperModel(
-                    model_size_or_path=self.realtime_model_type,
-                    device=self.device,
-                    compute_type=self.compute_type,
-                    device_index=self.gpu_device_index,
-                    download_root=self.download_root,
-                )
-                if self.realtime_batch_size > 0:
-                    self.realtime_model_type = BatchedInferencePipeline(model=self.realtime_model_type)
-
-                # Run a warm-up transcription
-                current_dir = os.path.dirname(os.path.realpath(__file__))
-                warmup_audio_path = os.path.join(
-                    current_dir, "warmup_audio.wav"
-                )
-                warmup_audio_data, _ = sf.read(warmup_audio_path, dtype="float32")
-                segments, info = self.realtime_model_type.transcribe(warmup_audio_data, language="en", beam_size=1)
-                model_warmup_transcription = " ".join(segment.text for segment in segments)
-            except Exception as e:
-                logger.exception("Error initializing faster_whisper "
-                                  f"realtime transcription model: {e}"
-                                  )
-                raise
-
-            logger.debug("Faster_whisper realtime speech to text "
-                          "transcription model initialized successfully")
+            if (share_models_with is not None
+                    and share_models_with.enable_realtime_transcription
+                    and not share_models_with.use_main_model_for_realtime):
+                # Also if the shared recorder loads its model lazily: the
+                # model is loaded once, by the shared recorder
+                logger.info("Using the realtime transcription model of the "
+                            "shared recorder")
+                self.realtime_model_owner = share_models_with.realtime_model_owner
+            if self.lazy_realtime_model:
+                logger.info("Loading the realtime transcription model "
+                            "on the first recording")
+            else:
+                init_stages["realtime_model"] = self._load_realtime_model
 
         # Setup wake word detection
         if wake_words or wakeword_backend in {'oww', 'openwakeword', 'openwakewords', 'pvp', 'pvporcupine'}:
@@ -832,7 +1354,8 @@ class AudioToTextRecorder:
             ]
 
             if wake_words and self.wakeword_backend in {'pvp', 'pvporcupine'}:
-
+                # Sets buffer_size and sample_rate, which WebRTC VAD needs
+                stage_start = time.perf_counter()
                 try:
                     self.porcupine = pvporcupine.create(
                         keywords=self.wake_words_list,
@@ -849,63 +1372,35 @@ class AudioToTextRecorder:
                     )
                     raise
 
+                self.init_timings["wakeword"] = time.perf_counter() - stage_start
                 logger.debug(
                     "Porcupine wake word detection engine initialized successfully"
                 )
 
             elif wake_words and self.wakeword_backend in {'oww', 'openwakeword', 'openwakewords'}:
-                    
-                openwakeword.utils.download_models()
+                init_stages["wakeword"] = lambda: self._init_openwakeword(
+                    openwakeword_model_paths, openwakeword_inference_framework)
 
-                try:
-                    if openwakeword_model_paths:
-                        model_paths = openwakeword_model_paths.split(',')
-                        self.owwModel = Model(
-                            wakeword_models=model_paths,
-                            inference_framework=openwakeword_inference_framework
-                        )
-                        logger.info(
-                            "Successfully loaded wakeword model(s): "
-                            f"{openwakeword_model_paths}"
-                        )
-                    else:
-                        self.owwModel = Model(
-                            inference_framework=openwakeword_inference_framework)
-                    
-                    self.oww_n_models = len(self.owwModel.models.keys())
-                    if not self.oww_n_models:
-                        logger.error(
-                            "No wake word models loaded."
-                        )
-
-                    for model_key in self.owwModel.models.keys():
-                        logger.info(
-                            "Successfully loaded openwakeword model: "
-                            f"{model_key}"
-                        )
-
-                except Exception as e:
-                    logger.exception(
-                        "Error initializing openwakeword "
-                        f"wake word detection engine: {e}"
-                    )
-                    raise
-
-                logger.debug(
-                    "Open wake word detection engine initialized successfully"
-                )
-            
             else:
                 logger.exception(f"Wakeword engine {self.wakeword_backend} unknown/unsupported or wake_words not specified. Please specify one of: pvporcupine, openwakeword.")
 
+        init_stages["silero_vad"] = lambda: self._init_silero_vad(
+            silero_use_onnx, silero_model_dir, silero_onnx_threads,
+            silero_batched)
+        init_threads = self._start_init_stages(init_stages)
 
         # Setup voice activity detection model WebRTC
+        stage_start = time.perf_counter()
         try:
             logger.info("Initializing WebRTC voice with "
                          f"Sensitivity {webrtc_sensitivity}"
                          )
-            self.webrtc_vad_model = webrtcvad.Vad()
-            self.webrtc_vad_model.set_mode(webrtc_sensitivity)
+            self.webrtc_vad = WebRTCVADEngine(webrtc_sensitivity, self.sample_rate)
+            self.webrtc_vad_model = self.webrtc_vad.vad
+            # Per-frame WebRTC decisions for the last chunk checked
+            self.last_speech_mask = np.zeros(0, dtype=bool)
+            # (chunk, 16 kHz samples) of the last chunk, see _to_16k()
+            self._last_16k = (None, None)
 
         except Exception as e:
             logger.exception("Error initializing WebRTC voice "
@@ -913,39 +1408,27 @@ class AudioToTextRecorder:
                               )
             raise
 
+        self.init_timings["webrtc_vad"] = time.perf_counter() - stage_start
         logger.debug("WebRTC VAD voice activity detection "
                       "engine initialized successfully"
                       )
 
-        # Setup voice activity detection model Silero VAD
-        try:
-            self.silero_vad_model, _ = torch.hub.load(
-                repo_or_dir="snakers4/silero-vad",
-                model="silero_vad",
-                verbose=False,
-                onnx=silero_use_onnx
-            )
-
-        except Exception as e:
-            logger.exception(f"Error initializing Silero VAD "
-                              f"voice activity detection engine: {e}"
-                              )
-            raise
-
-        logger.debug("Silero VAD voice activity detection "
-                      "engine initialized successfully"
-                      )
+        self._join_init_stages(init_threads)
 
-        self.audio_buffer = collections.deque(
-            maxlen=int((self.sample_rate // self.buffer_size) *
-                       self.pre_recording_buffer_duration)
+        self.audio_buffer = AudioRingBuffer(
+            int((self.sample_rate // self.buffer_size) *
+                self.pre_recording_buffer_duration) * self.buffer_size
         )
         self.last_words_buffer = collections.deque(
             maxlen=int((self.sample_rate // self.buffer_size) *
                        0.3)
         )
-        self.frames = []
-        self.last_frames = []
+        self.frames = AudioBuffer(keep_float=True)
+        self.last_frames = AudioBuffer(keep_float=True)
+
+        # Splits fed audio into chunks of buffer_size samples
+        # (silero complains if too short)
+        self.feed_chunker = AudioChunker(2 * self.buffer_size)
 
         # Recording control flags
         self.is_recording = False
@@ -953,11 +1436,21 @@ class AudioToTextRecorder:
         self.start_recording_on_voice_activity = False
         self.stop_recording_on_voice_deactivity = False
 
+        # The segmenter is configured once here and again whenever one of
+        # its parameters is assigned (see _segmenter_parameter)
+        self._configure_segmenter(self.segmenter, self.sample_rate)
+        self._segmenter_configured = True
+
         # Start the recording worker thread
         self.recording_thread = threading.Thread(target=self._recording_worker)
         self.recording_thread.daemon = True
         self.recording_thread.start()
 
+        # Start the Silero VAD worker thread
+        self.silero_thread = threading.Thread(target=self._silero_worker)
+        self.silero_thread.daemon = True
+        self.silero_thread.start()
+
         # Start the realtime transcription worker thread
         self.realtime_thread = threading.Thread(target=self._realtime_worker)
         self.realtime_thread.daemon = True
@@ -965,13 +1458,20 @@ class AudioToTextRecorder:
                    
         # Wait for transcription models to start
         logger.debug('Waiting for main transcription model to start')
-        self.main_transcription_ready_event.wait()
+        for ready_event in self.transcription_ready_events:
+            ready_event.wait()
+        if share_models_with is None:
+            self.init_timings["main_model"] = time.perf_counter() - workers_start
         logger.debug('Main transcription model ready')
 
-        self.stdout_thread = threading.Thread(target=self._read_stdout)
-        self.stdout_thread.daemon = True
-        self.stdout_thread.start()
+        if share_models_with is None:
+            self.stdout_thread = threading.Thread(target=self._read_stdout)
+            self.stdout_thread.daemon = True
+            self.stdout_thread.start()
 
+        self.init_timings["total"] = time.perf_counter() - init_start
+        logger.info("Initialization timings: " + ", ".join(
+            f"{stage} {seconds:.2f}s" for stage, seconds in self.init_timings.items()))
         logger.debug('RealtimeSTT initialization completed successfully')
                    
     def _start_thread(self, target=None, args=()):
@@ -997,13 +1497,199 @@ class AudioToTextRecorder:
             thread.start()
             return thread
 
+    def _start_init_stages(self, stages):
+        """
+        Runs independent initialization stages in parallel threads.
+
+        Args:
+            stages (dict): Stage name -> callable. The time each stage
+              takes is stored in init_timings under its name.
+
+        Returns:
+            tuple: (threads, errors) for _join_init_stages().
+        """
+        errors = []
+
+        def run_stage(name, stage):
+            stage_start = time.perf_counter()
+            try:
+                stage()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                self.init_timings[name] = time.perf_counter() - stage_start
+
+        threads = [
+            threading.Thread(target=run_stage, args=(name, stage),
+                             name=f"init_{name}", daemon=True)
+            for name, stage in stages.items()
+        ]
+        for thread in threads:
+            thread.start()
+        return threads, errors
+
+    def _join_init_stages(self, init_threads):
+        """Waits for the stages of _start_init_stages(), re-raises the first error."""
+        threads, errors = init_threads
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _load_realtime_model(self):
+        """
+        Takes the realtime model from realtime_model_owner, which loads it
+        on the first call. Recorders sharing models with the owner all call
+        it, so the model is loaded only once, also with lazy_realtime_model.
+        """
+        owner = self.realtime_model_owner
+        with owner.realtime_model_lock:
+            if owner.realtime_model_type is None:
+                # The owner was shut down before this recorder needed it
+                owner = self
+            if isinstance(owner.realtime_model_type, str):
+                owner._init_realtime_model()
+            self.realtime_model_type = owner.realtime_model_type
+
+    def _init_realtime_model(self):
+        """Loads (and warms up) the faster_whisper realtime model."""
+        try:
+            logger.info("Initializing faster_whisper realtime "
+                         f"transcription model {self.realtime_model_type}, "
+                         f"default device: {self.device}, "
+                         f"compute type: {self.compute_type}, "
+                         f"device index: {self.gpu_device_index}, "
+                         f"download root: {self.download_root}"
+                         )
+            realtime_model = faster_whisper.WhisperModel(
+                model_size_or_path=self.realtime_model_type,
+                device=self.device,
+                compute_type=self.compute_type,
+                device_index=self.gpu_device_index,
+                download_root=self.download_root,
+            )
+            if self.realtime_batch_size > 0:
+                realtime_model = BatchedInferencePipeline(model=realtime_model)
+
+            # Run a warm-up transcription
+            if self.model_warmup == WARMUP_BLOCKING:
+                _warm_up_model(realtime_model)
+            elif self.model_warmup == WARMUP_BACKGROUND:
+                threading.Thread(target=_warm_up_model, args=(realtime_model,),
+                                 name="realtime_warmup", daemon=True).start()
+        except Exception as e:
+            logger.exception("Error initializing faster_whisper "
+                              f"realtime transcription model: {e}"
+                              )
+            raise
+
+        self.realtime_model_type = realtime_model
+        logger.debug("Faster_whisper realtime speech to text "
+                      "transcription model initialized successfully")
+
+    def _init_openwakeword(self, openwakeword_model_paths,
+                           openwakeword_inference_framework):
+        """Loads the openwakeword models."""
+        openwakeword.utils.download_models()
+
+        try:
+            if openwakeword_model_paths:
+                model_paths = openwakeword_model_paths.split(',')
+                self.owwModel = Model(
+                    wakeword_models=model_paths,
+                    inference_framework=openwakeword_inference_framework
+                )
+                logger.info(
+                    "Successfully loaded wakeword model(s): "
+                    f"{openwakeword_model_paths}"
+                )
+            else:
+                self.owwModel = Model(
+                    inference_framework=openwakeword_inference_framework)
+
+            self.oww_n_models = len(self.owwModel.models.keys())
+            if not self.oww_n_models:
+                logger.error(
+                    "No wake word models loaded."
+                )
+
+            for model_key in self.owwModel.models.keys():
+                logger.info(
+                    "Successfully loaded openwakeword model: "
+                    f"{model_key}"
+                )
+
+        except Exception as e:
+            logger.exception(
+                "Error initializing openwakeword "
+                f"wake word detection engine: {e}"
+            )
+            raise
+
+        logger.debug(
+            "Open wake word detection engine initialized successfully"
+        )
+
+    def _init_silero_vad(self, silero_use_onnx, silero_model_dir,
+                         silero_onnx_threads, silero_batched):
+        """Loads the Silero VAD model."""
+        try:
+            try:
+                self.silero_vad_model = load_silero_vad(
+                    onnx=silero_use_onnx, model_dir=silero_model_dir,
+                    num_threads=silero_onnx_threads,
+                    batched=silero_batched)
+            except FileNotFoundError as e:
+                logger.warning(f"{e} Falling back to torch.hub.")
+                self.silero_vad_model, _ = torch.hub.load(
+                    repo_or_dir="snakers4/silero-vad",
+                    model="silero_vad",
+                    verbose=False,
+                    onnx=silero_use_onnx
+                )
+
+        except Exception as e:
+            logger.exception(f"Error initializing Silero VAD "
+                              f"voice activity detection engine: {e}"
+                              )
+            raise
+
+        logger.debug("Silero VAD voice activity detection "
+                      "engine initialized successfully"
+                      )
+
+    def get_init_timings(self):
+        """
+        Returns how long the stages of the initialization took.
+
+        Returns:
+            dict: Seconds per stage: main_model (until the transcription
+              workers were ready, loaded in parallel to everything else),
+              realtime_model, wakeword, webrtc_vad, silero_vad (the stages
+              that ran) and total.
+        """
+        return dict(self.init_timings)
+
+    def _now(self):
+        """
+        Returns the current time used for all segmentation decisions.
+
+        With use_sample_clock this is derived from the number of samples the
+        recording worker has consumed, otherwise it is the wall clock.
+        """
+        if self.use_sample_clock:
+            return self.sample_clock_epoch + self.samples_processed / self.sample_rate
+        return time.time()
+
     def _read_stdout(self):
+        timeout = 0.1 / len(self.parent_stdout_pipes)
         while not self.shutdown_event.is_set():
             try:
-                if self.parent_stdout_pipe.poll(0.1):
-                    logger.debug("Receive from stdout pipe")
-                    message = self.parent_stdout_pipe.recv()
-                    logger.info(message)
+                for stdout_pipe in self.parent_stdout_pipes:
+                    if stdout_pipe.poll(timeout):
+                        logger.debug("Receive from stdout pipe")
+                        message = stdout_pipe.recv()
+                        logger.info(message)
             except (BrokenPipeError, EOFError, OSError):
                 # The pipe probably has been closed, so we ignore the error
                 pass
@@ -1020,6 +1706,239 @@ class AudioToTextRecorder:
         worker = TranscriptionWorker(*args, **kwargs)
         worker.run()
 
+    def _transcription_request(self, kind, audio, use_prompt=True,
+                               deadline=None, language=None,
+                               clip_timestamps=None, prompt=None,
+                               stream_segments=False):
+        """
+        Creates a TranscriptionRequest with a new request id. The audio is
+        put into the shared memory arena if there is room for it.
+        """
+        if self.audio_arena is not None and isinstance(audio, np.ndarray) and len(audio):
+            audio_slice = self.audio_arena.put(audio)
+            if audio_slice is not None:
+                audio = audio_slice
+        return TranscriptionRequest(
+            request_id=next(_request_ids),
+            kind=kind,
+            deadline=deadline,
+            audio=audio,
+            language=self.language if language is None else language,
+            use_prompt=use_prompt,
+            clip_timestamps=clip_timestamps,
+            prompt=prompt,
+            stream_segments=stream_segments,
+        )
+
+    def _await_transcription(self, pipe, request_id, timeout=None,
+                             interruptible=True, on_segment=None):
+        """
+        Waits on a pipe end for the reply to request_id. Replies to other
+        requests that arrive on the same pipe end are stale and dropped.
+        Segments streamed ahead of the reply are passed to on_segment.
+
+        Returns:
+            tuple: (status, result), or None if the recorder was interrupted
+              (with interruptible set) or the timeout passed.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            if not pipe.poll(0.1): # check if transcription done
+                if interruptible and self.interrupt_stop_event.is_set():
+                    self._cancel_transcription(pipe, request_id)
+                    return None
+                if deadline is not None and time.time() > deadline:
+                    return None
+                continue
+            reply = pipe.recv()
+            if reply is None:  # pipe closed
+                return None
+            reply_id, status, result = reply
+            if reply_id == request_id and status == 'segment':
+                if on_segment is not None:
+                    on_segment(result)
+            elif reply_id == request_id:
+                return status, result
+            self.stale_replies += 1
+            logger.debug(f"Discarding stale transcription reply {reply_id}")
+
+    def _request_transcription(self, audio, use_prompt=True, prompt=None,
+                               on_segment=None):
+        """
+        Sends a final transcription request and waits for its reply, see
+        _await_transcription(). With on_segment, the segments are streamed.
+        """
+        # A pipe end per request: concurrent calls don't wait for
+        # each other and run in parallel on the transcription workers
+        transcription_pipe = self.shared_transcription_pipe.channel()
+        try:
+            request = self._transcription_request(
+                REQUEST_FINAL, audio, use_prompt, prompt=prompt,
+                stream_segments=on_segment is not None)
+            transcription_pipe.send(request)
+            return self._await_transcription(
+                transcription_pipe, request.request_id, on_segment=on_segment)
+        finally:
+            transcription_pipe.close()
+
+    def _shift_segments(self, on_segment, offset):
+        """Wraps on_segment to move segment times by offset samples."""
+        if on_segment is None or not offset:
+            return on_segment
+        seconds = offset / self.sample_rate
+        return lambda segment: on_segment(segment._replace(
+            start=segment.start + seconds, end=segment.end + seconds))
+
+    def _skip_segments(self, on_segment, count):
+        """Wraps on_segment to drop the first count segments."""
+        if on_segment is None or not count:
+            return on_segment
+        received = itertools.count()
+
+        def handle_segment(segment):
+            if next(received) >= count:
+                on_segment(segment)
+        return handle_segment
+
+    def _segment_handler(self, on_segment=None):
+        """
+        Callable for the streamed segments of a final transcription
+        (on_segment and on_final_segment), None if nobody wants them.
+        """
+        if self.on_final_segment is None:
+            return on_segment
+
+        def handle_segment(segment):
+            if on_segment is not None:
+                on_segment(segment)
+            self._run_callback(self.on_final_segment, segment)
+        return handle_segment
+
+    def _streams_segments(self):
+        """Whether final transcriptions of recordings stream their segments."""
+        return self.on_final_segment is not None or self.segment_streams > 0
+
+    def _can_extend(self, early, audio):
+        """
+        Whether the early transcription can be used for the final audio:
+        it covers all of it, or speech resumed and the remaining tail is
+        at most early_transcription_max_tail seconds long.
+        """
+        if not early.resumed:
+            return True
+        tail = len(audio) - early.end
+        return (early.start == 0 and 0 <= early.end <= len(audio)
+                and tail <= self.early_transcription_max_tail * self.sample_rate)
+
+    def _receive_early_transcription(self, early, audio, use_prompt,
+                                     on_segment=None):
+        """
+        Receives the early transcription of a recording and, if speech
+        resumed after it, extends it to the final audio.
+
+        Returns:
+            tuple: (status, result) like _await_transcription(), or None
+              if interrupted.
+        """
+        logger.debug(f"Receive early transcription request {early.request_id}")
+        streamed = _SegmentCounter(on_segment) if on_segment is not None else None
+        reply = self._await_transcription(
+            self.parent_transcription_pipe, early.request_id,
+            on_segment=self._shift_segments(streamed, early.start))
+        if reply is not None and early.resumed:
+            return self._extend_early_transcription(
+                early, reply, audio, use_prompt, on_segment,
+                streamed_segments=streamed.count if streamed is not None else 0)
+        if reply is not None:
+            self.early_transcription_stats["reused"] += 1
+        return reply
+
+    def _extend_early_transcription(self, early, early_reply, audio, use_prompt,
+                                    on_segment=None, streamed_segments=0):
+        """
+        Completes an early transcription that speech went on after by
+        decoding only the audio behind it, with the early text as prompt.
+        Falls back to a full decode if the early transcription failed. The
+        first streamed_segments segments of the full decode are not
+        streamed, the early transcription already streamed them.
+
+        Returns:
+            tuple: (status, result) like _await_transcription(), or None
+              if interrupted.
+        """
+        status, result = early_reply
+        if status != 'success':
+            self.early_transcription_stats["redecoded"] += 1
+            return self._request_transcription(
+                audio, use_prompt,
+                on_segment=self._skip_segments(on_segment, streamed_segments))
+
+        early_text, info, early_decode_time = result
+        tail = audio[early.end:]
+        if not len(tail):
+            self.early_transcription_stats["reused"] += 1
+            return early_reply
+        prompt = early_text
+        if use_prompt and isinstance(self.initial_prompt, str):
+            prompt = f"{self.initial_prompt} {early_text}"
+        reply = self._request_transcription(
+            tail, use_prompt, prompt=prompt,
+            on_segment=self._shift_segments(on_segment, early.end))
+        if reply is None or reply[0] != 'success':
+            return reply
+
+        tail_text, _, tail_decode_time = reply[1]
+        stats = self.early_transcription_stats
+        stats["extended"] += 1
+        stats["saved_decode_seconds"] += early_decode_time
+        stats["tail_decode_seconds"] += tail_decode_time
+        logger.debug(f"Decoded {len(tail) / self.sample_rate:.2f}s tail after early "
+                     f"transcription request {early.request_id} in {tail_decode_time:.3f}s, "
+                     f"saved {early_decode_time:.3f}s")
+        text = " ".join(t for t in (early_text, tail_text) if t)
+        return 'success', (text, info, early_decode_time + tail_decode_time)
+
+    def _cancel_transcription(self, pipe, request_id):
+        """
+        Drops the reply to request_id and stops the worker if it is still
+        transcribing it.
+        """
+        pipe.discard(request_id, cancel=TranscriptionCancel(request_id))
+
+    def _on_discarded_reply(self, reply):
+        """Counts the replies of cancelled requests and their latency."""
+        request_id, status, result = reply
+        if status != 'cancelled':
+            return
+        with self.cancel_stats_lock:
+            self.cancel_stats["cancelled_requests"] += 1
+            self.cancel_stats["total_latency"] += result
+            self.cancel_stats["max_latency"] = max(
+                self.cancel_stats["max_latency"], result)
+
+    def _discard_early_transcription(self):
+        """The pending early transcription won't be used, drop its reply."""
+        early = self.early_transcription
+        self.early_transcription = None
+        if early is not None:
+            self._cancel_transcription(self.parent_transcription_pipe, early.request_id)
+
+    def _worker_device_index(self, index):
+        """
+        Device index of a transcription worker: with a list of GPU indices
+        and several workers, each worker gets one of the devices.
+        """
+        if (self.transcription_workers > 1
+                and isinstance(self.gpu_device_index, (list, tuple))):
+            return self.gpu_device_index[index % len(self.gpu_device_index)]
+        return self.gpu_device_index
+
+    def _worker_cpu_threads(self):
+        """CPU threads per transcription worker (0: faster_whisper default)."""
+        if self.device != "cpu" or self.transcription_workers == 1:
+            return 0
+        return max(1, (os.cpu_count() or 1) // self.transcription_workers)
+
     def _run_callback(self, cb, *args, **kwargs):
         if self.start_callback_in_new_thread:
             # Run the callback in a new thread to avoid blocking the main thread
@@ -1190,32 +2109,30 @@ class AudioToTextRecorder:
                     time.sleep(3)  # Wait before retrying
                     continue
 
+        resampler = None
+
         def preprocess_audio(chunk, original_sample_rate, target_sample_rate):
             """Preprocess audio chunk similar to feed_audio method."""
+            nonlocal resampler
             if isinstance(chunk, np.ndarray):
                 # Handle stereo to mono conversion if necessary
                 if chunk.ndim == 2:
-                    chunk = np.mean(chunk, axis=1)
-
-                # Resample to target_sample_rate if necessary
-                if original_sample_rate != target_sample_rate:
-                    logger.debug(f"Resampling from {original_sample_rate} Hz to {target_sample_rate} Hz.")
-                    num_samples = int(len(chunk) * target_sample_rate / original_sample_rate)
-                    chunk = signal.resample(chunk, num_samples)
-
-                chunk = chunk.astype(np.int16)
+                    chunk = downmix_to_mono(chunk)
             else:
                 # If chunk is bytes, convert to numpy array
                 chunk = np.frombuffer(chunk, dtype=np.int16)
 
-                # Resample if necessary
-                if original_sample_rate != target_sample_rate:
+            # Resample to target_sample_rate if necessary. The streaming
+            # resampler keeps its filter state, so consecutive chunks are
+            # resampled without boundary artifacts.
+            if original_sample_rate != target_sample_rate:
+                if (resampler is None
+                        or resampler.original_sample_rate != original_sample_rate):
                     logger.debug(f"Resampling from {original_sample_rate} Hz to {target_sample_rate} Hz.")
-                    num_samples = int(len(chunk) * target_sample_rate / original_sample_rate)
-                    chunk = signal.resample(chunk, num_samples)
-                    chunk = chunk.astype(np.int16)
+                    resampler = StreamingResampler(original_sample_rate, target_sample_rate)
+                chunk = resampler.process(chunk)
 
-            return chunk.tobytes()
+            return chunk.astype(np.int16, copy=False).tobytes()
 
         audio_interface = None
         stream = None
@@ -1223,7 +2140,8 @@ class AudioToTextRecorder:
         chunk_size = 1024  # Increased chunk size for better performance
 
         def setup_audio():  
-            nonlocal audio_interface, stream, device_sample_rate, input_device_index
+            nonlocal audio_interface, stream, device_sample_rate, input_device_index, resampler
+            resampler = None
             try:
                 if audio_interface is None:
                     logger.debug("Creating PyAudio interface...")
@@ -1308,7 +2226,8 @@ class AudioToTextRecorder:
                             else:
                                 time_since_last_buffer_message = time.time()
 
-                            audio_queue.put(to_process)
+                            # Never block the live reader, a full queue drops
+                            audio_queue.put_nowait(to_process)
 
                 except OSError as e:
                     if e.errno == pyaudio.paInputOverflowed:
@@ -1361,7 +2280,7 @@ class AudioToTextRecorder:
         finally:
             # After recording stops, feed any remaining audio data
             if buffer:
-                audio_queue.put(bytes(buffer))
+                audio_queue.put_nowait(bytes(buffer))
 
             try:
                 if stream:
@@ -1376,7 +2295,7 @@ class AudioToTextRecorder:
         """
         If in wake work modus, wake up as if a wake word was spoken.
         """
-        self.listen_start = time.time()
+        self.listen_start = self._now()
 
     def abort(self):
         state = self.state
@@ -1409,7 +2328,7 @@ class AudioToTextRecorder:
         try:
             logger.info("Setting listen time")
             if self.listen_start == 0:
-                self.listen_start = time.time()
+                self.listen_start = self._now()
 
             # If not yet started recording, wait for voice activity to initiate.
             if not self.is_recording and not self.frames:
@@ -1440,29 +2359,17 @@ class AudioToTextRecorder:
             # Calculate samples needed for backdating resume
             samples_to_keep = int(self.sample_rate * self.backdate_resume_seconds)
 
-            # First convert all current frames to audio array
-            full_audio_array = np.frombuffer(b''.join(frames), dtype=np.int16)
-            full_audio = full_audio_array.astype(np.float32) / INT16_MAX_ABS_VALUE
+            # Zero-copy views onto the recorded samples
+            full_audio_array = frames.view()
+            full_audio = frames.float_view()
 
-            # Calculate how many samples we need to keep for backdating resume
+            # Keep the last N samples for backdating resume. The view stays
+            # valid after clear() because the buffer switches storage.
             if samples_to_keep > 0:
-                samples_to_keep = min(samples_to_keep, len(full_audio))
-                # Keep the last N samples for backdating resume
-                frames_to_read_audio = full_audio[-samples_to_keep:]
-
-                # Convert the audio back to int16 bytes for frames
-                frames_to_read_int16 = (frames_to_read_audio * INT16_MAX_ABS_VALUE).astype(np.int16)
-                frame_bytes = frames_to_read_int16.tobytes()
-
-                # Split into appropriate frame sizes (assuming standard frame size)
-                FRAME_SIZE = 2048  # Typical frame size
-                frames_to_read = []
-                for i in range(0, len(frame_bytes), FRAME_SIZE):
-                    frame = frame_bytes[i:i + FRAME_SIZE]
-                    if frame:  # Only add non-empty frames
-                        frames_to_read.append(frame)
+                samples_to_keep = min(samples_to_keep, len(full_audio_array))
+                frames_to_read = full_audio_array[-samples_to_keep:]
             else:
-                frames_to_read = []
+                frames_to_read = None
 
             # Process backdate stop seconds
             samples_to_remove = int(self.sample_rate * self.backdate_stop_seconds)
@@ -1479,9 +2386,30 @@ class AudioToTextRecorder:
                 self.audio = full_audio
                 logger.debug(f"No samples removed, final audio length: {len(self.audio)}")
 
+            audio_start = 0
+            if self.trim_silence:
+                audio_start, _ = self._voiced_bounds(
+                    len(self.audio), self.voiced_region)
+                self.audio, trimmed = self._trim_to_voiced(
+                    self.audio, self.voiced_region)
+                self.trimmed_silence_seconds = trimmed
+                if trimmed:
+                    self.total_trimmed_silence_seconds += trimmed
+                    self.trimmed_utterances += 1
+                    logger.debug(f"Trimmed {trimmed:.3f}s of silence, "
+                                 f"final audio length: {len(self.audio)}")
+            self.voiced_region = None
+
+            # Index the audio of the early transcription in the final audio
+            early = self.final_early_transcription
+            if early is not None:
+                self.final_early_transcription = early._replace(
+                    start=early.start - audio_start, end=early.end - audio_start)
+
             self.frames.clear()
             self.last_frames.clear()
-            self.frames.extend(frames_to_read)
+            if frames_to_read is not None:
+                self.frames.append(frames_to_read)
 
             # Reset backdating parameters
             self.backdate_stop_seconds = 0.0
@@ -1497,62 +2425,72 @@ class AudioToTextRecorder:
             raise  # Re-raise the exception after cleanup
 
 
-    def perform_final_transcription(self, audio_bytes=None, use_prompt=True):
+    def perform_final_transcription(self, audio_bytes=None, use_prompt=True,
+                                    on_segment=None):
         start_time = 0
-        with self.transcription_lock:
-            if audio_bytes is None:
-                audio_bytes = copy.deepcopy(self.audio)
-
-            if audio_bytes is None or len(audio_bytes) == 0:
-                print("No audio data available for transcription")
-                #logger.info("No audio data available for transcription")
-                return ""
+        on_segment = self._segment_handler(on_segment)
+        if audio_bytes is None:
+            audio_bytes = copy.deepcopy(self.audio)
 
-            try:
-                if self.transcribe_count == 0:
-                    logger.debug("Adding transcription request, no early transcription started")
-                    start_time = time.time()  # Start timing
-                    self.parent_transcription_pipe.send((audio_bytes, self.language, use_prompt))
-                    self.transcribe_count += 1
-
-                while self.transcribe_count > 0:
-                    logger.debug(F"Receive from parent_transcription_pipe after sendiung transcription request, transcribe_count: {self.transcribe_count}")
-                    if not self.parent_transcription_pipe.poll(0.1): # check if transcription done
-                        if self.interrupt_stop_event.is_set(): # check if interrupted
-                            self.was_interrupted.set()
-                            self._set_state("inactive")
-                            return "" # return empty string if interrupted
-                        continue
-                    status, result = self.parent_transcription_pipe.recv()
-                    self.transcribe_count -= 1
+        if audio_bytes is None or len(audio_bytes) == 0:
+            print("No audio data available for transcription")
+            #logger.info("No audio data available for transcription")
+            return ""
 
-                self.allowed_to_early_transcribe = True
+        try:
+            with self.transcription_lock:
+                # The early transcription of the last recording is its result
+                early = self.final_early_transcription
+                self.final_early_transcription = None
+                reply = None
+                if early is not None and not self._can_extend(early, audio_bytes):
+                    logger.debug(f"Speech went on for too long after early transcription "
+                                 f"request {early.request_id}, decoding in full")
+                    self._cancel_transcription(self.parent_transcription_pipe, early.request_id)
+                    self.early_transcription_stats["redecoded"] += 1
+                    early = None
+                if early is not None:
+                    reply = self._receive_early_transcription(
+                        early, audio_bytes, use_prompt, on_segment)
+
+            if early is None:
+                logger.debug("Adding transcription request, no early transcription started")
+                start_time = time.time()  # Start timing
+                reply = self._request_transcription(
+                    audio_bytes, use_prompt, on_segment=on_segment)
+
+            if reply is None: # interrupted
+                self.was_interrupted.set()
                 self._set_state("inactive")
-                if status == 'success':
-                    segments, info = result
-                    self.detected_language = info.language if info.language_probability > 0 else None
-                    self.detected_language_probability = info.language_probability
-                    self.last_transcription_bytes = copy.deepcopy(audio_bytes)
-                    self.last_transcription_bytes_b64 = base64.b64encode(self.last_transcription_bytes.tobytes()).decode('utf-8')
-                    transcription = self._preprocess_output(segments)
-                    end_time = time.time()  # End timing
-                    transcription_time = end_time - start_time
-
-                    if start_time:
-                        if self.print_transcription_time:
-                            print(f"Model {self.main_model_type} completed transcription in {transcription_time:.2f} seconds")
-                        else:
-                            logger.debug(f"Model {self.main_model_type} completed transcription in {transcription_time:.2f} seconds")
-                    return "" if self.interrupt_stop_event.is_set() else transcription # if interrupted return empty string
-                else:
-                    logger.error(f"Transcription error: {result}")
-                    raise Exception(result)
-            except Exception as e:
-                logger.error(f"Error during transcription: {str(e)}", exc_info=True)
-                raise e
+                return "" # return empty string if interrupted
+            status, result = reply
+
+            self._set_state("inactive")
+            if status == 'success':
+                segments, info, _ = result
+                self.detected_language = info.language if info.language_probability > 0 else None
+                self.detected_language_probability = info.language_probability
+                self.last_transcription_bytes = copy.deepcopy(audio_bytes)
+                self.last_transcription_bytes_b64 = base64.b64encode(self.last_transcription_bytes.tobytes()).decode('utf-8')
+                transcription = self._preprocess_output(segments)
+                end_time = time.time()  # End timing
+                transcription_time = end_time - start_time
+
+                if start_time:
+                    if self.print_transcription_time:
+                        print(f"Model {self.main_model_type} completed transcription in {transcription_time:.2f} seconds")
+                    else:
+                        logger.debug(f"Model {self.main_model_type} completed transcription in {transcription_time:.2f} seconds")
+                return "" if self.interrupt_stop_event.is_set() else transcription # if interrupted return empty string
+            else:
+                logger.error(f"Transcription error: {result}")
+                raise Exception(result)
+        except Exception as e:
+            logger.error(f"Error during transcription: {str(e)}", exc_info=True)
+            raise e
 
 
-    def transcribe(self):
+    def transcribe(self, on_segment=None):
         """
         Transcribes audio captured by this class instance using the
         `faster_whisper` model.
@@ -1570,6 +2508,8 @@ class AudioToTextRecorder:
               and the callback will receive the transcription as its argument.
               If omitted, the transcription will be performed synchronously,
               and the result will be returned.
+            on_segment (callable, optional): Called with each
+              TranscriptionSegment as soon as it is decoded.
 
         Returns (if no callback is set):
             str: The transcription of the recorded audio.
@@ -1582,11 +2522,210 @@ class AudioToTextRecorder:
         if self.on_transcription_start:
             abort_value = self.on_transcription_start(audio_copy)
             if not abort_value:
-                return self.perform_final_transcription(audio_copy)
+                return self.perform_final_transcription(audio_copy, on_segment=on_segment)
             return None
         else:
-            return self.perform_final_transcription(audio_copy)
+            return self.perform_final_transcription(audio_copy, on_segment=on_segment)
+
+    def transcribe_file(self, file_path, language=None):
+        """
+        Transcribes a recorded audio file faster than realtime.
+
+        The file (WAV, FLAC or any other format soundfile can read) is read
+        in blocks, downmixed to mono and resampled to 16 kHz. The WebRTC and
+        Silero voice activity detection splits it into utterances with the
+        same parameters that are used for live recordings
+        (post_speech_silence_duration, min_length_of_recording,
+        min_gap_between_recordings, pre_recording_buffer_duration). The
+        utterances are then sent to the transcription worker in batches of
+        batch_size clips, which the BatchedInferencePipeline decodes in
+        parallel.
+
+        Do not call this while the recorder processes live audio, the VAD
+        models are shared.
+
+        Args:
+            file_path (str): Path of the audio file.
+            language (str, optional): Language code, defaults to the
+              language the recorder was initialized with.
+
+        Returns:
+            list of dict: One entry per utterance with the keys "start" and
+              "end" (sample offsets at 16 kHz) and "text".
+        """
+        start_time = time.time()
+        language = self.language if language is None else language
+
+        # Read the file in blocks into one 16 kHz int16 buffer
+        audio = AudioBuffer(keep_float=True)
+        with sf.SoundFile(file_path) as audio_file:
+            resampler = StreamingResampler(audio_file.samplerate, SAMPLE_RATE)
+            for block in audio_file.blocks(blocksize=FILE_READ_BLOCK_SIZE, dtype='int16', always_2d=True):
+                audio.append(resampler.process(downmix_to_mono(block)))
+            # The samples the filter delay still holds back
+            audio.append(resampler.flush())
+
+        samples = audio.view()
+        utterances = self._segment_file_audio(samples)
+        logger.debug(f"transcribe_file found {len(utterances)} utterances in "
+                     f"{len(samples) / SAMPLE_RATE:.1f}s of audio")
+
+        # Whisper sees at most 30 seconds at once, split longer utterances
+        clips = []
+        for index, (utterance_start, utterance_end) in enumerate(utterances):
+            for clip_start, clip_end in self._split_long_utterance(
+                    samples, utterance_start, utterance_end):
+                clips.append((index, clip_start, clip_end))
+
+        texts = [[] for _ in utterances]
+        clips_per_request = max(1, self.batch_size)
+        float_audio = audio.float_view()
+
+        # All batches are sent before the first result is awaited, each
+        # through its own pipe end, so a worker pool decodes them in parallel
+        requests = []
+        try:
+            for batch_start in range(0, len(clips), clips_per_request):
+                batch = clips[batch_start:batch_start + clips_per_request]
+
+                # Send only the clips of this batch, packed back to back
+                batch_audio = np.concatenate(
+                    [float_audio[clip_start:clip_end] for _, clip_start, clip_end in batch])
+                clip_offsets = np.cumsum([0] + [clip_end - clip_start for _, clip_start, clip_end in batch])
+                clip_timestamps = [
+                    (clip_offsets[i] / SAMPLE_RATE, clip_offsets[i + 1] / SAMPLE_RATE)
+                    for i in range(len(batch))
+                ]
+
+                request = self._transcription_request(
+                    REQUEST_FINAL, batch_audio, language=language,
+                    clip_timestamps=clip_timestamps)
+                transcription_pipe = self.shared_transcription_pipe.channel()
+                requests.append((batch, clip_offsets, transcription_pipe, request.request_id))
+                transcription_pipe.send(request)
+
+            for batch, clip_offsets, transcription_pipe, request_id in requests:
+                status, result = self._await_transcription(
+                    transcription_pipe, request_id, interruptible=False)
+
+                if status != 'success':
+                    logger.error(f"Transcription error: {result}")
+                    raise Exception(result)
+
+                segments, info, _ = result
+                for segment_start, segment_end, text in segments:
+                    # Assign each segment to the clip containing its center
+                    center = (segment_start + segment_end) / 2 * SAMPLE_RATE
+                    clip_index = min(
+                        max(0, int(np.searchsorted(clip_offsets, center, side='right')) - 1),
+                        len(batch) - 1)
+                    texts[batch[clip_index][0]].append(text)
+        finally:
+            # After an error the remaining batches are not needed anymore
+            for _, _, transcription_pipe, request_id in requests:
+                self._cancel_transcription(transcription_pipe, request_id)
+                transcription_pipe.close()
+
+        results = [
+            {
+                "start": int(utterance_start),
+                "end": int(utterance_end),
+                "text": self._preprocess_output(" ".join(utterance_texts)),
+            }
+            for (utterance_start, utterance_end), utterance_texts in zip(utterances, texts)
+        ]
+
+        elapsed = time.time() - start_time
+        duration = len(samples) / SAMPLE_RATE
+        logger.info(f"transcribe_file processed {duration:.1f}s of audio in {elapsed:.2f}s "
+                    f"({duration / elapsed if elapsed else 0:.1f}x realtime)")
+        return results
+
+    def _segment_file_audio(self, samples):
+        """
+        Splits 16 kHz int16 audio into utterances with the WebRTC and
+        Silero voice activity detection, mirroring the start and stop
+        conditions of the live recording worker.
+
+        Returns:
+            list of tuple: (start, end) sample offsets of the utterances.
+        """
+        chunk_size = BUFFER_SIZE
+        segmenter = SpeechSegmenter()
+        self._configure_segmenter(segmenter, SAMPLE_RATE)
+
+        def webrtc_score(chunk):
+            # Share of speech frames, like _deactivity_score
+            mask = self.webrtc_vad.speech_mask(chunk, chunk)
+            return float(np.count_nonzero(mask)) / len(mask) if len(mask) else 1.0
+
+        def silero_score(chunk):
+            audio_chunk = chunk.astype(np.float32) / INT16_MAX_ABS_VALUE
+            with self.silero_lock:
+                return self._silero_model_probability(audio_chunk)
+
+        utterances = []
+
+        self._reset_silero()
+        for position in range(0, len(samples) - chunk_size + 1, chunk_size):
+            chunk = samples[position:position + chunk_size]
+            if not segmenter.in_speech:
+                if not segmenter.can_start(position):
+                    continue
+                # Silero probability of chunks WebRTC hears speech in,
+                # like _onset_score
+                score = (silero_score(chunk)
+                         if self.webrtc_vad.is_speech(chunk, samples=chunk) else 0.0)
+            elif self.silero_deactivity_detection:
+                score = silero_score(chunk)
+            else:
+                score = webrtc_score(chunk)
+            for event in segmenter.process(position, chunk_size, score):
+                if event.kind == SPEECH_START:
+                    self._reset_silero()
+                elif event.kind == SPEECH_END:
+                    utterances.append((event.segment_start, event.position))
+
+        if segmenter.in_speech:
+            utterances.append((segmenter.segment_start, len(samples)))
+        self._reset_silero()
+        return utterances
+
+    def _split_long_utterance(self, samples, start, end):
+        """
+        Splits an utterance into clips of at most MAX_CLIP_SECONDS,
+        cutting at the quietest chunk of the last five seconds before
+        each limit.
 
+        Returns:
+            list of tuple: (start, end) sample offsets of the clips.
+        """
+        max_length = MAX_CLIP_SECONDS * SAMPLE_RATE
+        search_length = 5 * SAMPLE_RATE
+        clips = []
+        while end - start > max_length:
+            window = samples[start + max_length - search_length:start + max_length]
+            window = window[:len(window) // BUFFER_SIZE * BUFFER_SIZE]
+            energy = np.square(
+                window.reshape(-1, BUFFER_SIZE).astype(np.float32)).mean(axis=1)
+            cut = start + max_length - search_length + int(np.argmin(energy)) * BUFFER_SIZE
+            clips.append((start, cut))
+            start = cut
+        clips.append((start, end))
+        return clips
+
+
+    def _reset_wakeword(self):
+        """
+        Clears the frame history of the wake word model after the energy
+        gate skipped chunks, so the next chunk doesn't continue a stream
+        with a gap in it. openWakeWord refills its feature buffer and
+        clears its scores. Porcupine has no reset; its window is short and
+        was filled with silence below the noise floor, so it is left as is.
+        """
+        self.wakeword_gated = False
+        if self.wakeword_backend in {'oww', 'openwakeword', 'openwakewords'}:
+            self.owwModel.reset()
 
     def _process_wakeword(self, data):
         """
@@ -1603,7 +2742,7 @@ class AudioToTextRecorder:
             return porcupine_index
 
         elif self.wakeword_backend in {'oww', 'openwakeword', 'openwakewords'}:
-            pcm = np.frombuffer(data, dtype=np.int16)
+            pcm = self._to_16k(data)
             prediction = self.owwModel.predict(pcm)
             max_score = -1
             max_index = -1
@@ -1673,6 +2812,62 @@ class AudioToTextRecorder:
             return self.transcribe()
 
 
+    def text_segments(self):
+        """
+        Generator form of text(): records an utterance like text() and
+        yields its TranscriptionSegments (text, start, end, avg_logprob)
+        while the main model is still decoding the rest, so the first
+        sentence can be processed before the last one is transcribed.
+
+        Yields:
+            TranscriptionSegment: The segments in order, with the raw text
+              of the model (no ensure_sentence_* formatting).
+
+        Raises:
+            Exception: If there is an error during the transcription process.
+        """
+        # Counted from the start, so early transcriptions of this recording
+        # stream their segments too
+        self.segment_streams += 1
+        try:
+            self.interrupt_stop_event.clear()
+            self.was_interrupted.clear()
+            try:
+                self.wait_audio()
+            except KeyboardInterrupt:
+                logger.info("KeyboardInterrupt in text_segments() method")
+                self.shutdown()
+                raise  # Re-raise the exception after cleanup
+
+            if self.is_shut_down or self.interrupt_stop_event.is_set():
+                if self.interrupt_stop_event.is_set():
+                    self.was_interrupted.set()
+                return
+
+            segments = queue.Queue()
+            errors = []
+
+            def transcribe():
+                try:
+                    self.transcribe(on_segment=segments.put)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    segments.put(None)
+
+            transcribe_thread = threading.Thread(target=transcribe, daemon=True)
+            transcribe_thread.start()
+            while True:
+                segment = segments.get()
+                if segment is None:
+                    break
+                yield segment
+            transcribe_thread.join()
+            if errors:
+                raise errors[0]
+        finally:
+            self.segment_streams -= 1
+
     def format_number(self, num):
         # Convert the number to a string
         num_str = f"{num:.10f}"  # Ensure precision is sufficient
@@ -1689,7 +2884,7 @@ class AudioToTextRecorder:
 
         # Ensure there's a minimum interval
         # between stopping and starting recording
-        if (time.time() - self.recording_stop_time
+        if (self._now() - self.recording_stop_time
                 < self.min_gap_between_recordings):
             logger.info("Attempted to start recording "
                          "too soon after stopping."
@@ -1703,13 +2898,19 @@ class AudioToTextRecorder:
         self.realtime_stabilized_safetext = ""
         self.wakeword_detected = False
         self.wake_word_detect_time = 0
-        self.frames = []
+        self.frames = AudioBuffer(keep_float=True)
         if frames:
-            self.frames = frames
+            if isinstance(frames, AudioBuffer):
+                self.frames = frames
+            else:
+                self.frames.extend(frames)
         self.is_recording = True
 
-        self.recording_start_time = time.time()
+        self.recording_start_time = self._now()
+        self._discard_early_transcription()
+        self.silero_generation += 1
         self.is_silero_speech_active = False
+        self.silero_probability = 0.0
         self.is_webrtc_speech_active = False
         self.stop_recording_event.clear()
         self.start_recording_event.set()
@@ -1736,7 +2937,7 @@ class AudioToTextRecorder:
 
         # Ensure there's a minimum interval
         # between starting and stopping recording
-        if (time.time() - self.recording_start_time
+        if (self._now() - self.recording_start_time
                 < self.min_length_of_recording):
             logger.info("Attempted to stop recording "
                          "too soon after starting."
@@ -1744,12 +2945,21 @@ class AudioToTextRecorder:
             return self
 
         logger.info("recording stopped")
-        self.last_frames = copy.deepcopy(self.frames)
+        self.voiced_region = self._voiced_region()
+        # The early transcription (if any) is the result of this recording,
+        # a reply to an unused one is dropped as stale when it arrives
+        self.final_early_transcription = self.early_transcription
+        self.early_transcription = None
+        # start() always creates a fresh buffer, so handing over the
+        # current one is enough - no copy of the recording needed
+        self.last_frames = self.frames
         self.backdate_stop_seconds = backdate_stop_seconds
         self.backdate_resume_seconds = backdate_resume_seconds
         self.is_recording = False
-        self.recording_stop_time = time.time()
+        self.recording_stop_time = self._now()
+        self.silero_generation += 1
         self.is_silero_speech_active = False
+        self.silero_probability = 0.0
         self.is_webrtc_speech_active = False
         self.silero_check_time = 0
         self.start_recording_event.clear()
@@ -1770,7 +2980,7 @@ class AudioToTextRecorder:
         The recorder now "listens" for voice activation.
         Once voice is detected we enter "recording" state.
         """
-        self.listen_start = time.time()
+        self.listen_start = self._now()
         self._set_state("listening")
         self.start_recording_on_voice_activity = True
 
@@ -1780,39 +2990,83 @@ class AudioToTextRecorder:
         accumulated until the buffer size is reached, and then the accumulated
         data is fed into the audio_queue.
         """
-        # Check if the buffer attribute exists, if not, initialize it
-        if not hasattr(self, 'buffer'):
-            self.buffer = bytearray()
+        for to_process in self.feed_chunker.split(
+                self._prepare_fed_audio(chunk, original_sample_rate)):
+            # Feed the extracted data to the audio_queue
+            self._put_fed_chunk(to_process)
+
+    def feed_audio_many(self, chunks, original_sample_rate=16000):
+        """
+        Feed a large amount of audio in one call.
+
+        Accepts a single buffer (e.g. several seconds of audio as bytes or
+        NumPy array) or an iterable of buffers. All of it is converted and
+        split into aligned chunks in one pass, which are then put into the
+        audio_queue.
+
+        Args:
+            chunks (bytes, np.ndarray or iterable of those): Audio data.
+            original_sample_rate (int, default=16000): Sample rate of the
+              audio data.
+
+        Returns:
+            int: Number of chunks put into the audio_queue.
+        """
+        if isinstance(chunks, (bytes, bytearray, memoryview, np.ndarray)):
+            chunks = (chunks,)
+
+        to_process = []
+        for chunk in chunks:
+            to_process.extend(self.feed_chunker.split(
+                self._prepare_fed_audio(chunk, original_sample_rate)))
+
+        for data in to_process:
+            self._put_fed_chunk(data)
+        return len(to_process)
+
+    def _put_fed_chunk(self, data):
+        """
+        Puts a fed chunk into the audio_queue. Unlike the live reader, fed
+        audio (which may come faster than realtime) waits for room in a
+        full shared memory ring instead of being dropped.
+        """
+        while True:
+            try:
+                self.audio_queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                if not self.is_running:
+                    return
+
+    def _prepare_fed_audio(self, chunk, original_sample_rate):
+        """
+        Converts fed audio to mono 16 kHz 16-bit PCM (bytes-like or a
+        contiguous int16 array) without copying data that is already in
+        that format.
+        """
+        # Raw 16-bit PCM at a foreign rate gets resampled as well
+        if not isinstance(chunk, np.ndarray) and original_sample_rate != 16000:
+            chunk = np.frombuffer(chunk, dtype=np.int16)
 
         # Check if input is a NumPy array
         if isinstance(chunk, np.ndarray):
             # Handle stereo to mono conversion if necessary
             if chunk.ndim == 2:
-                chunk = np.mean(chunk, axis=1)
+                chunk = downmix_to_mono(chunk)
 
-            # Resample to 16000 Hz if necessary
+            # Resample to 16000 Hz if necessary, keeping one streaming
+            # resampler per input rate so its state carries across calls
             if original_sample_rate != 16000:
-                num_samples = int(len(chunk) * 16000 / original_sample_rate)
-                chunk = resample(chunk, num_samples)
-
-            # Ensure data type is int16
-            chunk = chunk.astype(np.int16)
-
-            # Convert the NumPy array to bytes
-            chunk = chunk.tobytes()
+                resampler = self.feed_resamplers.get(original_sample_rate)
+                if resampler is None:
+                    resampler = StreamingResampler(original_sample_rate, 16000)
+                    self.feed_resamplers[original_sample_rate] = resampler
+                chunk = resampler.process(chunk)
 
-        # Append the chunk to the buffer
-        self.buffer += chunk
-        buf_size = 2 * self.buffer_size  # silero complains if too short
+            # Ensure data type is int16 and memory is contiguous
+            chunk = np.ascontiguousarray(chunk.astype(np.int16, copy=False))
 
-        # Check if the buffer has reached or exceeded the buffer_size
-        while len(self.buffer) >= buf_size:
-            # Extract self.buffer_size amount of data from the buffer
-            to_process = self.buffer[:buf_size]
-            self.buffer = self.buffer[buf_size:]
-
-            # Feed the extracted data to the audio_queue
-            self.audio_queue.put(to_process)
+        return chunk
 
     def set_microphone(self, microphone_on=True):
         """
@@ -1845,6 +3099,8 @@ class AudioToTextRecorder:
             logger.debug('Finishing recording thread')
             if self.recording_thread:
                 self.recording_thread.join()
+            if self.silero_thread:
+                self.silero_thread.join()
 
             logger.debug('Terminating reader process')
 
@@ -1858,16 +3114,25 @@ class AudioToTextRecorder:
                                     )
                     self.reader_process.terminate()
 
-            logger.debug('Terminating transcription process')
-            self.transcript_process.join(timeout=10)
+            # The transcription workers belong to the recorder that
+            # started them, recorders sharing them leave them running
+            if self.transcript_processes:
+                logger.debug('Terminating transcription processes')
+                for transcript_process in self.transcript_processes:
+                    transcript_process.join(timeout=10)
 
-            if self.transcript_process.is_alive():
-                logger.warning("Transcript process did not terminate "
-                                "in time. Terminating forcefully."
-                                )
-                self.transcript_process.terminate()
+                    if transcript_process.is_alive():
+                        logger.warning("Transcript process did not terminate "
+                                        "in time. Terminating forcefully."
+                                        )
+                        transcript_process.terminate()
+
+                self.shared_transcription_pipe.close()
+                if self.audio_arena is not None:
+                    self.audio_arena.close()
 
-            self.parent_transcription_pipe.close()
+            if isinstance(self.audio_queue, SharedAudioQueue):
+                self.audio_queue.close()
 
             logger.debug('Finishing realtime thread')
             if self.realtime_thread:
@@ -1897,7 +3162,6 @@ class AudioToTextRecorder:
             delay_was_passed = False
             wakeword_detected_time = None
             wakeword_samples_to_remove = None
-            self.allowed_to_early_transcribe = True
 
             if self.use_extended_logging:
                 logger.debug('Debug: Starting main loop')
@@ -1916,7 +3180,14 @@ class AudioToTextRecorder:
                     # if self.use_extended_logging:
                     #     logger.debug('Debug: Trying to get data from audio queue')
                     try:
-                        data = self.audio_queue.get(timeout=0.01)
+                        try:
+                            # Chunks held back by the overflow policy first
+                            data, _ = self.overflow_backlog.popleft()
+                        except IndexError:
+                            data = self.audio_queue.get(timeout=0.01)
+                        chunk_samples = len(data) // 2
+                        chunk_position = self.samples_processed
+                        self.samples_processed += chunk_samples
                         self.last_words_buffer.append(data)
                     except queue.Empty:
                         # if self.use_extended_logging:
@@ -1937,27 +3208,12 @@ class AudioToTextRecorder:
                         self._run_callback(self.on_recorded_chunk, data)
 
                     if self.use_extended_logging:
-                        logger.debug('Debug: Checking if handle_buffer_overflow is True')
-                    if self.handle_buffer_overflow:
+                        logger.debug('Debug: Checking buffer overflow policy')
+                    if (self.buffer_overflow_policy != "none"
+                            and not self.use_sample_clock):
                         if self.use_extended_logging:
                             logger.debug('Debug: Handling buffer overflow')
-                        # Handle queue overflow
-                        if (self.audio_queue.qsize() >
-                                self.allowed_latency_limit):
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Queue size exceeds limit, logging warnings')
-                            logger.warning("Audio queue size exceeds "
-                                            "latency limit. Current size: "
-                                            f"{self.audio_queue.qsize()}. "
-                                            "Discarding old audio chunks."
-                                            )
-
-                        if self.use_extended_logging:
-                            logger.debug('Debug: Discarding old chunks if necessary')
-                        while (self.audio_queue.qsize() >
-                                self.allowed_latency_limit):
-
-                            data = self.audio_queue.get()
+                        self._enforce_latency_budget()
 
                 except BrokenPipeError:
                     logger.error("BrokenPipeError _recording_worker", exc_info=True)
@@ -1980,13 +3236,22 @@ class AudioToTextRecorder:
                     logger.debug('Debug: Initializing failed_stop_attempt')
                 failed_stop_attempt = False
 
+                # Cheap energy check in front of the detectors that decide
+                # whether a recording starts
+                gate_open = (self.energy_gate is None
+                             or self.is_recording
+                             or self.energy_gate.process(data))
+
                 if self.use_extended_logging:
                     logger.debug('Debug: Checking if not recording')
                 if not self.is_recording:
                     if self.use_extended_logging:
                         logger.debug('Debug: Handling not recording state')
+                    if self.segmenter.in_speech:
+                        # Stopped by stop() or a start() that was refused
+                        self.segmenter.end_segment(chunk_position)
                     # Handle not recording state
-                    time_since_listen_start = (time.time() - self.listen_start
+                    time_since_listen_start = (self._now() - self.listen_start
                                             if self.listen_start else 0)
 
                     wake_word_activation_delay_passed = (
@@ -2029,8 +3294,16 @@ class AudioToTextRecorder:
 
                     if self.use_extended_logging:
                         logger.debug('Debug: Checking wake word conditions')
-                    if self.use_wake_words and wake_word_activation_delay_passed:
+                    if (self.use_wake_words and wake_word_activation_delay_passed
+                            and not gate_open):
+                        # Silence, the wake word model can't fire
+                        self.energy_gate_skipped_wakeword += 1
+                        self.wakeword_gated = True
+
+                    elif self.use_wake_words and wake_word_activation_delay_passed:
                         try:
+                            if self.wakeword_gated:
+                                self._reset_wakeword()
                             if self.use_extended_logging:
                                 logger.debug('Debug: Processing wakeword')
                             wakeword_index = self._process_wakeword(data)
@@ -2050,8 +3323,8 @@ class AudioToTextRecorder:
                         if wakeword_index >= 0:
                             if self.use_extended_logging:
                                 logger.debug('Debug: Wake word detected, updating variables')
-                            self.wake_word_detect_time = time.time()
-                            wakeword_detected_time = time.time()
+                            self.wake_word_detect_time = self._now()
+                            wakeword_detected_time = self._now()
                             wakeword_samples_to_remove = int(self.sample_rate * self.wake_word_buffer_duration)
                             self.wakeword_detected = True
                             if self.on_wakeword_detected:
@@ -2071,7 +3344,8 @@ class AudioToTextRecorder:
                         if self.use_extended_logging:
                             logger.debug('Debug: Checking if voice is active')
 
-                        if self._is_voice_active():
+                        if self.segmenter.process(chunk_position, chunk_samples,
+                                                  self._onset_score()):
 
                             if self.on_vad_start:
                                self._run_callback(self.on_vad_start)
@@ -2090,12 +3364,18 @@ class AudioToTextRecorder:
                                 logger.debug('Debug: Adding buffered audio to frames')
                             # Add the buffered audio
                             # to the recording frames
-                            self.frames.extend(list(self.audio_buffer))
+                            self.frames.append(self.audio_buffer.read())
                             self.audio_buffer.clear()
+                            self.frames_start_position = chunk_position - len(self.frames)
+                            self.voiced_end_position = None
 
                             if self.use_extended_logging:
                                 logger.debug('Debug: Resetting Silero VAD model states')
-                            self.silero_vad_model.reset_states()
+                            self._reset_silero()
+                        elif not gate_open:
+                            # Below the noise floor: silence without asking the VADs
+                            self.is_webrtc_speech_active = False
+                            self.energy_gate_skipped_vad += 1
                         else:
                             if self.use_extended_logging:
                                 logger.debug('Debug: Checking voice activity')
@@ -2120,138 +3400,116 @@ class AudioToTextRecorder:
                         if self.use_extended_logging:
                             logger.debug('Debug: Removing wakeword samples')
                         # Remove samples from the beginning of self.frames
-                        samples_removed = 0
-                        while wakeword_samples_to_remove > 0 and self.frames:
-                            frame = self.frames[0]
-                            frame_samples = len(frame) // 2  # Assuming 16-bit audio
-                            if wakeword_samples_to_remove >= frame_samples:
-                                self.frames.pop(0)
-                                samples_removed += frame_samples
-                                wakeword_samples_to_remove -= frame_samples
-                            else:
-                                self.frames[0] = frame[wakeword_samples_to_remove * 2:]
-                                samples_removed += wakeword_samples_to_remove
-                                samples_to_remove = 0
-                        
+                        removed = self.frames.discard_front(wakeword_samples_to_remove)
+                        if self.frames_start_position is not None:
+                            self.frames_start_position += removed
                         wakeword_samples_to_remove = 0
 
                     if self.use_extended_logging:
                         logger.debug('Debug: Checking if stop_recording_on_voice_deactivity is True')
                     # Stop the recording if silence is detected after speech
+                    if not self.segmenter.in_speech:
+                        # Started by start(), a wake word or voice activity
+                        self.segmenter.start_segment(chunk_position)
+                        self.frames_start_position = chunk_position - len(self.frames)
+                        self.voiced_end_position = None
+
                     if self.stop_recording_on_voice_deactivity:
                         if self.use_extended_logging:
                             logger.debug('Debug: Determining if speech is detected')
-                        is_speech = (
-                            self._is_silero_speech(data) if self.silero_deactivity_detection
-                            else self._is_webrtc_speech(data, True)
-                        )
-
-                        if self.use_extended_logging:
-                            logger.debug('Debug: Formatting speech_end_silence_start')
-                        if not self.speech_end_silence_start:
-                            str_speech_end_silence_start = "0"
-                        else:
-                            str_speech_end_silence_start = datetime.datetime.fromtimestamp(self.speech_end_silence_start).strftime('%H:%M:%S.%f')[:-3]
-                        if self.use_extended_logging:
-                            logger.debug(f"is_speech: {is_speech}, str_speech_end_silence_start: {str_speech_end_silence_start}")
-
-                        if self.use_extended_logging:
-                            logger.debug('Debug: Checking if speech is not detected')
-                        if not is_speech:
+                        score = self._deactivity_score(data)
+                        voiced_end = self._voiced_end(
+                            chunk_position, chunk_samples, score)
+                        if voiced_end is not None:
+                            self.voiced_end_position = voiced_end
+                        events = self.segmenter.process(
+                            chunk_position, chunk_samples, score)
+
+                        for event in events:
                             if self.use_extended_logging:
-                                logger.debug('Debug: Handling voice deactivity')
-                            # Voice deactivity was detected, so we start
-                            # measuring silence time before stopping recording
-                            if self.speech_end_silence_start == 0 and \
-                                (time.time() - self.recording_start_time > self.min_length_of_recording):
+                                logger.debug(f"Debug: Segmenter event {event.kind} "
+                                             f"at sample {event.position}")
 
-                                self.speech_end_silence_start = time.time()
+                            if event.kind == SILENCE_START:
+                                # Voice deactivity was detected, so we start
+                                # measuring silence time before stopping recording
+                                self.speech_end_silence_start = self._now()
                                 self.awaiting_speech_end = True
                                 if self.on_turn_detection_start:
                                     if self.use_extended_logging:
                                         logger.debug('Debug: Calling on_turn_detection_start')
-
                                     self._run_callback(self.on_turn_detection_start)
 
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Checking early transcription conditions')
-                            if self.speech_end_silence_start and self.early_transcription_on_silence and len(self.frames) > 0 and \
-                                (time.time() - self.speech_end_silence_start > self.early_transcription_on_silence) and \
-                                self.allowed_to_early_transcribe:
-                                    if self.use_extended_logging:
-                                        logger.debug("Debug:Adding early transcription request")
-                                    self.transcribe_count += 1
-                                    audio_array = np.frombuffer(b''.join(self.frames), dtype=np.int16)
-                                    audio = audio_array.astype(np.float32) / INT16_MAX_ABS_VALUE
-
-                                    if self.use_extended_logging:
-                                        logger.debug("Debug: early transcription request pipe send")
-                                    self.parent_transcription_pipe.send((audio, self.language, True))
-                                    if self.use_extended_logging:
-                                        logger.debug("Debug: early transcription request pipe send return")
-                                    self.allowed_to_early_transcribe = False
-
-                        else:
-                            self.awaiting_speech_end = False
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Handling speech detection')
-                            if self.speech_end_silence_start:
+                            elif event.kind == SPEECH_RESUME:
+                                self.awaiting_speech_end = False
+                                # The early transcription misses the new
+                                # speech, keep it if the tail may be decoded
+                                # on its own
+                                if self.early_transcription_max_tail > 0:
+                                    if self.early_transcription is not None:
+                                        self.early_transcription = \
+                                            self.early_transcription._replace(resumed=True)
+                                else:
+                                    self._discard_early_transcription()
                                 if self.use_extended_logging:
                                     logger.info("Resetting self.speech_end_silence_start")
+                                self.speech_end_silence_start = 0
+                                if self.on_turn_detection_stop:
+                                    if self.use_extended_logging:
+                                        logger.debug('Debug: Calling on_turn_detection_stop')
+                                    self._run_callback(self.on_turn_detection_stop)
 
-                                if self.speech_end_silence_start != 0:
-                                    self.speech_end_silence_start = 0
-                                    if self.on_turn_detection_stop:
-                                        if self.use_extended_logging:
-                                            logger.debug('Debug: Calling on_turn_detection_stop')
-                                        self._run_callback(self.on_turn_detection_stop)
-
-                                self.allowed_to_early_transcribe = True
-
-                        if self.use_extended_logging:
-                            logger.debug('Debug: Checking if silence duration exceeds threshold')
-                        # Wait for silence to stop recording after speech
-                        if self.speech_end_silence_start and time.time() - \
-                                self.speech_end_silence_start >= \
-                                self.post_speech_silence_duration:
-
-                            if self.on_vad_stop:
-                                self._run_callback(self.on_vad_stop)
-
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Formatting silence start time')
-                            # Get time in desired format (HH:MM:SS.nnn)
-                            silence_start_time = datetime.datetime.fromtimestamp(self.speech_end_silence_start).strftime('%H:%M:%S.%f')[:-3]
+                            elif event.kind == EARLY_TRANSCRIBE and len(self.frames) > 0:
+                                if self.use_extended_logging:
+                                    logger.debug("Debug:Adding early transcription request")
+                                audio = self.frames.float_view()
+                                start, end = 0, len(audio)
+                                if self.trim_silence:
+                                    start, end = self._voiced_bounds(
+                                        len(audio), self._voiced_region())
+                                    audio = audio[start:end]
 
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Calculating time difference')
-                            # Calculate time difference
-                            time_diff = time.time() - self.speech_end_silence_start
+                                if self.use_extended_logging:
+                                    logger.debug("Debug: early transcription request pipe send")
+                                request = self._transcription_request(
+                                    REQUEST_EARLY, audio,
+                                    stream_segments=self._streams_segments())
+                                self.parent_transcription_pipe.send(request)
+                                self._discard_early_transcription()
+                                self.early_transcription = EarlyTranscription(
+                                    request.request_id, start, end)
+                                if self.use_extended_logging:
+                                    logger.debug("Debug: early transcription request pipe send return")
 
-                            if self.use_extended_logging:
-                                logger.debug('Debug: Logging voice deactivity detection')
-                                logger.info(f"voice deactivity detected at {silence_start_time}, "
-                                        f"time since silence start: {time_diff:.3f} seconds")
-
-                                logger.debug('Debug: Appending data to frames and stopping recording')
-                            self.frames.append(data)
-                            self.stop()
-                            if not self.is_recording:
-                                if self.speech_end_silence_start != 0:
-                                    self.speech_end_silence_start = 0
-                                    if self.on_turn_detection_stop:
-                                        if self.use_extended_logging:
-                                            logger.debug('Debug: Calling on_turn_detection_stop')
-                                        self._run_callback(self.on_turn_detection_stop)
+                            elif event.kind == SPEECH_END:
+                                # Silence lasted long enough to stop recording
+                                if self.on_vad_stop:
+                                    self._run_callback(self.on_vad_stop)
 
                                 if self.use_extended_logging:
-                                    logger.debug('Debug: Handling non-wake word scenario')
-                            else:
-                                if self.use_extended_logging:
-                                    logger.debug('Debug: Setting failed_stop_attempt to True')
-                                failed_stop_attempt = True
+                                    # Get time in desired format (HH:MM:SS.nnn)
+                                    silence_start_time = datetime.datetime.fromtimestamp(self.speech_end_silence_start).strftime('%H:%M:%S.%f')[:-3]
+                                    logger.info(f"voice deactivity detected at {silence_start_time}, "
+                                            f"segment samples {event.segment_start}-{event.position}")
+
+                                    logger.debug('Debug: Appending data to frames and stopping recording')
+                                self.frames.append(data)
+                                self.stop()
+                                if not self.is_recording:
+                                    if self.speech_end_silence_start != 0:
+                                        self.speech_end_silence_start = 0
+                                        if self.on_turn_detection_stop:
+                                            if self.use_extended_logging:
+                                                logger.debug('Debug: Calling on_turn_detection_stop')
+                                            self._run_callback(self.on_turn_detection_stop)
+                                else:
+                                    if self.use_extended_logging:
+                                        logger.debug('Debug: Setting failed_stop_attempt to True')
+                                    failed_stop_attempt = True
+                                    # Try again with the next silent chunk
+                                    self.segmenter.reopen()
 
-                            self.awaiting_speech_end = False
+                                self.awaiting_speech_end = False
 
                 if self.use_extended_logging:
                     logger.debug('Debug: Checking if recording stopped')
@@ -2270,7 +3528,7 @@ class AudioToTextRecorder:
                     logger.debug('Debug: Handling wake word timeout')
                 # Handle wake word timeout (waited to long initiating
                 # speech after wake word detection)
-                if self.wake_word_detect_time and time.time() - \
+                if self.wake_word_detect_time and self._now() - \
                         self.wake_word_detect_time > self.wake_word_timeout:
 
                     self.wake_word_detect_time = 0
@@ -2336,6 +3594,14 @@ class AudioToTextRecorder:
 
                 if self.is_recording:
 
+                    if (not self.use_main_model_for_realtime
+                            and isinstance(self.realtime_model_type, str)):
+                        # lazy_realtime_model: first recording
+                        stage_start = time.perf_counter()
+                        self._load_realtime_model()
+                        self.init_timings["realtime_model"] = time.perf_counter() - stage_start
+                        last_transcription_time = time.time()
+
                     # MODIFIED SLEEP LOGIC:
                     # Wait until realtime_processing_pause has elapsed,
                     # but check often so we can respond to changes quickly.
@@ -2353,48 +3619,52 @@ class AudioToTextRecorder:
                     # Update transcription time
                     last_transcription_time = time.time()
 
-                    # Convert the buffer frames to a NumPy array
-                    audio_array = np.frombuffer(
-                        b''.join(self.frames),
-                        dtype=np.int16
-                        )
+                    # Zero-copy float32 view onto the recorded samples,
+                    # already scaled to the [-1, 1] range
+                    audio_array = self.frames.float_view()
 
                     logger.debug(f"Current realtime buffer size: {len(audio_array)}")
 
-                    # Normalize the array to a [-1, 1] range
-                    audio_array = audio_array.astype(np.float32) / \
-                        INT16_MAX_ABS_VALUE
-
                     if self.use_main_model_for_realtime:
-                        with self.transcription_lock:
-                            try:
-                                self.parent_transcription_pipe.send((audio_array, self.language, True))
-                                if self.parent_transcription_pipe.poll(timeout=5):  # Wait for 5 seconds
-                                    logger.debug("Receive from realtime worker after transcription request to main model")
-                                    status, result = self.parent_transcription_pipe.recv()
-                                    if status == 'success':
-                                        segments, info = result
-                                        self.detected_realtime_language = info.language if info.language_probability > 0 else None
-                                        self.detected_realtime_language_probability = info.language_probability
-                                        realtime_text = segments
-                                        logger.debug(f"Realtime text detected with main model: {realtime_text}")
-                                    else:
-                                        logger.error(f"Realtime transcription error: {result}")
-                                        continue
+                        try:
+                            request = self._transcription_request(
+                                REQUEST_REALTIME, audio_array,
+                                deadline=time.time() + REALTIME_REQUEST_TIMEOUT)
+                            self.realtime_transcription_pipe.send(request)
+                            reply = self._await_transcription(
+                                self.realtime_transcription_pipe, request.request_id,
+                                timeout=REALTIME_REQUEST_TIMEOUT)
+                            if reply is not None:
+                                logger.debug("Receive from realtime worker after transcription request to main model")
+                                status, result = reply
+                                if status == 'success':
+                                    segments, info, _ = result
+                                    self.detected_realtime_language = info.language if info.language_probability > 0 else None
+                                    self.detected_realtime_language_probability = info.language_probability
+                                    realtime_text = segments
+                                    logger.debug(f"Realtime text detected with main model: {realtime_text}")
+                                elif status == 'expired':
+                                    logger.debug("Realtime transcription request expired")
+                                    continue
                                 else:
-                                    logger.warning("Realtime transcription timed out")
+                                    logger.error(f"Realtime transcription error: {result}")
                                     continue
-                            except Exception as e:
-                                logger.error(f"Error in realtime transcription: {str(e)}", exc_info=True)
+                            else:
+                                logger.warning("Realtime transcription timed out")
+                                self._cancel_transcription(
+                                    self.realtime_transcription_pipe, request.request_id)
                                 continue
+                        except Exception as e:
+                            logger.error(f"Error in realtime transcription: {str(e)}", exc_info=True)
+                            continue
                     else:
                         # Perform transcription and assemble the text
                         if self.normalize_audio:
-                            # normalize audio to -0.95 dBFS
-                            if audio_array is not None and audio_array.size > 0:
-                                peak = np.max(np.abs(audio_array))
-                                if peak > 0:
-                                    audio_array = (audio_array / peak) * 0.95
+                            # normalize audio to -0.95 dBFS using the
+                            # running peak of the recording
+                            peak = self.frames.peak
+                            if audio_array.size > 0 and peak > 0:
+                                audio_array = audio_array * np.float32(0.95 / peak)
 
                         if self.realtime_batch_size > 0:
                             segments, info = self.realtime_model_type.transcribe(
@@ -2425,7 +3695,7 @@ class AudioToTextRecorder:
 
                     # double check recording state
                     # because it could have changed mid-transcription
-                    if self.is_recording and time.time() - \
+                    if self.is_recording and self._now() - \
                             self.recording_start_time > self.init_realtime_after_seconds:
 
                         self.realtime_transcription_text = realtime_text
@@ -2500,26 +3770,36 @@ class AudioToTextRecorder:
             logger.error(f"Unhandled exeption in _realtime_worker: {e}", exc_info=True)
             raise
 
-    def _is_silero_speech(self, chunk):
+    def _to_16k(self, chunk):
         """
-        Returns true if speech is detected in the provided audio data
-
-        Args:
-            data (bytes): raw bytes of audio data (1024 raw bytes with
-            16000 sample rate and 16 bits per sample)
+        Returns a chunk as 16 kHz int16 samples for the WebRTC check, Silero
+        and wake word detection. Recording thread only: the samples of the
+        last chunk are kept, so a chunk is resampled once for all of them.
         """
-        if self.sample_rate != 16000:
-            pcm_data = np.frombuffer(chunk, dtype=np.int16)
-            data_16000 = signal.resample_poly(
-                pcm_data, 16000, self.sample_rate)
-            chunk = data_16000.astype(np.int16).tobytes()
-
-        self.silero_working = True
-        audio_chunk = np.frombuffer(chunk, dtype=np.int16)
-        audio_chunk = audio_chunk.astype(np.float32) / INT16_MAX_ABS_VALUE
-        vad_prob = self.silero_vad_model(
+        if self.sample_rate == SAMPLE_RATE:
+            return np.frombuffer(chunk, dtype=np.int16)
+        last_chunk, samples = self._last_16k
+        if chunk is not last_chunk:
+            samples = self.webrtc_vad.to_16k(chunk)
+            self._last_16k = (chunk, samples)
+        return samples
+
+    def _silero_probability(self, samples):
+        """Scores one chunk (16 kHz int16 samples) with the Silero model (continuous state)."""
+        audio_chunk = samples.astype(np.float32) / INT16_MAX_ABS_VALUE
+        with self.silero_lock:
+            return self._silero_model_probability(audio_chunk)
+
+    def _silero_model_probability(self, audio_chunk):
+        """Runs the Silero model on float32 audio. Caller holds silero_lock."""
+        if isinstance(self.silero_vad_model, SileroOnnxVAD):
+            return self.silero_vad_model.probability(audio_chunk)
+        return self.silero_vad_model(
             torch.from_numpy(audio_chunk),
             SAMPLE_RATE).item()
+
+    def _publish_silero_result(self, vad_prob, sample_offset=None):
+        """Updates the Silero speech state from a chunk's probability."""
         is_silero_speech_active = vad_prob > (1 - self.silero_sensitivity)
         if is_silero_speech_active:
             if not self.is_silero_speech_active and self.use_extended_logging:
@@ -2527,9 +3807,74 @@ class AudioToTextRecorder:
         elif self.is_silero_speech_active and self.use_extended_logging:
             logger.info(f"{bcolors.WARNING}Silero VAD detected silence{bcolors.ENDC}")
         self.is_silero_speech_active = is_silero_speech_active
-        self.silero_working = False
+        self.silero_probability = vad_prob
+        self.silero_result = (sample_offset, is_silero_speech_active)
         return is_silero_speech_active
 
+    def _is_silero_speech(self, chunk, sample_offset=None):
+        """
+        Returns true if speech is detected in the provided audio data
+
+        Args:
+            data (bytes): raw bytes of audio data (1024 raw bytes with
+            16000 sample rate and 16 bits per sample)
+            sample_offset (int, optional): Position of the chunk in the
+            stream, published with the result.
+        """
+        return self._publish_silero_result(
+            self._silero_probability(self._to_16k(chunk)), sample_offset)
+
+    def _silero_worker(self):
+        """
+        Scores the chunks queued by _check_voice_activity one after
+        another, so the model state stays continuous and no candidate
+        chunk is skipped while a check is running.
+        """
+        while self.is_running:
+            try:
+                generation, sample_offset, samples = self.silero_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if generation != self.silero_generation:
+                continue
+            try:
+                vad_prob = self._silero_probability(samples)
+            except Exception as e:
+                logger.error(f"Silero VAD error: {e}", exc_info=True)
+                continue
+            # Recording may have started or stopped during the check
+            if generation == self.silero_generation:
+                self._publish_silero_result(vad_prob, sample_offset)
+
+    def _queue_silero_check(self, chunk, sample_offset):
+        """
+        Hands a chunk to the Silero worker. If the worker falls behind,
+        the oldest waiting chunk is skipped (and counted).
+        """
+        # The 16 kHz samples, the worker thread does not resample
+        item = (self.silero_generation, sample_offset, self._to_16k(chunk))
+        while True:
+            try:
+                self.silero_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.silero_queue.get_nowait()
+                    self.silero_skipped_chunks += 1
+                except queue.Empty:
+                    pass
+
+    def _reset_silero(self):
+        """Discards queued checks and resets the Silero model state."""
+        self.silero_generation += 1
+        try:
+            while True:
+                self.silero_queue.get_nowait()
+        except queue.Empty:
+            pass
+        with self.silero_lock:
+            self.silero_vad_model.reset_states()
+
     def _is_webrtc_speech(self, chunk, all_frames_must_be_true=False):
         """
         Returns true if speech is detected in the provided audio data
@@ -2540,52 +3885,42 @@ class AudioToTextRecorder:
         """
         speech_str = f"{bcolors.OKGREEN}WebRTC VAD detected speech{bcolors.ENDC}"
         silence_str = f"{bcolors.WARNING}WebRTC VAD detected silence{bcolors.ENDC}"
-        if self.sample_rate != 16000:
-            pcm_data = np.frombuffer(chunk, dtype=np.int16)
-            data_16000 = signal.resample_poly(
-                pcm_data, 16000, self.sample_rate)
-            chunk = data_16000.astype(np.int16).tobytes()
-
-        # Number of audio frames per millisecond
-        frame_length = int(16000 * 0.01)  # for 10ms frame
-        num_frames = int(len(chunk) / (2 * frame_length))
-        speech_frames = 0
-
-        for i in range(num_frames):
-            start_byte = i * frame_length * 2
-            end_byte = start_byte + frame_length * 2
-            frame = chunk[start_byte:end_byte]
-            if self.webrtc_vad_model.is_speech(frame, 16000):
-                speech_frames += 1
-                if not all_frames_must_be_true:
-                    if self.debug_mode:
-                        logger.info(f"Speech detected in frame {i + 1}"
-                              f" of {num_frames}")
-                    if not self.is_webrtc_speech_active and self.use_extended_logging:
-                        logger.info(speech_str)
-                    self.is_webrtc_speech_active = True
-                    return True
-        if all_frames_must_be_true:
-            if self.debug_mode and speech_frames == num_frames:
-                logger.info(f"Speech detected in {speech_frames} of "
-                      f"{num_frames} frames")
-            elif self.debug_mode:
-                logger.info(f"Speech not detected in all {num_frames} frames")
-            speech_detected = speech_frames == num_frames
-            if speech_detected and not self.is_webrtc_speech_active and self.use_extended_logging:
-                logger.info(speech_str)
-            elif not speech_detected and self.is_webrtc_speech_active and self.use_extended_logging:
-                logger.info(silence_str)
-            self.is_webrtc_speech_active = speech_detected
-            return speech_detected
-        else:
+        samples = None if self.sample_rate == SAMPLE_RATE else self._to_16k(chunk)
+
+        if not all_frames_must_be_true:
+            # Onset: stops at the first speech frame, no mask needed
+            if self.webrtc_vad.is_speech(chunk, samples=samples):
+                if self.debug_mode:
+                    logger.info("Speech detected in chunk")
+                if not self.is_webrtc_speech_active and self.use_extended_logging:
+                    logger.info(speech_str)
+                self.is_webrtc_speech_active = True
+                return True
             if self.debug_mode:
-                logger.info(f"Speech not detected in any of {num_frames} frames")
+                logger.info("Speech not detected in any frame of the chunk")
             if self.is_webrtc_speech_active and self.use_extended_logging:
                 logger.info(silence_str)
             self.is_webrtc_speech_active = False
             return False
 
+        # One decision per 10ms frame, for the deactivity score and trimming
+        mask = self.webrtc_vad.speech_mask(chunk, samples)
+        self.last_speech_mask = mask
+        num_frames = len(mask)
+        speech_frames = int(np.count_nonzero(mask))
+        if self.debug_mode and speech_frames == num_frames:
+            logger.info(f"Speech detected in {speech_frames} of "
+                  f"{num_frames} frames")
+        elif self.debug_mode:
+            logger.info(f"Speech not detected in all {num_frames} frames")
+        speech_detected = speech_frames == num_frames
+        if speech_detected and not self.is_webrtc_speech_active and self.use_extended_logging:
+            logger.info(speech_str)
+        elif not speech_detected and self.is_webrtc_speech_active and self.use_extended_logging:
+            logger.info(silence_str)
+        self.is_webrtc_speech_active = speech_detected
+        return speech_detected
+
     def _check_voice_activity(self, data):
         """
         Initiate check if voice is active based on the provided data.
@@ -2597,14 +3932,240 @@ class AudioToTextRecorder:
 
         # First quick performing check for voice activity using WebRTC
         if self.is_webrtc_speech_active:
+            # Position of the chunk's first sample in the stream
+            sample_offset = self.samples_processed - len(data) // 2
+
+            if self.use_sample_clock:
+                # Deterministic: every candidate chunk gets checked in order
+                self._is_silero_speech(data, sample_offset)
+
+            else:
+                # Run the intensive check in the Silero worker thread
+                self._queue_silero_check(data, sample_offset)
+
+    def _chunk_contains_speech(self, chunk):
+        """
+        Cheap WebRTC VAD check for the overflow policy. Unlike
+        _is_webrtc_speech it does not touch the speech activity state.
+        """
+        return self.webrtc_vad.is_speech(chunk)
 
-            if not self.silero_working:
-                self.silero_working = True
+    def _record_drop(self, chunks, reason):
+        """Counts discarded chunks and stores a drop event."""
+        if not chunks:
+            return
+        duration_ms = sum(len(chunk) // 2 for chunk in chunks) * 1000 / self.sample_rate
+        self.dropped_chunks += len(chunks)
+        if reason == "speech":
+            self.dropped_speech_chunks += len(chunks)
+        self.dropped_audio_ms += duration_ms
+        self.drop_events.append({
+            "time": time.time(),
+            "chunks": len(chunks),
+            "duration_ms": duration_ms,
+            "reason": reason,
+        })
+
+    def _enforce_latency_budget(self):
+        """
+        Discards audio according to buffer_overflow_policy while more
+        than allowed_latency_ms of audio is waiting to be processed.
+        """
+        backlog = self.audio_queue.qsize() + len(self.overflow_backlog)
+        if backlog <= self.allowed_latency_chunks:
+            return
+
+        logger.warning("Audio backlog exceeds latency limit. Current "
+                       f"backlog: {backlog * self.chunk_duration_ms:.0f} ms, "
+                       f"allowed: {self.allowed_latency_ms:.0f} ms. "
+                       f"Discarding audio ({self.buffer_overflow_policy})."
+                       )
+
+        # Take the whole backlog out of the queue, so chunks can be
+        # dropped selectively and the rest processed in order. Chunks
+        # already held back keep their speech decision, so each chunk is
+        # classified at most once however long it waits.
+        entries = list(self.overflow_backlog)
+        self.overflow_backlog.clear()
+        try:
+            for _ in range(self.audio_queue.qsize()):
+                entries.append((self.audio_queue.get_nowait(), None))
+        except queue.Empty:
+            pass
+        excess = len(entries) - self.allowed_latency_chunks
+
+        if self.buffer_overflow_policy == "drop_oldest":
+            excess = max(0, excess)
+            self._record_drop([chunk for chunk, _ in entries[:excess]], "oldest")
+            self.overflow_backlog.extend(entries[excess:])
+            return
+
+        kept = []
+        silence = []
+        for chunk, is_speech in entries:
+            if len(silence) < excess:
+                if is_speech is None:
+                    is_speech = self._chunk_contains_speech(chunk)
+                if not is_speech:
+                    silence.append(chunk)
+                    continue
+            kept.append((chunk, is_speech))
+        self._record_drop(silence, "silence")
+
+        # Not enough silence to shed: give up speech only when the
+        # backlog has grown to twice the budget
+        hard_excess = len(kept) - 2 * self.allowed_latency_chunks
+        if hard_excess > 0:
+            self._record_drop([chunk for chunk, _ in kept[:hard_excess]], "speech")
+            kept = kept[hard_excess:]
+        self.overflow_backlog.extend(kept)
+
+    def get_energy_gate_stats(self):
+        """
+        Returns how much detector work the energy gate saved.
+
+        Returns:
+            dict: The gate counters (passed_chunks, skipped_chunks,
+              skipped_samples, skipped_ratio, noise_floor_db, threshold_db)
+              plus skipped_vad_checks and skipped_wakeword_checks, or None
+              if use_energy_gate is off.
+        """
+        if self.energy_gate is None:
+            return None
+        stats = self.energy_gate.stats()
+        stats["skipped_vad_checks"] = self.energy_gate_skipped_vad
+        stats["skipped_wakeword_checks"] = self.energy_gate_skipped_wakeword
+        return stats
 
-                # Run the intensive check in a separate thread
-                threading.Thread(
-                    target=self._is_silero_speech,
-                    args=(data,)).start()
+    def _voiced_region(self):
+        """
+        Voiced part of the current recording as (start, end) sample
+        indices into self.frames: from the segmenter's onset to the end of
+        the last speech the deactivity check found. None if
+        the recording can't be mapped to stream positions.
+        """
+        if self.frames_start_position is None:
+            return None
+        num_samples = len(self.frames)
+        start = min(max(self.segmenter.onset - self.frames_start_position, 0),
+                    num_samples)
+        if self.voiced_end_position is None:
+            return start, num_samples
+        end = min(max(self.voiced_end_position - self.frames_start_position,
+                      start), num_samples)
+        return start, end
+
+    def _voiced_end(self, chunk_position, chunk_samples, score):
+        """
+        Stream position where the speech in the chunk just scored ends,
+        None if it holds none. With WebRTC deactivity detection this is
+        the end of the chunk's last speech frame, with Silero the end of
+        the chunk if it scores as speech.
+        """
+        if self.silero_deactivity_detection:
+            if score >= self.segmenter.end_threshold:
+                return chunk_position + chunk_samples
+            return None
+        speech_frames = np.flatnonzero(self.last_speech_mask)
+        if not len(speech_frames):
+            return None
+        frame_samples = (self.webrtc_vad.frame_samples * self.sample_rate
+                         // SAMPLE_RATE)
+        return chunk_position + min(
+            (int(speech_frames[-1]) + 1) * frame_samples, chunk_samples)
+
+    def _voiced_bounds(self, num_samples, region):
+        """
+        Start and end index of the voiced region plus trim_silence_margin
+        in audio of num_samples samples, (0, num_samples) if there is
+        nothing to trim.
+        """
+        if region is None or not num_samples:
+            return 0, num_samples
+        margin = int(self.trim_silence_margin * self.sample_rate)
+        start = max(region[0] - margin, 0)
+        end = min(region[1] + margin, num_samples)
+        if end <= start:
+            return 0, num_samples
+        return start, end
+
+    def _trim_to_voiced(self, audio, region):
+        """
+        Cuts audio to the voiced region plus trim_silence_margin.
+
+        Returns:
+            tuple: (audio, seconds trimmed)
+        """
+        start, end = self._voiced_bounds(len(audio), region)
+        return audio[start:end], (len(audio) - (end - start)) / self.sample_rate
+
+    def get_cancel_stats(self):
+        """
+        Returns how quickly the transcription workers stopped on cancelled
+        requests (stale early transcriptions, interrupted or timed out
+        requests). The latency is measured in the worker, from the arrival
+        of the cancel to the stop, and is at most the decoding time of one
+        segment batch (about 30 s of audio).
+
+        Returns:
+            dict: cancelled_requests, max_latency and mean_latency (seconds).
+        """
+        with self.cancel_stats_lock:
+            cancelled = self.cancel_stats["cancelled_requests"]
+            return {
+                "cancelled_requests": cancelled,
+                "max_latency": self.cancel_stats["max_latency"],
+                "mean_latency": (self.cancel_stats["total_latency"] / cancelled
+                                 if cancelled else 0.0),
+            }
+
+    def get_early_transcription_stats(self):
+        """
+        Returns how early transcriptions (early_transcription_on_silence)
+        were used for the final transcriptions.
+
+        Returns:
+            dict: reused (taken as they are), extended (speech resumed, only
+              the tail was decoded), redecoded (decoded in full again),
+              saved_decode_seconds (decode time of the extended early
+              transcriptions, which a full decode would have spent again)
+              and tail_decode_seconds.
+        """
+        return dict(self.early_transcription_stats)
+
+    def get_trim_stats(self):
+        """
+        Returns how much silence trim_silence removed before transcription.
+
+        Returns:
+            dict: last_trimmed_seconds (of the last recording),
+              total_trimmed_seconds and trimmed_utterances.
+        """
+        return {
+            "last_trimmed_seconds": self.trimmed_silence_seconds,
+            "total_trimmed_seconds": self.total_trimmed_silence_seconds,
+            "trimmed_utterances": self.trimmed_utterances,
+        }
+
+    def get_overflow_stats(self):
+        """
+        Returns how much audio was discarded to stay within the latency
+        budget.
+
+        Returns:
+            dict: dropped_chunks, dropped_speech_chunks, dropped_audio_ms,
+              transport_dropped_chunks (chunks the shared memory audio queue
+              could not store) and events, a list of the most recent drops
+              with time (unix timestamp), chunks, duration_ms and reason
+              ("oldest", "silence" or "speech").
+        """
+        return {
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_speech_chunks": self.dropped_speech_chunks,
+            "dropped_audio_ms": self.dropped_audio_ms,
+            "transport_dropped_chunks": getattr(self.audio_queue, "dropped", 0),
+            "events": list(self.drop_events),
+        }
 
     def clear_audio_queue(self):
         """
@@ -2612,6 +4173,7 @@ class AudioToTextRecorder:
         fragments get processed e.g. after waking up the recorder.
         """
         self.audio_buffer.clear()
+        self.overflow_backlog.clear()
         try:
             while True:
                 self.audio_queue.get_nowait()
@@ -2629,6 +4191,54 @@ class AudioToTextRecorder:
         """
         return self.is_webrtc_speech_active and self.is_silero_speech_active
 
+    def _onset_score(self):
+        """
+        VAD score before a recording, compared with the segmenter's start
+        threshold: the Silero probability of the last check while WebRTC
+        detects speech, else 0.
+        """
+        return self.silero_probability if self.is_webrtc_speech_active else 0.0
+
+    def _deactivity_score(self, data):
+        """
+        VAD score of a chunk while recording, compared with the
+        segmenter's end threshold: the Silero probability, or with WebRTC
+        deactivity detection the share of frames classified as speech.
+        """
+        if self.silero_deactivity_detection:
+            vad_prob = self._silero_probability(self._to_16k(data))
+            self._publish_silero_result(vad_prob)
+            return vad_prob
+        self._is_webrtc_speech(data, True)
+        mask = self.last_speech_mask
+        return float(np.count_nonzero(mask)) / len(mask) if len(mask) else 1.0
+
+    def _configure_segmenter(self, segmenter, sample_rate):
+        """
+        Applies the current recording parameters to a segmenter. Runs once
+        at construction and whenever one of them is assigned.
+
+        Onset is scored with the Silero probability (0 while WebRTC hears
+        no speech) and needs 1 - silero_sensitivity. Silence within a
+        recording needs the Silero probability to fall below the lower
+        silero_end_threshold, or (WebRTC) a single non-speech frame.
+        """
+        start_threshold = 1 - self.silero_sensitivity
+        segmenter.start_threshold = start_threshold
+        if not self.silero_deactivity_detection:
+            segmenter.end_threshold = 1.0
+        elif self.silero_end_threshold is None:
+            segmenter.end_threshold = max(
+                0.0, start_threshold - SILERO_END_THRESHOLD_OFFSET)
+        else:
+            segmenter.end_threshold = self.silero_end_threshold
+        segmenter.pre_roll = int(self.pre_recording_buffer_duration * sample_rate)
+        segmenter.post_speech_silence = int(self.post_speech_silence_duration * sample_rate)
+        segmenter.min_length = int(self.min_length_of_recording * sample_rate)
+        segmenter.min_gap = int(self.min_gap_between_recordings * sample_rate)
+        segmenter.early_transcription_silence = int(
+            (self.early_transcription_on_silence or 0) * sample_rate)
+
     def _set_state(self, new_state):
         """
         Update the current state of the recorder and execute
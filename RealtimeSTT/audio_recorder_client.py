@@ -173,6 +173,7 @@ class AudioToTextRecorderClient:
                  autostart_server: bool = True,
                  output_wav_file: str = None,
                  faster_whisper_vad_filter: bool = False,
+                 resample_on_client: bool = False,
                  ):
 
         # Set instance variables from constructor parameters
@@ -255,6 +256,7 @@ class AudioToTextRecorderClient:
         self.data_url = data_url
         self.autostart_server = autostart_server
         self.output_wav_file = output_wav_file
+        self.resample_on_client = resample_on_client
 
         # Instance variables
         self.muted = False
@@ -587,7 +589,9 @@ class AudioToTextRecorderClient:
         """Initialize audio input"""
         self.audio_input = AudioInput(
             input_device_index=self.input_device_index,
-            debug_mode=self.debug_mode
+            debug_mode=self.debug_mode,
+            target_samplerate=self.sample_rate,
+            resample_to_target=self.resample_on_client,
         )
         return self.audio_input.setup()
 
@@ -604,7 +608,10 @@ class AudioToTextRecorderClient:
                 self.wav_file = wave.open(self.output_wav_file, 'wb')
                 self.wav_file.setnchannels(1)
                 self.wav_file.setsampwidth(2)
-                self.wav_file.setframerate(self.audio_input.device_sample_rate)  # Use self.device_sample_rate
+                if self.resample_on_client and self.audio_input.resample_to_target:
+                    self.wav_file.setframerate(self.audio_input.target_samplerate)
+                else:
+                    self.wav_file.setframerate(self.audio_input.device_sample_rate)  # Use self.device_sample_rate
 
 
             if self.debug_mode:
@@ -616,7 +623,13 @@ class AudioToTextRecorderClient:
                     continue
 
                 try:
-                    audio_data = self.audio_input.read_chunk()
+                    if self.resample_on_client:
+                        # Downsample at capture time with the streaming
+                        # anti-aliasing filter, the server then gets 16 kHz
+                        audio_data, audio_sample_rate = self.audio_input.read_resampled_chunk()
+                    else:
+                        audio_data = self.audio_input.read_chunk()
+                        audio_sample_rate = self.audio_input.device_sample_rate
 
                     if self.wav_file:
                         self.wav_file.writeframes(audio_data)
@@ -628,7 +641,7 @@ class AudioToTextRecorderClient:
                         continue
 
                     if self.recording_start.is_set():
-                        metadata = {"sampleRate": self.audio_input.device_sample_rate}
+                        metadata = {"sampleRate": audio_sample_rate}
                         metadata_json = json.dumps(metadata)
                         metadata_length = len(metadata_json)
                         message = struct.pack('<I', metadata_length) + metadata_json.encode('utf-8') + audio_data
@@ -0,0 +1,108 @@
+"""
+Adaptive energy gate in front of the voice activity and wake word models.
+
+Most chunks of an idle stream are silence, yet every chunk went through
+the WebRTC VAD and, while listening for wake words, through the wake word
+model. EnergyGate computes the RMS of a chunk (one vectorized dot product
+on the int16 samples) and tracks the noise floor in dB. Chunks that stay
+below the floor plus a margin are reported as silence, so the expensive
+detectors can be skipped for them.
+"""
+
+import numpy as np
+import math
+
+MIN_FLOOR_DB = -80.0  # relative to int16 full scale
+FULL_SCALE_DB = 20 * math.log10(32768.0)
+WARMUP_CHUNKS = 10
+FLOOR_FALL_RATE = 0.2     # floor follows quieter chunks quickly
+FLOOR_RISE_RATE = 0.002   # and louder ones slowly (about 2 dB/s for speech)
+
+
+class EnergyGate:
+    """
+    Adaptive noise-floor gate for 16-bit PCM chunks.
+
+    Args:
+        margin_db (float): How far above the noise floor a chunk has to be
+          to open the gate.
+        hangover_chunks (int): Number of chunks the gate stays open after
+          the last chunk above the threshold, so speech tails and short
+          pauses still reach the detectors.
+    """
+
+    def __init__(self, margin_db=10.0, hangover_chunks=10):
+        self.margin_db = margin_db
+        self.hangover_chunks = hangover_chunks
+        self.reset()
+
+    def reset(self):
+        """Forgets the noise floor and the counters."""
+        self.noise_floor_db = None
+        self.level_db = MIN_FLOOR_DB
+        self._hangover = 0
+        self._chunks_seen = 0
+        self.passed_chunks = 0
+        self.skipped_chunks = 0
+        self.skipped_samples = 0
+
+    @staticmethod
+    def rms_db(chunk):
+        """RMS level of a chunk in dB relative to int16 full scale."""
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+        if not samples.size:
+            return MIN_FLOOR_DB
+        power = float(np.dot(samples, samples)) / samples.size
+        if power <= 0:
+            return MIN_FLOOR_DB
+        return max(MIN_FLOOR_DB, 10 * math.log10(power) - FULL_SCALE_DB)
+
+    @property
+    def threshold_db(self):
+        if self.noise_floor_db is None:
+            return MIN_FLOOR_DB
+        return self.noise_floor_db + self.margin_db
+
+    def process(self, chunk):
+        """
+        Updates the noise floor with a chunk.
+
+        Returns:
+            bool: True if the chunk may contain speech and has to be passed
+              to the detectors, False if it is silence and can be skipped.
+        """
+        level = self.rms_db(chunk)
+        self.level_db = level
+        self._chunks_seen += 1
+
+        if self.noise_floor_db is None:
+            self.noise_floor_db = level
+        rate = FLOOR_FALL_RATE if level < self.noise_floor_db else FLOOR_RISE_RATE
+        is_loud = level > self.threshold_db
+        self.noise_floor_db += rate * (level - self.noise_floor_db)
+
+        if is_loud:
+            self._hangover = self.hangover_chunks
+        elif self._hangover:
+            self._hangover -= 1
+            is_loud = True
+
+        # Pass everything until the floor estimate has settled
+        if is_loud or self._chunks_seen <= WARMUP_CHUNKS:
+            self.passed_chunks += 1
+            return True
+        self.skipped_chunks += 1
+        self.skipped_samples += len(chunk) // 2
+        return False
+
+    def stats(self):
+        """Returns the gate counters and the current levels."""
+        total = self.passed_chunks + self.skipped_chunks
+        return {
+            "passed_chunks": self.passed_chunks,
+            "skipped_chunks": self.skipped_chunks,
+            "skipped_samples": self.skipped_samples,
+            "skipped_ratio": self.skipped_chunks / total if total else 0.0,
+            "noise_floor_db": self.noise_floor_db,
+            "threshold_db": self.threshold_db,
+        }
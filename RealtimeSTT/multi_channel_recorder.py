@@ -0,0 +1,169 @@
+"""
+Transcription of multi-channel audio with one pipeline per channel.
+
+Recordings like phone calls keep every speaker on a separate channel.
+Downmixing them to mono mixes the speakers; running one AudioToTextRecorder
+per channel loads the Whisper models once per channel. MultiChannelRecorder
+splits one interleaved capture or feed stream into its channels and runs
+an independent voice activity detection and segmentation pipeline
+(an AudioToTextRecorder) per channel. All channels share the transcription
+worker and the realtime model of the first channel's recorder.
+"""
+
+from .audio_recorder import AudioToTextRecorder
+import numpy as np
+import threading
+import functools
+import logging
+import queue
+
+logger = logging.getLogger("realtimestt")
+
+
+class MultiChannelRecorder:
+    """
+    Splits interleaved multi-channel audio into per-channel recorders that
+    share one set of models. Results are tagged with the channel index.
+
+    Args:
+        channels (int): Number of channels in the audio stream.
+        use_microphone (bool, default=False): Capture the channels from the
+            input device (input_device_index) instead of waiting for
+            feed_audio().
+        on_transcription (callable, default=None): Called with
+            (channel, text) for every finished transcription.
+        **kwargs: Parameters for the AudioToTextRecorder of every channel.
+            Callbacks (parameters starting with "on_") are called with the
+            channel index as additional first argument, e.g.
+            on_recording_start(channel) or
+            on_realtime_transcription_update(channel, text).
+    """
+
+    def __init__(self,
+                 channels: int,
+                 use_microphone: bool = False,
+                 on_transcription=None,
+                 **kwargs):
+        if channels < 1:
+            raise ValueError("channels must be at least 1")
+        self.channels = channels
+        self.on_transcription = on_transcription
+        self.input_device_index = kwargs.pop("input_device_index", None)
+        self.results = queue.Queue()
+        self.is_running = True
+        self.audio_input = None
+        self.capture_thread = None
+
+        self.recorders = []
+        for channel in range(channels):
+            channel_kwargs = {
+                name: (functools.partial(value, channel)
+                       if name.startswith("on_") and callable(value)
+                       else value)
+                for name, value in kwargs.items()
+            }
+            channel_kwargs["use_microphone"] = False
+            if self.recorders:
+                channel_kwargs["share_models_with"] = self.recorders[0]
+            self.recorders.append(AudioToTextRecorder(**channel_kwargs))
+
+        self.text_threads = []
+        for channel, recorder in enumerate(self.recorders):
+            thread = threading.Thread(
+                target=self._text_worker, args=(channel, recorder))
+            thread.daemon = True
+            thread.start()
+            self.text_threads.append(thread)
+
+        if use_microphone:
+            from .audio_input import AudioInput
+            self.audio_input = AudioInput(
+                input_device_index=self.input_device_index,
+                channels=channels,
+                resample_to_target=False,
+            )
+            if not self.audio_input.setup():
+                raise Exception("Failed to set up multi-channel audio recording.")
+            self.capture_thread = threading.Thread(target=self._capture_worker)
+            self.capture_thread.daemon = True
+            self.capture_thread.start()
+
+    def _text_worker(self, channel, recorder):
+        """Transcribes the utterances of one channel."""
+        while self.is_running:
+            text = recorder.text()
+            if not self.is_running or recorder.is_shut_down:
+                break
+            if not text:
+                continue
+            self.results.put((channel, text))
+            if self.on_transcription:
+                self.on_transcription(channel, text)
+
+    def _capture_worker(self):
+        """Reads interleaved audio from the input device."""
+        while self.is_running:
+            try:
+                data = self.audio_input.read_chunk()
+            except Exception as e:
+                logger.error(f"Error reading multi-channel audio: {e}")
+                break
+            self.feed_audio(data, self.audio_input.device_sample_rate)
+
+    def feed_audio(self, chunk, original_sample_rate=16000):
+        """
+        Feeds interleaved multi-channel audio.
+
+        Args:
+            chunk (bytes or np.ndarray): Interleaved 16-bit PCM bytes or an
+              int16 array of shape (frames, channels).
+            original_sample_rate (int): Sample rate of the audio.
+        """
+        if isinstance(chunk, np.ndarray):
+            samples = chunk.reshape(-1, self.channels)
+        else:
+            samples = np.frombuffer(chunk, dtype=np.int16).reshape(-1, self.channels)
+
+        for channel, recorder in enumerate(self.recorders):
+            # Every channel is a strided view; copy it into a compact
+            # int16 array, no conversion to float
+            recorder.feed_audio(
+                np.ascontiguousarray(samples[:, channel]), original_sample_rate)
+
+    def text(self, timeout=None):
+        """
+        Returns the next finished transcription of any channel.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Waits until a
+              transcription is ready or the recorder is shut down if None.
+
+        Returns:
+            tuple: (channel, text), or None on timeout or shutdown.
+        """
+        waited = 0.0
+        while self.is_running:
+            try:
+                return self.results.get(timeout=0.1)
+            except queue.Empty:
+                waited += 0.1
+                if timeout is not None and waited >= timeout:
+                    return None
+        return None
+
+    def shutdown(self):
+        """Stops capturing and shuts down all channel recorders."""
+        self.is_running = False
+        if self.capture_thread:
+            self.capture_thread.join(timeout=2)
+        if self.audio_input:
+            self.audio_input.cleanup()
+        # The first recorder owns the shared models, shut it down last
+        for recorder in reversed(self.recorders):
+            recorder.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -0,0 +1,195 @@
+"""
+Streaming polyphase resampler for chunked audio.
+
+scipy.signal.resample works in the frequency domain on each chunk
+separately, which costs O(n log n) per chunk and creates discontinuities at
+every chunk boundary (the FFT assumes the chunk is periodic). The
+StreamingResampler designs one anti-aliasing FIR filter per rate pair
+(cached and shared by all instances), splits it into polyphase components
+and carries the filter history across chunks, so consecutive chunks are
+resampled as one continuous signal.
+"""
+
+from functools import lru_cache
+from math import gcd
+from scipy import signal
+import numpy as np
+
+# Same design parameters scipy.signal.resample_poly uses by default
+KAISER_BETA = 5.0
+HALF_LENGTH_FACTOR = 10
+
+
+@lru_cache(maxsize=None)
+def _polyphase_filter(up, down):
+    """
+    Designs the low-pass filter for a rate conversion of up/down and
+    returns its polyphase decomposition.
+
+    Returns:
+        np.ndarray: Array of shape (up, taps_per_phase). Row p holds the
+          time-reversed coefficients used for output samples at phase p, so
+          each output sample is a dot product with a window of input samples.
+    """
+    max_rate = max(up, down)
+    half_len = HALF_LENGTH_FACTOR * max_rate
+    h = signal.firwin(2 * half_len + 1, 1.0 / max_rate,
+                      window=('kaiser', KAISER_BETA))
+    h = h * up  # compensate the zero stuffing of the upsampling step
+
+    taps_per_phase = -(-len(h) // up)
+    padded = np.zeros(taps_per_phase * up)
+    padded[:len(h)] = h
+    phases = padded.reshape(taps_per_phase, up).T
+    phases = np.ascontiguousarray(phases[:, ::-1], dtype=np.float32)
+    phases.flags.writeable = False
+    return phases
+
+
+@lru_cache(maxsize=None)
+def _phase_cycle(up, down):
+    """
+    Orders the polyphase components the way consecutive output samples
+    use them: output k after an output at phase 0 uses phase k * down % up.
+
+    Returns:
+        tuple: (cycle_start, cycle). cycle_start[p] is the index into the
+          cycle of the output at phase p, cycle has up rows of filter
+          coefficients in output order, so the coefficients of consecutive
+          outputs are a contiguous slice of the cycle repeated.
+    """
+    order = np.arange(up) * down % up
+    cycle_start = np.empty(up, dtype=np.intp)
+    cycle_start[order] = np.arange(up)
+    cycle = _polyphase_filter(up, down)[order]
+    cycle.flags.writeable = False
+    return cycle_start, cycle
+
+
+class StreamingResampler:
+    """
+    Resamples a continuous stream that arrives in chunks of arbitrary size.
+
+    The filter is causal, so the output is delayed by half the filter
+    length, about 10 output samples (below a millisecond at 16 kHz). Call
+    flush() at the end of a finite stream to get the delayed tail.
+
+    Args:
+        original_sample_rate (int): Sample rate of the incoming audio.
+        target_sample_rate (int): Sample rate of the produced audio.
+    """
+
+    def __init__(self, original_sample_rate, target_sample_rate=16000):
+        self.original_sample_rate = int(original_sample_rate)
+        self.target_sample_rate = int(target_sample_rate)
+        divisor = gcd(self.original_sample_rate, self.target_sample_rate)
+        self.up = self.target_sample_rate // divisor
+        self.down = self.original_sample_rate // divisor
+        self.passthrough = self.up == self.down
+        if not self.passthrough:
+            self._phases = _polyphase_filter(self.up, self.down)
+            self._taps = self._phases.shape[1]
+            # Delay of the filter on the upsampled time axis
+            self._delay = HALF_LENGTH_FACTOR * max(self.up, self.down)
+            self._cycle_start, cycle = _phase_cycle(self.up, self.down)
+            # The cycle repeated, long enough for any start phase plus the
+            # outputs of one chunk (grown on demand)
+            self._coefficients = cycle
+            self._steps = np.zeros(0, dtype=np.intp)
+        self.reset()
+
+    def reset(self):
+        """Forgets the filter history, e.g. when a new stream starts."""
+        if self.passthrough:
+            return
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        # Position of the next output sample on the upsampled time axis,
+        # relative to the first sample of the next chunk
+        self._next_position = 0
+        self._num_input = 0
+        self._num_output = 0
+        self._is_int16 = True
+
+    def flush(self):
+        """
+        Ends the stream: returns the output still held back by the filter
+        delay and resets the resampler. The output of process() and
+        flush() together is the scipy.signal.resample_poly output of the
+        whole stream, preceded by the delay.
+
+        Returns:
+            np.ndarray: Remaining audio, int16 if the last chunk was int16
+              (or bytes), float32 otherwise.
+        """
+        if self.passthrough:
+            return np.zeros(0, dtype=np.int16)
+        is_int16 = self._is_int16
+        expected = -(-(self._num_input * self.up + self._delay) // self.down)
+        missing = expected - self._num_output
+        tail = self.process(np.zeros(-(-self._delay // self.up) + 1, dtype=np.float32))
+        tail = tail[:max(missing, 0)]
+        self.reset()
+        if is_int16:
+            np.round(tail, out=tail)
+            np.clip(tail, -32768, 32767, out=tail)
+            return tail.astype(np.int16)
+        return tail
+
+    def process(self, chunk):
+        """
+        Resamples the next chunk of the stream.
+
+        Args:
+            chunk (np.ndarray or bytes-like): Mono audio. Bytes are
+              interpreted as 16-bit PCM.
+
+        Returns:
+            np.ndarray: Resampled audio. int16 input (and bytes) gives int16
+              output, any other dtype gives float32 output.
+        """
+        if not isinstance(chunk, np.ndarray):
+            chunk = np.frombuffer(chunk, dtype=np.int16)
+        is_int16 = chunk.dtype == np.int16
+        if self.passthrough:
+            return chunk if is_int16 else chunk.astype(np.float32)
+
+        num_input = len(chunk)
+        self._is_int16 = is_int16
+        buffer = np.concatenate((self._history, chunk.astype(np.float32)))
+
+        positions_end = num_input * self.up
+        num_output = max(0, -(-(positions_end - self._next_position) // self.down))
+        # Row i is buffer[i:i + taps], as a view on the buffer
+        windows = np.ndarray((len(buffer) - self._taps + 1, self._taps),
+                             dtype=np.float32, buffer=buffer,
+                             strides=(buffer.itemsize, buffer.itemsize))
+
+        if self.up == 1:
+            # Integer decimation: a single phase, every down-th window
+            start = self._next_position
+            output = windows[start:start + num_output * self.down:self.down] @ self._phases[0]
+        else:
+            if num_output > len(self._steps):
+                self._grow(num_output)
+            input_index = (self._next_position + self._steps[:num_output]) // self.up
+            first = self._cycle_start[self._next_position % self.up]
+            output = np.einsum('ij,ij->i', windows[input_index],
+                               self._coefficients[first:first + num_output])
+
+        self._next_position += num_output * self.down - positions_end
+        self._num_input += num_input
+        self._num_output += num_output
+        self._history = buffer[len(buffer) - len(self._history):]
+
+        if is_int16:
+            np.round(output, out=output)
+            np.clip(output, -32768, 32767, out=output)
+            return output.astype(np.int16)
+        return output.astype(np.float32, copy=False)
+
+    def _grow(self, num_output):
+        """Extends the output steps and the repeated coefficient cycle to num_output outputs."""
+        self._steps = self.down * np.arange(num_output, dtype=np.intp)
+        _, cycle = _phase_cycle(self.up, self.down)
+        repeats = -(-(self.up + num_output) // self.up)
+        self._coefficients = np.tile(cycle, (repeats, 1))
@@ -1,5 +1,6 @@
 import sys
 import multiprocessing as mp
+import collections
 import queue
 import threading
 import time
@@ -10,6 +11,9 @@ import logging
 #                     format='[%(asctime)s] %(levelname)s:%(name)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# How often the reader threads of a SharedParentPipe check for close()
+READER_POLL_INTERVAL = 0.1
+
 try:
     # Only set the start method if it hasn't been set already.
     if sys.platform.startswith('linux') or sys.platform == 'darwin':  # For Linux or macOS
@@ -174,6 +178,250 @@ class ParentPipe:
         logger.debug("[%s] closed", self.name)
 
 
+class SharedParentPipe:
+    """
+    Shares the parent ends of one or more worker pipes between several
+    clients (e.g. one recorder per audio channel, or concurrent
+    transcription calls).
+
+    Every worker answers its requests one at a time and in order, so each
+    reply belongs to the client that sent the oldest unanswered request to
+    that worker. Each client gets its own ChannelPipe with the usual send(),
+    poll() and recv(); a reader thread per worker pipe routes the replies
+    into the inbox of the client that sent the matching request.
+
+    With several pipes (a pool of workers serving the same requests), a
+    request goes to the worker with the fewest unanswered requests. A client
+    that still waits for replies keeps using the same worker, so its replies
+    arrive in the order of its requests.
+
+    Replies that are tuples starting with a request id can be discarded by
+    id (ChannelPipe.discard()), so results nobody waits for anymore never
+    pile up in an inbox. Discarding can also send a cancel message to the
+    worker that has the request, so it stops working on it. Discarded
+    replies are passed to on_discarded (if set) instead.
+
+    Tagged replies are routed by their request id. A worker can send
+    several replies to one request if all but the last are partial ones
+    (is_partial(reply) returns True, e.g. streamed progress); only the last
+    one answers the request.
+
+    The parent ends are raw multiprocessing connections, not ParentPipes:
+    a ParentPipe runs every operation on one worker thread, so a send
+    would wait behind the reader's poll. Here the reader polls and
+    receives on the connection itself, while sends (serialized per
+    connection) write to it directly.
+    """
+    def __init__(self, parent_pipes, is_partial=None):
+        if not isinstance(parent_pipes, (list, tuple)):
+            parent_pipes = [parent_pipes]
+        self._pipes = list(parent_pipes)
+        self._is_partial = is_partial
+        self._lock = threading.Lock()
+        self._reply_ready = threading.Condition(self._lock)
+        self._send_locks = [threading.Lock() for _ in self._pipes]
+        # (client, request id) of each unanswered request, per worker pipe
+        self._pending = [collections.deque() for _ in self._pipes]
+        self._inboxes = {}
+        self._discarded = {}  # request ids whose replies are dropped, per client
+        self._next_client = 0
+        self._closed = False
+        self.requests_sent = [0] * len(self._pipes)
+        self.on_discarded = None
+        self._readers = [
+            threading.Thread(target=self._reader, args=(index,),
+                             name=f"SharedParentPipe_Reader{index}", daemon=True)
+            for index in range(len(self._pipes))
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def channel(self):
+        """Returns a new client end of the shared pipe."""
+        with self._lock:
+            client = self._next_client
+            self._next_client += 1
+            self._inboxes[client] = collections.deque()
+            self._discarded[client] = set()
+        return ChannelPipe(self, client)
+
+    def pending_requests(self):
+        """Number of unanswered requests per worker pipe."""
+        with self._lock:
+            return [len(pending) for pending in self._pending]
+
+    def _select_worker(self, client):
+        for index, pending in enumerate(self._pending):
+            if any(owner == client for owner, _ in pending):
+                return index
+        return min(range(len(self._pipes)), key=lambda i: len(self._pending[i]))
+
+    def _send(self, client, data):
+        with self._lock:
+            if self._closed:
+                return
+            index = self._select_worker(client)
+        # The request has to be queued in the order it is sent
+        with self._send_locks[index]:
+            with self._lock:
+                self._pending[index].append((client, _request_id(data)))
+                self.requests_sent[index] += 1
+            self._pipes[index].send(data)
+
+    def _reader(self, index):
+        connection = self._pipes[index]
+        while not self._closed:
+            try:
+                # Only reads: sends from other threads go to the
+                # connection directly and never wait for this poll
+                if not connection.poll(READER_POLL_INTERVAL):
+                    continue
+                data = connection.recv()
+            except (EOFError, BrokenPipeError, OSError):
+                break
+            if data is None:
+                continue
+            partial = self._is_partial is not None and self._is_partial(data)
+            with self._lock:
+                owner = self._owner(index, _request_id(data), partial)
+                inbox = self._inboxes.get(owner)
+                # Replies for released clients or discarded requests are dropped
+                dropped = inbox is None or self._is_discarded(owner, data, partial)
+                if not dropped:
+                    inbox.append(data)
+                    self._reply_ready.notify_all()
+            if dropped and self.on_discarded is not None:
+                try:
+                    self.on_discarded(data)
+                except Exception:
+                    logging.exception("Error in on_discarded callback")
+
+    def _owner(self, index, request_id, partial):
+        """Client of the request a reply answers, removed from the pending
+        requests unless the reply is a partial one."""
+        pending = self._pending[index]
+        if request_id is not None:
+            for position, (client, pending_id) in enumerate(pending):
+                if pending_id == request_id:
+                    if not partial:
+                        del pending[position]
+                    return client
+        if not pending:
+            return None
+        # Untagged replies answer the oldest request
+        return pending[0][0] if partial else pending.popleft()[0]
+
+    def _poll(self, client, timeout):
+        with self._lock:
+            inbox = self._inboxes.get(client)
+            if inbox is None:
+                return False
+            return bool(self._reply_ready.wait_for(
+                lambda: inbox or self._closed, timeout or 0.0)) and bool(inbox)
+
+    def _recv(self, client):
+        with self._lock:
+            inbox = self._inboxes.get(client)
+            if inbox is None:
+                return None
+            self._reply_ready.wait_for(lambda: inbox or self._closed)
+            return inbox.popleft() if inbox else None
+
+    def _is_discarded(self, client, data, partial=False):
+        discarded = self._discarded[client]
+        request_id = _request_id(data)
+        if discarded and request_id in discarded:
+            if not partial:
+                discarded.discard(request_id)
+            return True
+        return False
+
+    def _discard(self, client, request_id, cancel=None):
+        with self._lock:
+            inbox = self._inboxes.get(client)
+            if inbox is None:
+                return
+            replies = [data for data in inbox if _request_id(data) == request_id]
+            if replies:
+                remaining = [data for data in inbox if _request_id(data) != request_id]
+                inbox.clear()
+                inbox.extend(remaining)
+            if any(self._is_partial is None or not self._is_partial(data)
+                   for data in replies):
+                return  # already answered
+            self._discarded[client].add(request_id)
+            if cancel is None:
+                return
+            # Only the worker with the unanswered request gets the cancel
+            index = next((index for index, pending in enumerate(self._pending)
+                          if (client, request_id) in pending), None)
+        if index is not None and not self._closed:
+            # No reply is expected for the cancel message itself
+            with self._send_locks[index]:
+                self._pipes[index].send(cancel)
+
+    def _release(self, client):
+        with self._lock:
+            self._inboxes.pop(client, None)
+            self._discarded.pop(client, None)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._reply_ready.notify_all()
+        # The readers stop within one poll interval, then nothing uses the
+        # connections anymore
+        for reader in self._readers:
+            if reader is not threading.current_thread():
+                reader.join()
+        for index, connection in enumerate(self._pipes):
+            with self._send_locks[index]:
+                try:
+                    connection.close()
+                except OSError:
+                    pass
+
+
+def _request_id(data):
+    """Request id of a message that is a tuple starting with one, or None."""
+    if isinstance(data, tuple) and data and isinstance(data[0], int):
+        return data[0]
+    return None
+
+
+class ChannelPipe:
+    """
+    Client end of a SharedParentPipe, used like a ParentPipe.
+    Closing a client end leaves the shared pipe open; replies to requests
+    it still has pending are discarded.
+    """
+    def __init__(self, shared_pipe, client):
+        self._shared_pipe = shared_pipe
+        self._client = client
+
+    def send(self, data):
+        self._shared_pipe._send(self._client, data)
+
+    def poll(self, timeout=0.0):
+        return self._shared_pipe._poll(self._client, timeout)
+
+    def recv(self):
+        return self._shared_pipe._recv(self._client)
+
+    def discard(self, request_id, cancel=None):
+        """
+        Drops the reply to request_id, now or when it arrives. If the
+        request is still unanswered and cancel is given, cancel is sent to
+        the worker that has the request.
+        """
+        self._shared_pipe._discard(self._client, request_id, cancel)
+
+    def close(self):
+        self._shared_pipe._release(self._client)
+
+
 def SafePipe(debug=False):
     """
     Returns a pair: (thread-safe parent pipe, raw child pipe).
@@ -0,0 +1,215 @@
+"""
+Shared memory transport for audio chunks.
+
+SharedAudioQueue is a drop-in replacement for the multiprocessing.Queue
+that carries audio chunks from the audio reader (process or thread) to the
+recording worker. Chunks are copied into a ring buffer in shared memory
+instead of being pickled and pushed through a pipe by a feeder thread, so a
+chunk is available to the consumer as soon as put() returns.
+
+Only the small ring indices are guarded by a lock. One event wakes up a
+waiting consumer, another a producer waiting for room. The live reader
+puts without blocking, so a full ring drops its chunks, while fed audio
+waits for room instead of being lost. The same implementation works
+between processes (Windows, macOS) and between threads of one process
+(Linux).
+"""
+
+from multiprocessing import shared_memory
+import multiprocessing as mp
+import numpy as np
+import struct
+import queue
+import time
+
+DEFAULT_CAPACITY = 16000 * 2 * 10  # 10 seconds of 16 kHz 16-bit audio
+HEADER_SIZE = 64
+LENGTH_PREFIX = struct.Struct("<I")
+
+# Header fields (uint64)
+WRITE_POS = 0      # bytes written in total
+READ_POS = 1       # bytes read in total
+WRITE_COUNT = 2    # chunks written in total
+READ_COUNT = 3     # chunks read in total
+DROPPED = 4        # chunks dropped because the ring was full
+
+
+class SharedAudioQueue:
+    """
+    Ring buffer of audio chunks in shared memory with a Queue-like API
+    (put, get, get_nowait, qsize, empty).
+
+    Args:
+        capacity (int): Size of the ring in bytes.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_SIZE + self.capacity)
+        self._owner = True
+        self._lock = mp.Lock()
+        self._data_event = mp.Event()
+        self._space_event = mp.Event()
+        self._attach()
+        self._header[:] = 0
+
+    def _attach(self):
+        self._header = np.ndarray((5,), dtype=np.uint64, buffer=self._shm.buf)
+        self._ring = self._shm.buf[HEADER_SIZE:HEADER_SIZE + self.capacity]
+
+    def __getstate__(self):
+        return {
+            "capacity": self.capacity,
+            "name": self._shm.name,
+            "lock": self._lock,
+            "data_event": self._data_event,
+            "space_event": self._space_event,
+        }
+
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._lock = state["lock"]
+        self._data_event = state["data_event"]
+        self._space_event = state["space_event"]
+        self._attach()
+
+    def _write(self, position, data):
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        self._ring[start:start + first] = data[:first]
+        if first < len(data):
+            self._ring[:len(data) - first] = data[first:]
+
+    def _read(self, position, length):
+        start = position % self.capacity
+        first = min(length, self.capacity - start)
+        if first == length:
+            return bytes(self._ring[start:start + length])
+        return bytes(self._ring[start:start + first]) + bytes(self._ring[:length - first])
+
+    def _try_put(self, data, needed):
+        with self._lock:
+            write_pos = int(self._header[WRITE_POS])
+            used = write_pos - int(self._header[READ_POS])
+            if needed > self.capacity - used:
+                return False
+            self._write(write_pos, LENGTH_PREFIX.pack(len(data)))
+            self._write(write_pos + LENGTH_PREFIX.size, data)
+            self._header[WRITE_POS] = write_pos + needed
+            self._header[WRITE_COUNT] += 1
+        self._data_event.set()
+        return True
+
+    def put(self, data, block=True, timeout=None):
+        """
+        Appends a chunk, waiting for room while the ring is full.
+
+        Without block the chunk is dropped and counted (see dropped) if
+        the ring is full; audio must never block the live reader. A chunk
+        larger than the ring is always dropped.
+
+        Raises:
+            queue.Full: If there is no room within timeout when blocking.
+        """
+        data = memoryview(data).cast('B')
+        needed = LENGTH_PREFIX.size + len(data)
+        if needed > self.capacity:
+            block = False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._try_put(data, needed):
+            if not block:
+                with self._lock:
+                    self._header[DROPPED] += 1
+                return
+            # Clear before re-checking, so a get() in between is not missed
+            self._space_event.clear()
+            if self._try_put(data, needed):
+                return
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Full
+            self._space_event.wait(remaining)
+
+    def put_nowait(self, data):
+        self.put(data, block=False)
+
+    def get(self, block=True, timeout=None):
+        """
+        Removes and returns the oldest chunk as bytes.
+
+        Raises:
+            queue.Empty: If no chunk arrives (within timeout when blocking).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                read_pos = int(self._header[READ_POS])
+                available = int(self._header[WRITE_POS]) - read_pos
+            if available:
+                break
+            if not block:
+                raise queue.Empty
+            # Clear before re-checking, so a put() in between is not missed
+            self._data_event.clear()
+            with self._lock:
+                available = int(self._header[WRITE_POS]) - read_pos
+            if available:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self._data_event.wait(remaining)
+
+        # Only this consumer advances the read position, so the chunk
+        # can be copied out without holding the lock
+        length = LENGTH_PREFIX.unpack(self._read(read_pos, LENGTH_PREFIX.size))[0]
+        data = self._read(read_pos + LENGTH_PREFIX.size, length)
+        with self._lock:
+            self._header[READ_POS] = read_pos + LENGTH_PREFIX.size + length
+            self._header[READ_COUNT] += 1
+        self._space_event.set()
+        return data
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self):
+        """Number of chunks waiting in the ring."""
+        with self._lock:
+            return int(self._header[WRITE_COUNT] - self._header[READ_COUNT])
+
+    def empty(self):
+        return self.qsize() == 0
+
+    @property
+    def dropped(self):
+        """Number of chunks dropped because the ring was full."""
+        return int(self._header[DROPPED])
+
+    def _detach(self):
+        # The views onto the buffer must be gone before the mapping closes
+        if self._ring is None:
+            return False
+        self._header = None
+        self._ring.release()
+        self._ring = None
+        self._shm.close()
+        return True
+
+    def close(self):
+        """Detaches from the shared memory; the creator also frees it."""
+        if self._detach() and self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __del__(self):
+        # Processes that only attached (the reader process) never call close
+        try:
+            self._detach()
+        except (AttributeError, BufferError):
+            pass
@@ -0,0 +1,177 @@
+"""
+Batched Silero VAD for many recorders in one process.
+
+With one recorder per caller, every recorder runs its own Silero forward
+pass per 512-sample window, and the per-call overhead of onnxruntime is
+far larger than the compute of a single window. SileroBatchService runs
+one worker thread per model session. Recorders score audio through
+BatchedSileroVAD streams: each pending window is handed to the worker,
+which collects the windows of all streams, stacks their recurrent states
+and audio contexts, runs a single batched forward pass and routes every
+probability (and the updated state) back to its stream.
+
+Each stream keeps its own state and context, so results are the same as
+with a separate SileroOnnxVAD per recorder.
+"""
+
+from .silero_onnx import SileroOnnxVAD
+import threading
+import weakref
+import time
+import numpy as np
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT = 0.002  # seconds the worker waits for more streams
+
+
+class _Request:
+    __slots__ = ("stream", "windows", "index", "probabilities", "error",
+                 "done")
+
+    def __init__(self, stream, windows):
+        self.stream = stream
+        self.windows = windows
+        self.index = 0
+        self.probabilities = []
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchedSileroVAD(SileroOnnxVAD):
+    """
+    Silero VAD stream whose windows are scored by a SileroBatchService.
+
+    Same interface as SileroOnnxVAD. A stream must only be used by one
+    thread at a time (the recorder serializes its calls with silero_lock).
+    """
+
+    def __init__(self, service):
+        self.service = service
+        super().__init__(service.session, service.sample_rate)
+
+    def _score_windows(self, windows):
+        return self.service.score(self, windows)
+
+
+class SileroBatchService:
+    """
+    Scores the windows of many BatchedSileroVAD streams in batches.
+
+    Args:
+        session (onnxruntime.InferenceSession): Silero VAD session, see
+          silero_onnx.create_session().
+        sample_rate (int): 16000 or 8000.
+        max_batch_size (int): Most windows per forward pass.
+        max_wait (float): After the first window arrives, seconds the
+          worker waits for the other streams before running the batch.
+          It stops waiting as soon as every stream has a window pending.
+    """
+
+    def __init__(self, session, sample_rate=16000,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait=DEFAULT_MAX_WAIT):
+        self.session = session
+        self.sample_rate = sample_rate
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._streams = weakref.WeakSet()
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self.batches = 0
+        self.windows_scored = 0
+
+    def stream(self):
+        """Creates a stream with its own state."""
+        stream = BatchedSileroVAD(self)
+        with self._condition:
+            self._streams.add(stream)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="SileroBatchService", daemon=True)
+                self._thread.start()
+        return stream
+
+    def score(self, stream, windows):
+        """
+        Scores windows of a stream in order (blocks until done).
+
+        Returns:
+            list of float: One speech probability per window.
+        """
+        request = _Request(stream, windows)
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.probabilities
+
+    def stats(self):
+        """Returns the number of batches, scored windows and streams."""
+        return {
+            "streams": len(self._streams),
+            "batches": self.batches,
+            "windows_scored": self.windows_scored,
+            "mean_batch_size": (self.windows_scored / self.batches
+                                if self.batches else 0.0),
+        }
+
+    def _collect(self):
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < min(len(self._streams),
+                                           self.max_batch_size):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            requests = self._pending
+            self._pending = []
+        return requests
+
+    def _worker(self):
+        while True:
+            active = self._collect()
+            # Requests with several windows take part in several rounds,
+            # one window per stream and forward pass keeps the order
+            while active:
+                for start in range(0, len(active), self.max_batch_size):
+                    batch = active[start:start + self.max_batch_size]
+                    try:
+                        self._run_batch(batch)
+                    except Exception as e:
+                        # Hand the error to the waiting callers
+                        for request in batch:
+                            request.error = e
+                            request.index = len(request.windows)
+                finished = [r for r in active if r.index == len(r.windows)]
+                active = [r for r in active if r.index < len(r.windows)]
+                for request in finished:
+                    request.done.set()
+
+    def _run_batch(self, requests):
+        streams = [request.stream for request in requests]
+        context_size = streams[0].context_size
+        audio = np.empty((len(requests), context_size + streams[0].window_size),
+                         dtype=np.float32)
+        for i, (stream, request) in enumerate(zip(streams, requests)):
+            audio[i, :context_size] = stream._context[0]
+            audio[i, context_size:] = request.windows[request.index]
+        state = np.concatenate([stream._state for stream in streams], axis=1)
+        out, state = self.session.run(None, {
+            "input": audio,
+            "state": state,
+            "sr": self._sr,
+        })
+        self.batches += 1
+        self.windows_scored += len(requests)
+        for i, (stream, request) in enumerate(zip(streams, requests)):
+            stream._state = state[:, i:i + 1]
+            stream._context = audio[i:i + 1, -context_size:]
+            request.probabilities.append(float(out[i, 0]))
+            request.index += 1
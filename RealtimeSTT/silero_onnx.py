@@ -0,0 +1,108 @@
+"""
+Torch-free Silero VAD backend on ONNX Runtime.
+
+SileroOnnxVAD runs the Silero VAD ONNX graph directly with numpy inputs:
+audio is scored in fixed 512-sample windows (at 16 kHz), the recurrent
+state and the audio context between windows are kept as numpy arrays and
+the session runs single-threaded on the calling thread, so several
+recorders do not oversubscribe the CPU. No torch import is needed.
+"""
+
+import numpy as np
+
+WINDOW_SIZES = {16000: 512, 8000: 256}
+CONTEXT_SIZES = {16000: 64, 8000: 32}
+STATE_SHAPE = (2, 1, 128)
+
+
+def create_session(model, num_threads=1):
+    """
+    Creates an ONNX Runtime session for the Silero VAD graph.
+
+    Args:
+        model (str or bytes): Path or contents of the ONNX file.
+        num_threads (int): Threads used by the session. With 1, inference
+          runs on the calling thread and no thread pool spins.
+    """
+    import onnxruntime
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = num_threads
+    options.inter_op_num_threads = 1
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return onnxruntime.InferenceSession(
+        model, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+class SileroOnnxVAD:
+    """
+    Silero VAD with its own recurrent state on a (shareable) session.
+
+    Args:
+        session (onnxruntime.InferenceSession): Session from create_session().
+        sample_rate (int): 16000 or 8000.
+    """
+
+    def __init__(self, session, sample_rate=16000):
+        if sample_rate not in WINDOW_SIZES:
+            raise ValueError("Silero VAD supports 8000 and 16000 Hz")
+        self.session = session
+        self.sample_rate = sample_rate
+        self.window_size = WINDOW_SIZES[sample_rate]
+        self.context_size = CONTEXT_SIZES[sample_rate]
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self.reset_states()
+
+    def reset_states(self):
+        """Clears the recurrent state, the context and pending samples."""
+        self._state = np.zeros(STATE_SHAPE, dtype=np.float32)
+        self._context = np.zeros((1, self.context_size), dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last_probability = 0.0
+
+    def _run_window(self, window):
+        audio = np.concatenate((self._context, window.reshape(1, -1)), axis=1)
+        out, self._state = self.session.run(None, {
+            "input": audio,
+            "state": self._state,
+            "sr": self._sr,
+        })
+        self._context = audio[:, -self.context_size:]
+        return float(out[0, 0])
+
+    def probability(self, audio):
+        """
+        Scores float32 audio in [-1, 1] of any length.
+
+        Complete windows are scored in order; samples that do not fill a
+        window are kept for the next call.
+
+        Returns:
+            float: Highest speech probability of the windows scored by this
+              call (the last probability if no window was complete).
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if len(self._pending):
+            audio = np.concatenate((self._pending, audio))
+        num_windows = len(audio) // self.window_size
+        end = num_windows * self.window_size
+        self._pending = audio[end:].copy()
+        if not num_windows:
+            return self._last_probability
+        probability = max(self._score_windows(
+            audio[:end].reshape(num_windows, self.window_size)))
+        self._last_probability = probability
+        return probability
+
+    def _score_windows(self, windows):
+        """Scores complete windows in order, returns their probabilities."""
+        return [self._run_window(window) for window in windows]
+
+    def __call__(self, audio, sample_rate):
+        """
+        Same call as the TorchScript model: scores one window and returns
+        the probability as an array (supports .item()).
+        """
+        if sample_rate != self.sample_rate:
+            raise ValueError(f"Model was set up for {self.sample_rate} Hz")
+        return np.array([[self.probability(audio)]], dtype=np.float32)
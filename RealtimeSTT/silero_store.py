@@ -0,0 +1,134 @@
+"""
+Local model store for the Silero VAD weights.
+
+torch.hub.load("snakers4/silero-vad") needs network access (or a warm hub
+cache) and runs the hub repo loading machinery on every recorder
+construction. The store keeps the JIT and ONNX model files in a local
+directory keyed by Silero VAD version, downloads a missing file once and
+loads the files directly. Air-gapped machines can be provisioned by
+copying the store directory (or by pointing REALTIMESTT_MODEL_DIR to it).
+
+The file contents and ONNX inference sessions (and with batching, the
+batch service of a session) are shared by all recorders of a process.
+The JIT model keeps its recurrent state inside the module, so every
+recorder gets its own module, deserialized from the shared bytes.
+"""
+
+from .silero_onnx import SileroOnnxVAD, create_session
+from .silero_batch import SileroBatchService
+from functools import lru_cache
+import urllib.request
+import threading
+import logging
+import os
+import io
+
+logger = logging.getLogger("realtimestt")
+
+SILERO_VAD_VERSION = "v5.1.2"
+MODEL_FILES = {"jit": "silero_vad.jit", "onnx": "silero_vad.onnx"}
+DOWNLOAD_URL = ("https://github.com/snakers4/silero-vad/raw/"
+                "{version}/src/silero_vad/data/{filename}")
+MODEL_DIR_ENV = "REALTIMESTT_MODEL_DIR"
+
+_download_lock = threading.Lock()
+
+
+def default_model_dir():
+    """Returns the store directory (REALTIMESTT_MODEL_DIR or ~/.cache)."""
+    return os.environ.get(MODEL_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "realtimestt")
+
+
+def silero_model_path(kind="jit", version=SILERO_VAD_VERSION,
+                      model_dir=None, download=True):
+    """
+    Returns the local path of a Silero VAD model file, downloading it into
+    the store if it is missing.
+
+    Args:
+        kind (str): "jit" or "onnx".
+        version (str): Silero VAD release tag.
+        model_dir (str, optional): Store directory. Defaults to
+          default_model_dir().
+        download (bool): Download a missing file. If False, a missing file
+          raises FileNotFoundError.
+    """
+    filename = MODEL_FILES[kind]
+    path = os.path.join(model_dir or default_model_dir(),
+                        "silero-vad", version, filename)
+    if os.path.isfile(path):
+        return path
+    if not download:
+        raise FileNotFoundError(f"Silero VAD model not found: {path}")
+
+    with _download_lock:
+        if os.path.isfile(path):
+            return path
+        url = DOWNLOAD_URL.format(version=version, filename=filename)
+        logger.info(f"Downloading Silero VAD {version} ({kind}) to {path}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.part"
+        try:
+            urllib.request.urlretrieve(url, temp_path)
+            # Never leave a partial file under the final name
+            os.replace(temp_path, path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise FileNotFoundError(
+                f"Silero VAD model {path} is missing and could not be "
+                f"downloaded from {url} ({e}). Copy the file into the "
+                f"model store to run offline."
+            ) from e
+    return path
+
+
+@lru_cache(maxsize=None)
+def _model_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _onnx_session(path, num_threads):
+    return create_session(_model_bytes(path), num_threads)
+
+
+@lru_cache(maxsize=None)
+def _batch_service(path, num_threads):
+    return SileroBatchService(_onnx_session(path, num_threads))
+
+
+def load_silero_vad(onnx=False, version=SILERO_VAD_VERSION, model_dir=None,
+                    num_threads=1, batched=False):
+    """
+    Loads a Silero VAD model from the local store.
+
+    Args:
+        onnx (bool): Load the ONNX model (run with onnxruntime) instead of
+          the TorchScript model.
+        version (str): Silero VAD release tag.
+        model_dir (str, optional): Store directory.
+        num_threads (int): ONNX Runtime threads (ONNX model only).
+        batched (bool): Score through the process-wide SileroBatchService
+          of the session, which batches the windows of all models loaded
+          this way (ONNX model only).
+
+    Returns:
+        A model with a fresh state, called as model(audio, sample_rate).
+        The ONNX model is a torch-free SileroOnnxVAD.
+    """
+    if batched and not onnx:
+        logger.warning("Batched Silero VAD needs the ONNX model, "
+                       "using an unbatched TorchScript model.")
+    path = silero_model_path("onnx" if onnx else "jit", version, model_dir)
+    if onnx and batched:
+        return _batch_service(path, num_threads).stream()
+    if onnx:
+        return SileroOnnxVAD(_onnx_session(path, num_threads))
+
+    import torch
+    model = torch.jit.load(io.BytesIO(_model_bytes(path)), map_location="cpu")
+    model.eval()
+    return model
@@ -0,0 +1,209 @@
+"""
+Sample-accurate speech segmentation.
+
+SpeechSegmenter is the start/stop state machine of the recorder as a pure,
+single-threaded component. It is fed one VAD score per chunk together with
+the sample position of the chunk and returns the resulting events at exact
+sample positions. It knows nothing about threads, clocks or models, so the
+same segmenter drives live recording and file transcription and can be
+tested by feeding it scores directly.
+
+Onset and offset use separate thresholds (hysteresis): a segment starts
+when a score reaches start_threshold, and within a segment a chunk only
+counts as silence once its score falls below end_threshold.
+
+Both comparisons include the threshold. A score equal to end_threshold is
+speech, so a share of speech frames can demand every frame with an
+end_threshold of 1.0 (the recorder's WebRTC deactivity rule). For a Silero
+probability the equal case only differs from the recorder's former
+"probability > threshold" check at exactly the threshold.
+"""
+
+from typing import NamedTuple
+
+SPEECH_START = "speech_start"
+SILENCE_START = "silence_start"
+SPEECH_RESUME = "speech_resume"
+EARLY_TRANSCRIBE = "early_transcribe"
+SPEECH_END = "speech_end"
+
+_NO_EVENTS = ()
+
+
+class SegmentEvent(NamedTuple):
+    """
+    Event of a SpeechSegmenter.
+
+    Attributes:
+        kind (str): SPEECH_START, SILENCE_START, SPEECH_RESUME,
+          EARLY_TRANSCRIBE or SPEECH_END.
+        position (int): Sample position of the event. Onsets and silence
+          starts are reported at the first sample of the deciding chunk,
+          early transcriptions and segment ends after its last sample.
+        segment_start (int): First sample of the segment, including the
+          pre-roll.
+    """
+    kind: str
+    position: int
+    segment_start: int
+
+
+class SpeechSegmenter:
+    """
+    Hysteresis segmenter working on sample positions.
+
+    All durations are in samples.
+
+    Args:
+        start_threshold (float): Score a chunk needs to start a segment.
+        end_threshold (float, optional): Within a segment, chunks scoring
+          below this count as silence. Defaults to start_threshold.
+        pre_roll (int): Audio before the onset that belongs to the segment.
+        post_speech_silence (int): Silence that ends a segment.
+        min_length (int): Speech length after the onset before silence is
+          measured at all.
+        min_gap (int): Minimum distance between the end of a segment and
+          the next onset.
+        early_transcription_silence (int): Silence after which an
+          EARLY_TRANSCRIBE event is emitted, once per pause. 0 disables it.
+    """
+
+    def __init__(self,
+                 start_threshold=0.5,
+                 end_threshold=None,
+                 pre_roll=0,
+                 post_speech_silence=0,
+                 min_length=0,
+                 min_gap=0,
+                 early_transcription_silence=0):
+        self.start_threshold = start_threshold
+        self.end_threshold = (start_threshold if end_threshold is None
+                              else end_threshold)
+        self.pre_roll = pre_roll
+        self.post_speech_silence = post_speech_silence
+        self.min_length = min_length
+        self.min_gap = min_gap
+        self.early_transcription_silence = early_transcription_silence
+        self.reset()
+
+    def reset(self):
+        """Forgets the current segment and the end of the last one."""
+        self.in_speech = False
+        self.onset = 0
+        self.segment_start = 0
+        self.silence_start = None
+        self.last_end = None
+        self._early_sent = False
+        self._last_segment = None
+
+    def start_segment(self, position, segment_start=None):
+        """
+        Opens a segment without an onset decision, e.g. for a manual or
+        wake word triggered start.
+        """
+        self.in_speech = True
+        self.onset = position
+        self.segment_start = position if segment_start is None else segment_start
+        self.silence_start = None
+        self._early_sent = False
+
+    def end_segment(self, position):
+        """Closes the current segment at position, e.g. for a manual stop."""
+        if self.in_speech:
+            self._last_segment = (self.onset, self.segment_start,
+                                  self.silence_start)
+        self.in_speech = False
+        self.silence_start = None
+        self.last_end = position
+
+    def reopen(self):
+        """
+        Reopens the segment closed by the last SPEECH_END, keeping its
+        silence start, for consumers that could not act on the end yet.
+        The next silent chunk ends it again.
+        """
+        if self._last_segment is None:
+            return
+        self.onset, self.segment_start, self.silence_start = self._last_segment
+        self.in_speech = True
+        self._last_segment = None
+
+    def can_start(self, position):
+        """Returns False while position is within min_gap of the last end."""
+        return self.last_end is None or position - self.last_end >= self.min_gap
+
+    def process(self, position, num_samples, score):
+        """
+        Advances the state machine by one chunk.
+
+        Args:
+            position (int): Sample position of the first sample of the chunk.
+            num_samples (int): Length of the chunk.
+            score (float): VAD score of the chunk (a probability, a share of
+              speech frames or 0/1 for a plain decision).
+
+        Returns:
+            tuple of SegmentEvent: Events caused by the chunk (usually empty).
+        """
+        if not self.in_speech:
+            if score < self.start_threshold or not self.can_start(position):
+                return _NO_EVENTS
+            self.in_speech = True
+            self.onset = position
+            self.segment_start = max(position - self.pre_roll, 0,
+                                     self.last_end or 0)
+            self.silence_start = None
+            self._early_sent = False
+            return (SegmentEvent(SPEECH_START, position, self.segment_start),)
+
+        if score >= self.end_threshold:
+            if self.silence_start is None:
+                return _NO_EVENTS
+            self.silence_start = None
+            self._early_sent = False
+            return (SegmentEvent(SPEECH_RESUME, position, self.segment_start),)
+
+        events = _NO_EVENTS
+        if self.silence_start is None:
+            if position - self.onset <= self.min_length:
+                return _NO_EVENTS
+            self.silence_start = position
+            events = (SegmentEvent(SILENCE_START, position, self.segment_start),)
+
+        end = position + num_samples
+        silence = end - self.silence_start
+        if silence >= self.post_speech_silence:
+            self.end_segment(end)
+            return events + (SegmentEvent(SPEECH_END, end, self.segment_start),)
+        if (self.early_transcription_silence and not self._early_sent
+                and silence > self.early_transcription_silence):
+            self._early_sent = True
+            return events + (
+                SegmentEvent(EARLY_TRANSCRIBE, end, self.segment_start),)
+        return events
+
+    def segments(self, scores, chunk_size, start=0):
+        """
+        Runs the segmenter over equally sized chunks.
+
+        Args:
+            scores (iterable of float): One score per chunk.
+            chunk_size (int): Samples per chunk.
+            start (int): Sample position of the first chunk.
+
+        Returns:
+            list of tuple: (segment_start, segment_end) sample positions. A
+              segment still open after the last chunk ends there.
+        """
+        segments = []
+        position = start
+        process = self.process
+        for score in scores:
+            for event in process(position, chunk_size, score):
+                if event.kind == SPEECH_END:
+                    segments.append((event.segment_start, event.position))
+            position += chunk_size
+        if self.in_speech:
+            segments.append((self.segment_start, position))
+            self.end_segment(position)
+        return segments
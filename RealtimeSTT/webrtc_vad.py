@@ -0,0 +1,98 @@
+"""
+Frame-level WebRTC voice activity detection for audio chunks.
+
+WebRTCVADEngine runs the WebRTC VAD on every 10 ms frame of a chunk and
+returns the decisions as a boolean mask, one entry per frame, instead of
+a single yes/no. Frames are handed to the VAD as memoryview slices of the
+chunk, so no frame is copied. At 16 kHz the chunk is used as it is. At
+other rates the caller can pass the 16 kHz samples it already has (see
+to_16k), so the recorder resamples a chunk once for the WebRTC check,
+Silero and wake word detection. The engine keeps no per-chunk state and
+can be used from several threads.
+"""
+
+from scipy import signal
+import numpy as np
+import webrtcvad
+
+VAD_SAMPLE_RATE = 16000
+FRAME_DURATION_MS = 10
+
+
+class WebRTCVADEngine:
+    """
+    Per-frame WebRTC VAD decisions for 16-bit PCM chunks.
+
+    Args:
+        mode (int): WebRTC VAD aggressiveness (0-3).
+        sample_rate (int): Sample rate of the chunks passed in.
+        frame_duration_ms (int): Frame length, 10, 20 or 30 ms.
+    """
+
+    def __init__(self, mode=3, sample_rate=VAD_SAMPLE_RATE,
+                 frame_duration_ms=FRAME_DURATION_MS):
+        self.vad = webrtcvad.Vad()
+        self.vad.set_mode(mode)
+        self.sample_rate = sample_rate
+        self.frame_samples = VAD_SAMPLE_RATE * frame_duration_ms // 1000
+        self.frame_bytes = 2 * self.frame_samples
+
+    def set_mode(self, mode):
+        self.vad.set_mode(mode)
+
+    def to_16k(self, chunk):
+        """
+        Returns the chunk as 16 kHz int16 samples (without copying if the
+        recorder runs at 16 kHz).
+        """
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        if self.sample_rate != VAD_SAMPLE_RATE:
+            samples = signal.resample_poly(
+                samples, VAD_SAMPLE_RATE, self.sample_rate).astype(np.int16)
+        return samples
+
+    def _frame_view(self, chunk, samples):
+        # 16 kHz bytes of the chunk, the chunk itself at 16 kHz
+        if samples is None:
+            if self.sample_rate == VAD_SAMPLE_RATE:
+                return memoryview(chunk).cast('B')
+            samples = self.to_16k(chunk)
+        return memoryview(samples).cast('B')
+
+    def speech_mask(self, chunk, samples=None):
+        """
+        Runs the VAD on every complete frame of the chunk.
+
+        Args:
+            chunk (bytes-like): 16-bit PCM audio at sample_rate.
+            samples (np.ndarray, optional): The chunk as 16 kHz int16
+              samples, if the caller already converted it. Not needed at
+              16 kHz, the chunk is used directly.
+
+        Returns:
+            np.ndarray: bool array with one entry per frame, True for
+              frames classified as speech.
+        """
+        view = self._frame_view(chunk, samples)
+        frame_bytes = self.frame_bytes
+        is_speech = self.vad.is_speech
+        return np.array(
+            [is_speech(view[start:start + frame_bytes], VAD_SAMPLE_RATE)
+             for start in range(0, len(view) - frame_bytes + 1, frame_bytes)],
+            dtype=bool,
+        )
+
+    def is_speech(self, chunk, all_frames_must_be_true=False, samples=None):
+        """
+        Returns True if any frame (or every frame, if
+        all_frames_must_be_true is set) of the chunk contains speech.
+        """
+        view = self._frame_view(chunk, samples)
+        frame_bytes = self.frame_bytes
+        is_speech = self.vad.is_speech
+        # Stops at the first frame that decides it
+        for start in range(0, len(view) - frame_bytes + 1, frame_bytes):
+            if is_speech(view[start:start + frame_bytes],
+                         VAD_SAMPLE_RATE) != all_frames_must_be_true:
+                return not all_frames_must_be_true
+        return all_frames_must_be_true
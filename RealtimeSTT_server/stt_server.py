@@ -151,7 +151,7 @@ from colorama import init, Fore, Style
 init()
 
 from RealtimeSTT import AudioToTextRecorder
-from scipy.signal import resample
+from RealtimeSTT.resampler import StreamingResampler
 import numpy as np
 import websockets
 import threading
@@ -603,7 +603,8 @@ def _recorder_thread(loop):
 def decode_and_resample(
         audio_data,
         original_sample_rate,
-        target_sample_rate):
+        target_sample_rate,
+        resampler=None):
 
     # Decode 16-bit PCM data to numpy array
     if original_sample_rate == target_sample_rate:
@@ -611,15 +612,13 @@ def decode_and_resample(
 
     audio_np = np.frombuffer(audio_data, dtype=np.int16)
 
-    # Calculate the number of samples after resampling
-    num_original_samples = len(audio_np)
-    num_target_samples = int(num_original_samples * target_sample_rate /
-                                original_sample_rate)
+    # Resample the audio. Pass the connection's resampler so the filter
+    # state carries over from one chunk to the next.
+    if resampler is None:
+        resampler = StreamingResampler(original_sample_rate, target_sample_rate)
+    resampled_audio = resampler.process(audio_np)
 
-    # Resample the audio
-    resampled_audio = resample(audio_np, num_target_samples)
-
-    return resampled_audio.astype(np.int16).tobytes()
+    return resampled_audio.tobytes()
 
 async def control_handler(websocket):
     debug_print(f"New control connection from {websocket.remote_address}")
@@ -720,6 +719,7 @@ async def data_handler(websocket):
     global writechunks, wav_file
     print(f"{bcolors.OKGREEN}Data client connected{bcolors.ENDC}")
     data_connections.add(websocket)
+    resampler = None
     try:
         while True:
             message = await websocket.recv()
@@ -754,7 +754,9 @@ async def data_handler(websocket):
                     wav_file.writeframes(chunk)
 
                 if sample_rate != 16000:
-                    resampled_chunk = decode_and_resample(chunk, sample_rate, 16000)
+                    if resampler is None or resampler.original_sample_rate != sample_rate:
+                        resampler = StreamingResampler(sample_rate, 16000)
+                    resampled_chunk = decode_and_resample(chunk, sample_rate, 16000, resampler)
                     if extended_logging:
                         debug_print(f"Resampled chunk size: {len(resampled_chunk)} bytes")
                     recorder.feed_audio(resampled_chunk)
@@ -0,0 +1,60 @@
+"""
+Measures how fast a transcription worker is free again after a request
+is cancelled.
+
+A 2 minute audio (the warm-up clip repeated) is sent to the worker and
+cancelled after a random delay. Reports the latency measured in the
+worker (arrival of the cancel to the stop) and the time until the worker
+has no unanswered request left, next to the time a full transcription of
+the audio takes. Needs faster_whisper and downloads the tiny model.
+"""
+
+if __name__ == "__main__":
+    import os
+    import time
+    import numpy as np
+    import soundfile as sf
+    from RealtimeSTT import AudioToTextRecorder
+    from RealtimeSTT.audio_recorder import REQUEST_FINAL
+
+    TRIALS = 20
+    DURATION = 120  # seconds of audio per request
+
+    warmup_path = os.path.join(os.path.dirname(__file__), "..",
+                               "RealtimeSTT", "warmup_audio.wav")
+    clip, _ = sf.read(warmup_path, dtype="float32")
+    audio = np.tile(clip, int(np.ceil(DURATION * 16000 / len(clip))))[:DURATION * 16000]
+
+    recorder = AudioToTextRecorder(model="tiny", device="cpu",
+                                   use_microphone=False, spinner=False)
+    shared_pipe = recorder.shared_transcription_pipe
+
+    def wait_idle():
+        while any(shared_pipe.pending_requests()):
+            time.sleep(0.001)
+
+    start = time.perf_counter()
+    recorder.perform_final_transcription(audio)
+    full = time.perf_counter() - start
+    print(f"Full transcription of {DURATION}s audio: {full:.2f}s")
+
+    rng = np.random.default_rng(0)
+    freed = []
+    for _ in range(TRIALS):
+        pipe = shared_pipe.channel()
+        request = recorder._transcription_request(REQUEST_FINAL, audio)
+        pipe.send(request)
+        time.sleep(rng.uniform(0.1, full * 0.8))
+        cancelled = time.perf_counter()
+        recorder._cancel_transcription(pipe, request.request_id)
+        wait_idle()
+        freed.append(time.perf_counter() - cancelled)
+        pipe.close()
+
+    stats = recorder.get_cancel_stats()
+    print(f"{stats['cancelled_requests']} cancelled requests, worker latency "
+          f"mean {stats['mean_latency'] * 1000:.0f} ms, "
+          f"max {stats['max_latency'] * 1000:.0f} ms")
+    print(f"Worker free again after mean {np.mean(freed) * 1000:.0f} ms, "
+          f"max {np.max(freed) * 1000:.0f} ms")
+    recorder.shutdown()
@@ -0,0 +1,70 @@
+"""
+Checks that a failed early transcription doesn't stream its segments
+twice.
+
+Speech resumes after an early transcription, which streams two segments
+and then fails. The recorder falls back to decoding the whole recording,
+which must only stream the segments after those two. The transcription
+worker is replaced by canned replies, so no model is loaded.
+
+Runs as a script or with pytest.
+"""
+
+import numpy as np
+
+from RealtimeSTT.audio_recorder import (AudioToTextRecorder, EarlyTranscription,
+                                        TranscriptionSegment)
+
+SAMPLE_RATE = 16000
+
+
+def _segment(text, start):
+    return TranscriptionSegment(text, start, start + 1.0, -0.1)
+
+
+def _recorder():
+    recorder = object.__new__(AudioToTextRecorder)
+    recorder.sample_rate = SAMPLE_RATE
+    recorder.parent_transcription_pipe = None
+    recorder.early_transcription_stats = {
+        "reused": 0, "extended": 0, "redecoded": 0,
+        "saved_decode_seconds": 0.0, "tail_decode_seconds": 0.0,
+    }
+    full_decodes = []
+
+    def await_early(pipe, request_id, on_segment=None, **kwargs):
+        for segment in (_segment("one", 0.0), _segment("two", 1.0)):
+            on_segment(segment)
+        return 'error', "worker crashed"
+
+    def request_full(audio, use_prompt=True, prompt=None, on_segment=None):
+        full_decodes.append(len(audio))
+        segments = [_segment(text, float(i))
+                    for i, text in enumerate(("one", "two", "three", "four"))]
+        for segment in segments:
+            on_segment(segment)
+        return 'success', (" ".join(s.text for s in segments), None, 0.1)
+
+    recorder._await_transcription = await_early
+    recorder._request_transcription = request_full
+    return recorder, full_decodes
+
+
+def test_failed_early_reply_streams_segments_once():
+    recorder, full_decodes = _recorder()
+    audio = np.zeros(5 * SAMPLE_RATE, dtype=np.float32)
+    early = EarlyTranscription(1, 0, 3 * SAMPLE_RATE, resumed=True)
+    streamed = []
+
+    status, result = recorder._receive_early_transcription(
+        early, audio, True, on_segment=streamed.append)
+
+    assert status == 'success'
+    assert full_decodes == [len(audio)]
+    assert recorder.early_transcription_stats["redecoded"] == 1
+    assert [segment.text for segment in streamed] == ["one", "two", "three", "four"]
+
+
+if __name__ == "__main__":
+    test_failed_early_reply_streams_segments_once()
+    print("OK")
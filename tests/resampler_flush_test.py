@@ -0,0 +1,45 @@
+"""
+Checks that StreamingResampler.flush() returns the tail the filter delay
+holds back: process() plus flush() over a whole stream must equal
+scipy.signal.resample_poly of the stream, shifted by the delay.
+
+Runs as a script or with pytest.
+"""
+
+import numpy as np
+from scipy import signal
+
+from RealtimeSTT.resampler import StreamingResampler
+
+SAMPLE_RATES = (8000, 22050, 44100, 48000)
+BLOCK_SIZES = (37, 4096)
+
+
+def _stream(sample_rate, block_size):
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 3000, 2 * sample_rate + 123).astype(np.int16)
+    resampler = StreamingResampler(sample_rate, 16000)
+    output = [resampler.process(audio[i:i + block_size])
+              for i in range(0, len(audio), block_size)]
+    output.append(resampler.flush())
+    return audio, np.concatenate(output)
+
+
+def test_flush_returns_delayed_tail():
+    for sample_rate in SAMPLE_RATES:
+        for block_size in BLOCK_SIZES:
+            audio, streamed = _stream(sample_rate, block_size)
+            reference = signal.resample_poly(audio.astype(np.float64), 16000, sample_rate)
+            delay = len(streamed) - len(reference)
+            assert 0 < delay < 32, (sample_rate, block_size, delay)
+            # Both round to int16 differently by at most one step
+            error = np.abs(streamed[delay:] - reference).max()
+            assert error <= 1.0, (sample_rate, block_size, error)
+
+
+if __name__ == "__main__":
+    for sample_rate in SAMPLE_RATES:
+        audio, streamed = _stream(sample_rate, 4096)
+        print(f"{sample_rate} Hz: {len(audio)} samples in, {len(streamed)} out")
+    test_flush_returns_delayed_tail()
+    print("OK")
@@ -0,0 +1,88 @@
+"""
+Checks that sending through a SharedParentPipe does not wait for its
+reader threads.
+
+The readers poll the worker connections while no reply is due. A send
+must not queue behind such a poll, so with idle readers a send should
+take about as long as a send on the plain connection. Measures the mean
+and maximum send latency of a ChannelPipe against a raw multiprocessing
+pipe, with a worker thread that receives the requests and answers them
+only after all of them were sent.
+
+Runs as a script or with pytest.
+"""
+
+import multiprocessing as mp
+import threading
+import time
+
+from RealtimeSTT.safepipe import SharedParentPipe
+
+REQUESTS = 200
+MAX_MEAN_LATENCY = 0.005  # seconds, a poll interval is 0.1 s
+
+
+def _measure(send):
+    latencies = []
+    for request_id in range(REQUESTS):
+        start = time.perf_counter()
+        send((request_id, "request"))
+        latencies.append(time.perf_counter() - start)
+        # Give the reader time to go back into its poll
+        time.sleep(0.002)
+    return sum(latencies) / len(latencies), max(latencies)
+
+
+def _raw_latency():
+    parent, child = mp.Pipe()
+
+    def worker():
+        for _ in range(REQUESTS):
+            child.recv()
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    result = _measure(parent.send)
+    thread.join()
+    parent.close()
+    child.close()
+    return result
+
+
+def _shared_latency():
+    parent, child = mp.Pipe()
+    shared = SharedParentPipe([parent])
+    channel = shared.channel()
+    received = []
+
+    def worker():
+        for _ in range(REQUESTS):
+            received.append(child.recv())
+        for request_id, _ in received:
+            child.send((request_id, "reply"))
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    result = _measure(channel.send)
+    thread.join()
+    replies = [channel.recv() for _ in range(REQUESTS)]
+    assert [reply[0] for reply in replies] == list(range(REQUESTS))
+    shared.close()
+    child.close()
+    return result
+
+
+def test_send_latency_while_reader_idle():
+    mean, worst = _shared_latency()
+    assert mean < MAX_MEAN_LATENCY, (
+        f"mean send latency {mean * 1000:.2f} ms with an idle reader")
+
+
+if __name__ == "__main__":
+    raw_mean, raw_max = _raw_latency()
+    shared_mean, shared_max = _shared_latency()
+    print(f"{REQUESTS} sends, reader idle")
+    print(f"  raw pipe          mean {raw_mean * 1000:6.3f} ms, max {raw_max * 1000:6.3f} ms")
+    print(f"  SharedParentPipe  mean {shared_mean * 1000:6.3f} ms, max {shared_max * 1000:6.3f} ms")
+    test_send_latency_while_reader_idle()
+    print("OK")
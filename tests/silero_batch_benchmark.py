@@ -0,0 +1,49 @@
+"""
+Compares the Silero VAD cost per stream and window with one SileroOnnxVAD
+per stream against BatchedSileroVAD streams of one SileroBatchService.
+
+Every stream runs in its own thread (like one recorder per caller) and
+scores CHUNKS chunks of 512 samples. Needs onnxruntime and the ONNX model
+in the local model store (downloaded on first use).
+"""
+
+if __name__ == "__main__":
+    import threading
+    import time
+    import numpy as np
+    from RealtimeSTT.silero_store import silero_model_path
+    from RealtimeSTT.silero_onnx import SileroOnnxVAD, create_session
+    from RealtimeSTT.silero_batch import SileroBatchService
+
+    CHUNKS = 100
+    CHUNK_SIZE = 512
+
+    session = create_session(silero_model_path("onnx"))
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.1, CHUNKS * CHUNK_SIZE).astype(np.float32)
+
+    def run(models):
+        def score(model):
+            for start in range(0, len(audio), CHUNK_SIZE):
+                model.probability(audio[start:start + CHUNK_SIZE])
+
+        threads = [threading.Thread(target=score, args=(model,))
+                   for model in models]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    for num_streams in (1, 10, 100, 200):
+        windows = num_streams * CHUNKS
+        single = run([SileroOnnxVAD(session) for _ in range(num_streams)])
+        service = SileroBatchService(session)
+        batched = run([service.stream() for _ in range(num_streams)])
+        stats = service.stats()
+        print(f"{num_streams:4d} streams: "
+              f"single {single / windows * 1e6:8.1f} us/window, "
+              f"batched {batched / windows * 1e6:8.1f} us/window "
+              f"(mean batch {stats['mean_batch_size']:.1f}), "
+              f"{single / batched:5.1f}x")
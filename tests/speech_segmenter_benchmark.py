@@ -0,0 +1,50 @@
+"""
+Feeds synthetic VAD scores through SpeechSegmenter and reports the
+segments it finds and how many frames per second it processes.
+
+The scores alternate between speech (around 0.8) and silence (around 0.1)
+with 100 ms dips to 0.4 inside the speech parts. With hysteresis (end
+threshold below the start threshold) the dips do not split the segments.
+"""
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+    from RealtimeSTT.speech_segmenter import SpeechSegmenter
+
+    SAMPLE_RATE = 16000
+    FRAME_SAMPLES = 160  # 10 ms frames
+    DURATION = 3600  # seconds of scores
+
+    rng = np.random.default_rng(0)
+    num_frames = DURATION * SAMPLE_RATE // FRAME_SAMPLES
+    t = np.arange(num_frames) * FRAME_SAMPLES / SAMPLE_RATE
+    speech = (np.floor(t / 3) % 2) == 0  # 3 s speech, 3 s silence
+    scores = np.where(speech, 0.8, 0.1) + rng.normal(0, 0.05, num_frames)
+    dips = speech & (np.floor(t * 10) % 7 == 3)  # every 0.7 s
+    scores[dips] = 0.4
+    scores = scores.tolist()
+
+    def segmenter(end_threshold):
+        return SpeechSegmenter(
+            start_threshold=0.5,
+            end_threshold=end_threshold,
+            pre_roll=int(0.2 * SAMPLE_RATE),
+            post_speech_silence=int(0.05 * SAMPLE_RATE),
+            min_length=int(0.2 * SAMPLE_RATE),
+            min_gap=0,
+            early_transcription_silence=int(0.03 * SAMPLE_RATE),
+        )
+
+    print(f"{DURATION}s of scores in {num_frames} frames of {FRAME_SAMPLES} samples, "
+          f"{DURATION // 6} speech parts")
+    for name, end_threshold in (("without hysteresis", 0.5),
+                                ("with hysteresis", 0.3)):
+        elapsed = float("inf")
+        for _ in range(3):
+            seg = segmenter(end_threshold)
+            start = time.perf_counter()
+            segments = seg.segments(scores, FRAME_SAMPLES)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        print(f"  {name:20s} {len(segments):5d} segments, "
+              f"{elapsed * 1000:7.1f} ms ({num_frames / elapsed:10.0f} frames/s)")
@@ -0,0 +1,49 @@
+"""
+Pins how SpeechSegmenter treats scores equal to its thresholds: a score
+equal to start_threshold starts a segment and a score equal to
+end_threshold counts as speech. The recorder relies on the latter for
+WebRTC deactivity detection, which scores the share of speech frames
+against an end_threshold of 1.0.
+
+Runs as a script or with pytest.
+"""
+
+from RealtimeSTT.speech_segmenter import (SILENCE_START, SPEECH_START,
+                                          SpeechSegmenter)
+
+CHUNK = 512
+
+
+def _segmenter(end_threshold):
+    return SpeechSegmenter(start_threshold=0.5, end_threshold=end_threshold,
+                           post_speech_silence=10 * CHUNK)
+
+
+def _kinds(segmenter, scores):
+    return [[event.kind for event in segmenter.process(i * CHUNK, CHUNK, score)]
+            for i, score in enumerate(scores)]
+
+
+def test_score_at_start_threshold_starts_segment():
+    segmenter = _segmenter(0.35)
+    assert _kinds(segmenter, [0.49, 0.5]) == [[], [SPEECH_START]]
+
+
+def test_score_at_end_threshold_is_speech():
+    segmenter = _segmenter(0.35)
+    assert _kinds(segmenter, [0.5, 0.35, 0.35, 0.34]) == [
+        [SPEECH_START], [], [], [SILENCE_START]]
+
+
+def test_all_frames_rule():
+    # Share of speech frames with WebRTC deactivity detection
+    segmenter = _segmenter(1.0)
+    assert _kinds(segmenter, [1.0, 1.0, 2 / 3]) == [
+        [SPEECH_START], [], [SILENCE_START]]
+
+
+if __name__ == "__main__":
+    test_score_at_start_threshold_starts_segment()
+    test_score_at_end_threshold_is_speech()
+    test_all_frames_rule()
+    print("OK")
@@ -0,0 +1,119 @@
+"""
+Compares the frame loop _is_webrtc_speech used before (resampling and
+slicing bytes per call) with WebRTCVADEngine.
+
+For every chunk the recorder runs the WebRTC check and, on speech, the
+Silero check, which resampled the chunk again. The benchmark does the same
+(the Silero part only prepares the 16 kHz input) and reports processed
+chunks per second, at 16 kHz and at a recorder rate of 48 kHz.
+
+Before a recording the recorder only needs to know whether a chunk holds
+any speech (WebRTCVADEngine.is_speech, which stops at the first speech
+frame like the previous loop). While recording it needs the decision of
+every frame (WebRTCVADEngine.speech_mask), for which calling webrtcvad
+directly on every frame is the baseline.
+"""
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+    import webrtcvad
+    from scipy import signal
+    from RealtimeSTT.webrtc_vad import WebRTCVADEngine
+
+    DURATION = 60  # seconds of test audio
+    CHUNK_DURATION = 0.032  # 512 samples at 16 kHz
+    REPEATS = 15
+
+    def test_chunks(sample_rate):
+        rng = np.random.default_rng(0)
+        t = np.arange(int(sample_rate * DURATION)) / sample_rate
+        # alternating 1 s of tone bursts and 1 s of low noise
+        audio = rng.normal(0, 100, len(t))
+        audio += 8000 * np.sin(2 * np.pi * 220 * t) * (np.floor(t) % 2 == 0)
+        audio = np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+        chunk_bytes = 2 * int(sample_rate * CHUNK_DURATION)
+        return [audio[i:i + chunk_bytes]
+                for i in range(0, len(audio) - chunk_bytes + 1, chunk_bytes)]
+
+    def previous(chunks, sample_rate):
+        vad = webrtcvad.Vad(3)
+        frames = 0
+        for chunk in chunks:
+            data = chunk
+            if sample_rate != 16000:
+                pcm_data = np.frombuffer(data, dtype=np.int16)
+                data = signal.resample_poly(
+                    pcm_data, 16000, sample_rate).astype(np.int16).tobytes()
+            frame_length = int(16000 * 0.01)
+            num_frames = int(len(data) / (2 * frame_length))
+            speech = False
+            for i in range(num_frames):
+                frame = data[i * frame_length * 2:(i + 1) * frame_length * 2]
+                frames += 1
+                if vad.is_speech(frame, 16000):
+                    speech = True
+                    break
+            if speech:
+                data = chunk
+                if sample_rate != 16000:
+                    pcm_data = np.frombuffer(data, dtype=np.int16)
+                    data = signal.resample_poly(
+                        pcm_data, 16000, sample_rate).astype(np.int16).tobytes()
+                np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        return frames
+
+    def direct(chunks, sample_rate):
+        vad = webrtcvad.Vad(3)
+        frames = 0
+        for chunk in chunks:
+            data = chunk
+            if sample_rate != 16000:
+                pcm_data = np.frombuffer(data, dtype=np.int16)
+                data = signal.resample_poly(
+                    pcm_data, 16000, sample_rate).astype(np.int16).tobytes()
+            speech = [vad.is_speech(data[i:i + 320], 16000)
+                      for i in range(0, len(data) - 319, 320)]
+            frames += len(speech)
+            if any(speech):
+                np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        return frames
+
+    def engine_onset(chunks, sample_rate):
+        vad = WebRTCVADEngine(3, sample_rate)
+        for chunk in chunks:
+            # Converted once, like the recorder does for WebRTC and Silero
+            samples = None if sample_rate == 16000 else vad.to_16k(chunk)
+            if vad.is_speech(chunk, samples=samples):
+                if samples is None:
+                    samples = vad.to_16k(chunk)
+                samples.astype(np.float32) / 32768.0
+
+    def engine_mask(chunks, sample_rate):
+        vad = WebRTCVADEngine(3, sample_rate)
+        for chunk in chunks:
+            samples = None if sample_rate == 16000 else vad.to_16k(chunk)
+            mask = vad.speech_mask(chunk, samples)
+            # As _deactivity_score counts the speech frames
+            if np.count_nonzero(mask):
+                if samples is None:
+                    samples = vad.to_16k(chunk)
+                samples.astype(np.float32) / 32768.0
+
+    for sample_rate in (16000, 48000):
+        chunks = test_chunks(sample_rate)
+        print(f"{sample_rate} Hz recorder rate, {DURATION}s in {len(chunks)} chunks")
+        candidates = (("onset: previous loop", previous),
+                      ("onset: is_speech", engine_onset),
+                      ("mask: webrtcvad direct", direct),
+                      ("mask: speech_mask", engine_mask))
+        # Interleaved, so load changes on the machine hit all of them
+        elapsed = {name: float("inf") for name, _ in candidates}
+        for _ in range(REPEATS):
+            for name, func in candidates:
+                start = time.perf_counter()
+                func(chunks, sample_rate)
+                elapsed[name] = min(elapsed[name], time.perf_counter() - start)
+        for name, _ in candidates:
+            print(f"  {name:24s} {elapsed[name] * 1000:8.1f} ms, "
+                  f"{len(chunks) / elapsed[name]:8.0f} chunks/s")